@@ -0,0 +1,34 @@
+"""Migration script to add request hashing and expiry indexing to idempotency_key."""
+
+from sqlalchemy import text
+from src.database import engine
+
+
+def add_idempotency_columns():
+    """Add the request_hash column and the created_at index (expired key sweep)."""
+    with engine.begin() as conn:
+        # Add request_hash column (SHA-256 of the request body)
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text("ALTER TABLE idempotency_key ADD COLUMN IF NOT EXISTS request_hash VARCHAR(64)")
+            )
+        else:
+            columns = [row[1] for row in conn.execute(text("PRAGMA table_info(idempotency_key)"))]
+            if "request_hash" not in columns:
+                conn.execute(text("ALTER TABLE idempotency_key ADD COLUMN request_hash VARCHAR(64)"))
+        print("[OK] Added request_hash column")
+
+        # Index used to purge expired keys
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_idempotency_key_created_at "
+                "ON idempotency_key (created_at)"
+            )
+        )
+        print("[OK] Added ix_idempotency_key_created_at index")
+
+        print("\nDatabase migration completed successfully!")
+
+
+if __name__ == "__main__":
+    add_idempotency_columns()
@@ -4,7 +4,7 @@ from sqlalchemy import text
 from src.database import engine
 
 def add_reminder_columns():
-    """Add reminder_time and is_reminded columns to task table."""
+    """Add reminder_time, is_reminded and reminder_sent_at columns to task table."""
     with engine.begin() as conn:
         # Add reminder_time column
         conn.execute(
@@ -18,6 +18,27 @@ def add_reminder_columns():
         )
         print("[OK] Added is_reminded column")
 
+        # Add reminder_sent_at column (set when the server pushes the reminder)
+        conn.execute(
+            text("ALTER TABLE task ADD COLUMN IF NOT EXISTS reminder_sent_at TIMESTAMP")
+        )
+        print("[OK] Added reminder_sent_at column")
+
+        # Partial index used by the reminder scheduler and workers. Recreated, since
+        # CREATE INDEX IF NOT EXISTS would keep an index with an older predicate.
+        conn.execute(text("DROP INDEX IF EXISTS ix_task_reminder_due"))
+        conn.execute(
+            text(
+                "CREATE INDEX ix_task_reminder_due ON task (reminder_time) "
+                "WHERE NOT is_reminded AND reminder_sent_at IS NULL"
+            )
+        )
+        print("[OK] Added ix_task_reminder_due partial index")
+
+        # Superseded by the partial index; drop it so writes don't maintain both
+        conn.execute(text("DROP INDEX IF EXISTS ix_task_reminder_time"))
+        print("[OK] Dropped ix_task_reminder_time index")
+
         print("\nDatabase migration completed successfully!")
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+"""Migration script to add text search indexes to an existing task table."""
+
+from sqlalchemy import text
+from src.database import engine
+from src.services.task_search import PG_TRGM_DDL, SQLITE_FTS_DDL
+
+
+def add_search_indexes():
+    """Create the search indexes that create_all only builds for new tables."""
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Word/prefix search
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_task_search ON task USING gin "
+                    "(to_tsvector('simple'::regconfig, "
+                    "coalesce(title, '') || ' ' || coalesce(description, '')))"
+                )
+            )
+            print("[OK] Added ix_task_search (tsvector GIN) index")
+
+            # Substring (ILIKE) search on titles
+            conn.execute(text(PG_TRGM_DDL))
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_task_title_trgm ON task "
+                    "USING gin (title gin_trgm_ops)"
+                )
+            )
+            print("[OK] Added ix_task_title_trgm (trigram GIN) index")
+
+        elif engine.dialect.name == "sqlite":
+            for statement in SQLITE_FTS_DDL:
+                conn.execute(text(statement))
+            # Index rows that existed before the FTS table
+            conn.execute(text("INSERT INTO task_fts(task_fts) VALUES ('rebuild')"))
+            print("[OK] Added task_fts (FTS5) table and triggers")
+
+        print("\nDatabase migration completed successfully!")
+
+
+if __name__ == "__main__":
+    add_search_indexes()
@@ -0,0 +1,61 @@
+"""Benchmark the per-turn agent setup cost of a chat request.
+
+Compares building the agent on every turn (function tool schemas, Agent
+object and system prompt, as create_agent used to) with the shared
+per-language agent plus a run context. Both paths render the system prompt,
+since the model needs it on every turn. No LLM or database is involved:
+
+    python benchmark_agent_setup.py [TURNS]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from agents import RunContextWrapper  # noqa: E402
+
+from src.agent.chat import build_agent, build_tools, chat_context, get_agent  # noqa: E402
+
+USER_ID = "benchmark_user"
+ROUNDS = 5
+
+
+async def render(agent, context: dict) -> str:
+    return await agent.get_system_prompt(RunContextWrapper(context=context))
+
+
+async def before() -> str:
+    agent = build_agent("en", tools=build_tools())
+    return await render(agent, chat_context(USER_ID, timezone_offset=300))
+
+
+async def after() -> str:
+    agent = get_agent("en")
+    return await render(agent, chat_context(USER_ID, timezone_offset=300))
+
+
+async def per_turn(setup, turns: int) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(turns):
+            await setup()
+        best = min(best, (time.perf_counter() - start) / turns)
+    return best
+
+
+async def main() -> None:
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    before_s = await per_turn(before, turns)
+    after_s = await per_turn(after, turns)
+    print(f"Agent setup per turn ({turns} turns, best of {ROUNDS})")
+    print(f"  before (tools + Agent + prompt per turn): {before_s * 1e6:10.1f} us")
+    print(f"  after  (shared agent + run context):      {after_s * 1e6:10.1f} us")
+    print(f"  speedup: {before_s / after_s:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
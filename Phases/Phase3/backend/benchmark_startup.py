@@ -0,0 +1,93 @@
+"""Benchmark backend cold start against a budget.
+
+Starts fresh interpreters that import src.main and serve one GET /health
+through the ASGI transport, and reports the median import time, first-request
+time and whole-process time. Fails (exit code 1) when the median cold start
+exceeds the budget or when the agent/ChatKit stack was imported at boot:
+
+    python benchmark_startup.py [--runs 5] [--budget 2.0]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Packages that must only load on the first chat request
+LAZY_MODULES = ("agents", "openai", "chatkit")
+
+CHILD = f"""
+import json, sys, time
+start = time.perf_counter()
+from src.main import app
+imported = time.perf_counter()
+
+import asyncio, httpx
+
+async def first_request():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+        return (await client.get("/health")).status_code
+
+status_code = asyncio.run(first_request())
+served = time.perf_counter()
+print(json.dumps({{
+    "import_s": imported - start,
+    "first_request_s": served - imported,
+    "status_code": status_code,
+    "eager_modules": [m for m in {LAZY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def run_once() -> dict:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("BETTER_AUTH_SECRET", "startup-benchmark-secret")
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        capture_output=True, text=True, check=True, env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_s"] = time.perf_counter() - start
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backend cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.0, help="max median cold start (seconds)")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    median = {key: statistics.median(run[key] for run in runs)
+              for key in ("import_s", "first_request_s", "process_s")}
+    eager = sorted({module for run in runs for module in run["eager_modules"]})
+    cold_start = median["import_s"] + median["first_request_s"]
+
+    print(f"Cold start (median of {args.runs} runs):")
+    print(f"  import src.main:   {median['import_s'] * 1000:8.1f} ms")
+    print(f"  first GET /health: {median['first_request_s'] * 1000:8.1f} ms")
+    print(f"  whole process:     {median['process_s'] * 1000:8.1f} ms")
+    print(f"  budget:            {args.budget * 1000:8.1f} ms (import + first request)")
+
+    failures = []
+    if cold_start > args.budget:
+        failures.append(f"cold start {cold_start:.2f}s exceeds budget {args.budget:.2f}s")
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    if any(run["status_code"] != 200 for run in runs):
+        failures.append("GET /health did not return 200")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark bulk task import (POST /tasks/import path) for a 100k-row file.
+
+Feeds a generated NDJSON or CSV body through the same streaming parser,
+TaskCreate validation and batched insert the endpoint uses. Uses a temporary
+SQLite database unless a PostgreSQL URL is given (exercises COPY):
+
+    python benchmark_task_import.py [ROWS] [ndjson|csv] [DATABASE_URL]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from src.models.task import Task
+from src.services.task_import import import_tasks
+from src.services.task_service import TaskService
+
+USER_ID = "import_benchmark_user"
+CHUNK_BYTES = 64 * 1024
+
+
+def generate(rows: int, import_format: str) -> bytes:
+    priorities = ("low", "medium", "high")
+    if import_format == "csv":
+        lines = ["title,description,priority,due_date"]
+        lines += [
+            f'Task {i},"Imported task, number {i}",{priorities[i % 3]},2030-01-{i % 28 + 1:02d}'
+            for i in range(rows)
+        ]
+    else:
+        lines = [
+            json.dumps({
+                "title": f"Task {i}",
+                "description": f"Imported task, number {i}",
+                "priority": priorities[i % 3],
+                "due_date": f"2030-01-{i % 28 + 1:02d}",
+            })
+            for i in range(rows)
+        ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def body_chunks(body: bytes):
+    for start in range(0, len(body), CHUNK_BYTES):
+        yield body[start:start + CHUNK_BYTES]
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    import_format = sys.argv[2] if len(sys.argv) > 2 else "ndjson"
+    if len(sys.argv) > 3:
+        engine = create_engine(sys.argv[3])
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "import.db")
+        engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+
+    body = generate(rows, import_format)
+    with Session(engine) as session:
+        service = TaskService(session, user_id=USER_ID)
+        start = time.perf_counter()
+        summary = asyncio.run(import_tasks(service, body_chunks(body), import_format))
+        elapsed = time.perf_counter() - start
+        stored = session.exec(
+            select(func.count()).select_from(Task).where(Task.user_id == USER_ID)
+        ).one()
+
+    assert summary.failed == 0, summary.errors[:5]
+    assert stored >= rows, f"Only {stored} of {rows} tasks stored"
+    print(f"Imported {summary.imported} tasks ({import_format}, {len(body) / 1e6:.1f} MB, {engine.dialect.name})")
+    print(f"  total: {elapsed:8.2f} s  ({summary.imported / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the GET /tasks serialization path for a 10k-task list.
+
+Compares the previous path (ORM objects -> response_model validation ->
+jsonable output -> json.dumps, as FastAPI does for response_model=List[Task])
+with the fast path (row tuples -> precompiled pydantic-core serializer).
+Uses a temporary SQLite database:
+
+    python benchmark_task_list.py [TASK_COUNT]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, SQLModel, create_engine
+
+from src.api.responses import TASK_COLUMNS, task_rows_adapter, task_rows_to_dicts
+from src.models.task import Task, TaskPriority
+from src.services.task_service import TaskService
+
+USER_ID = "benchmark_user"
+ROUNDS = 5
+
+
+def seed(engine, count: int) -> None:
+    now = datetime.now()
+    with Session(engine) as session:
+        for i in range(count):
+            session.add(Task(
+                title=f"Task {i}",
+                description="Benchmark task description" if i % 2 else None,
+                priority=list(TaskPriority)[i % 3],
+                due_date=date.today() + timedelta(days=i % 30) if i % 3 else None,
+                reminder_time=now + timedelta(minutes=i) if i % 5 == 0 else None,
+                user_id=USER_ID,
+            ))
+        session.commit()
+
+
+def best_of(fn) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    seed(engine, count)
+
+    response_adapter = TypeAdapter(List[Task])
+
+    def before() -> bytes:
+        with Session(engine) as session:
+            tasks = TaskService(session, user_id=USER_ID).get_all()
+            validated = response_adapter.validate_python(tasks, from_attributes=True)
+            content = response_adapter.dump_python(validated, mode="json")
+            return json.dumps(content).encode()
+
+    def after() -> bytes:
+        with Session(engine) as session:
+            rows = TaskService(session, user_id=USER_ID).get_all_rows(TASK_COLUMNS)
+            return task_rows_adapter.dump_json(task_rows_to_dicts(rows))
+
+    assert json.loads(before()) == json.loads(after()), "Fast path output differs"
+
+    before_s = best_of(before)
+    after_s = best_of(after)
+    print(f"Tasks: {count} (best of {ROUNDS})")
+    print(f"  before (ORM + response_model + json): {before_s * 1000:8.1f} ms")
+    print(f"  after  (rows + pydantic-core dump):   {after_s * 1000:8.1f} ms")
+    print(f"  speedup: {before_s / after_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
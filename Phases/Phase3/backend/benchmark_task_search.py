@@ -0,0 +1,84 @@
+"""Benchmark indexed task search on a large account.
+
+Seeds a temporary SQLite database (FTS5 index) with a single user's tasks and
+times GET /tasks-style queries through TaskService. Pass a PostgreSQL URL to
+measure the tsvector/trigram GIN indexes instead (run add_search_indexes.py
+first for the trigram index):
+
+    python benchmark_task_search.py [TASK_COUNT] [DATABASE_URL]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlmodel import Session, SQLModel, create_engine, delete
+
+from src.api.responses import TASK_COLUMNS
+from src.models.task import Task, TaskFilter, TaskPriority
+from src.services.task_cache import InMemoryTaskCache
+from src.services.task_service import TaskService
+
+USER_ID = "search_benchmark_user"
+WORDS = [
+    "buy", "call", "email", "groceries", "report", "meeting", "doctor", "gym",
+    "invoice", "review", "plan", "book", "flight", "dentist", "mom", "project",
+]
+QUERIES = ["invoice", "call mom", "rep", "doctor appointment", "fli"]
+ROUNDS = 20
+
+
+def seed(engine, count: int) -> None:
+    rng = random.Random(42)
+    today = date.today()
+    with Session(engine) as session:
+        session.execute(delete(Task).where(Task.user_id == USER_ID))
+        session.bulk_save_objects([
+            Task(
+                title=" ".join(rng.choices(WORDS, k=3)) + f" {i}",
+                description=" ".join(rng.choices(WORDS, k=8)) if i % 2 else None,
+                priority=list(TaskPriority)[i % 3],
+                due_date=today + timedelta(days=i % 90) if i % 3 else None,
+                user_id=USER_ID,
+            )
+            for i in range(count)
+        ])
+        session.commit()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    if len(sys.argv) > 2:
+        url = sys.argv[2]
+        engine = create_engine(url)
+    else:
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "search.db")
+        engine = create_engine(url)
+
+    SQLModel.metadata.create_all(engine)
+    seed(engine, count)
+    print(f"Database: {url}")
+    print(f"Tasks: {count} (median of {ROUNDS}, cache disabled)")
+
+    with Session(engine) as session:
+        # A zero-size cache so every call reaches the database
+        service = TaskService(session, user_id=USER_ID, cache=InMemoryTaskCache(max_size=0))
+        for query in QUERIES:
+            filters = TaskFilter(q=query)
+            timings = []
+            for _ in range(ROUNDS):
+                start = time.perf_counter()
+                rows = service.get_all_rows(TASK_COLUMNS, filters)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            print(f"  q={query!r:22} {len(rows):6} matches  {timings[len(timings) // 2] * 1000:8.2f} ms")
+
+        session.execute(delete(Task).where(Task.user_id == USER_ID))
+        session.commit()
+
+
+if __name__ == "__main__":
+    main()
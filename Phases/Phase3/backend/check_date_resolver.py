@@ -0,0 +1,68 @@
+"""Check the date/time phrase resolver used by the agent's task tools.
+
+Resolves a fixed set of phrases for a user at UTC+5 on Monday 2026-10-19,
+15:30 local (10:30 UTC), then checks which reminder phrases the task tools
+reject, and fails (AssertionError) on any mismatch:
+
+    python check_date_resolver.py
+"""
+
+from datetime import date, datetime
+
+from src.agent.tools import resolve_task_times, resolve_when
+
+NOW = datetime(2026, 10, 19, 10, 30)  # UTC
+OFFSET = 300  # UTC+5
+
+# phrase -> (local due date, UTC reminder time or None); None if not understood
+CASES = {
+    "in 5 minutes": (date(2026, 10, 19), datetime(2026, 10, 19, 10, 35)),
+    "in an hour": (date(2026, 10, 19), datetime(2026, 10, 19, 11, 30)),
+    "in 30 seconds": (date(2026, 10, 19), datetime(2026, 10, 19, 10, 30, 30)),
+    "in 3 days": (date(2026, 10, 22), None),
+    "tomorrow at 5pm": (date(2026, 10, 20), datetime(2026, 10, 20, 12, 0)),
+    "at 5 pm tomorrow": (date(2026, 10, 20), datetime(2026, 10, 20, 12, 0)),
+    "next Monday 9am": (date(2026, 10, 26), datetime(2026, 10, 26, 4, 0)),
+    "on friday at 9:15 am": (date(2026, 10, 23), datetime(2026, 10, 23, 4, 15)),
+    "by friday": (date(2026, 10, 23), None),
+    "by tomorrow": (date(2026, 10, 20), None),
+    "in 2 days at 5pm": (date(2026, 10, 21), datetime(2026, 10, 21, 12, 0)),
+    "this evening": (date(2026, 10, 19), datetime(2026, 10, 19, 13, 0)),
+    "tomorrow morning": (date(2026, 10, 20), datetime(2026, 10, 20, 4, 0)),
+    "today at 2pm": (date(2026, 10, 19), datetime(2026, 10, 19, 9, 0)),  # Kept as said; see REJECTED
+    "5pm": (date(2026, 10, 19), datetime(2026, 10, 19, 12, 0)),
+    "2pm": (date(2026, 10, 20), datetime(2026, 10, 20, 9, 0)),  # Already passed today
+    "17:30": (date(2026, 10, 19), datetime(2026, 10, 19, 12, 30)),
+    "tonight": (date(2026, 10, 19), datetime(2026, 10, 19, 15, 0)),
+    "today": (date(2026, 10, 19), None),
+    "next week": (date(2026, 10, 26), None),
+    "2026-01-25": (date(2026, 1, 25), None),
+    "2026-01-25T17:00:00Z": (date(2026, 1, 25), datetime(2026, 1, 25, 17, 0)),
+    "5 منٹ بعد": (date(2026, 10, 19), datetime(2026, 10, 19, 10, 35)),
+    "پرسوں 5pm": (date(2026, 10, 21), datetime(2026, 10, 21, 12, 0)),
+    "at 5": None,  # Ambiguous: AM or PM
+    "13pm": None,
+    "0am": None,
+    "in 5 minutes at 5pm": None,
+    "sometime soon": None,
+}
+
+# Reminder phrases the task tools reject with INVALID_DATE
+REJECTED = ["today at 2pm", "2026-01-25T17:00:00Z", "13pm", "sometime soon"]
+
+
+def main() -> None:
+    for phrase, expected in CASES.items():
+        resolved = resolve_when(phrase, OFFSET, now=NOW)
+        actual = tuple(resolved) if resolved else None
+        assert actual == expected, f"{phrase!r}: got {actual}, expected {expected}"
+        print(f"  {phrase!r:26} -> {actual}")
+    for phrase in REJECTED:
+        _, _, error = resolve_task_times(None, phrase, OFFSET, now=NOW)
+        assert error and error["error"]["code"] == "INVALID_DATE", f"{phrase!r}: reminder accepted"
+        print(f"  reminder {phrase!r:17} -> {error['error']['message']}")
+    print(f"[OK] {len(CASES)} phrases resolved and {len(REJECTED)} reminders rejected as expected")
+
+
+if __name__ == "__main__":
+    main()
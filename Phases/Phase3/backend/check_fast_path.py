@@ -0,0 +1,82 @@
+"""Check the chat fast-path router against a sample of chat messages.
+
+Fails (AssertionError) when a message is routed differently than expected:
+simple commands must be answered locally, anything ambiguous must reach the
+agent. Then runs the matched commands against a temporary SQLite database
+and prints the hit rate and the fast-path latency; compare the latter with
+llm_turn_duration_seconds to see the time saved per hit:
+
+    python check_fast_path.py
+"""
+
+import asyncio
+import os
+import tempfile
+
+# Configure before the app modules read their settings
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'fast_path.db')}"
+os.environ["IDEMPOTENCY_BACKEND"] = "memory"
+
+from sqlmodel import Session  # noqa: E402
+
+from src.database import create_db_and_tables, get_engine  # noqa: E402
+from src.models.task import TaskCreate  # noqa: E402
+from src.services.command_router import FastPathRouter, match_command  # noqa: E402
+from src.services.task_service import TaskService  # noqa: E402
+
+USER_ID = "fast_path_user"
+
+# (message, expected tool or None for the agent)
+SAMPLES = [
+    ("complete task 1", "complete_task"),
+    ("Mark task 2 as done.", "complete_task"),
+    ("task 3 is completed", "complete_task"),
+    ("mark task 1 as incomplete", "update_task"),
+    ("reopen task 2", "update_task"),
+    ("please delete task 3", "delete_task"),
+    ("list pending", "list_tasks"),
+    ("show me my tasks", "list_tasks"),
+    ("list completed tasks", "list_tasks"),
+    ("ٹاسک 1 مکمل کرو", "complete_task"),
+    ("ٹاسک نمبر ۲ کو نامکمل کر دیں۔", "update_task"),
+    ("ٹاسک 99 حذف کرو", "delete_task"),
+    ("میرے ٹاسک دکھاؤ", "list_tasks"),
+    ("زیر التوا ٹاسک دکھائیں", "list_tasks"),
+    # Ambiguous or needs understanding: the agent handles these
+    ("add task buy milk tomorrow", None),
+    ("complete the groceries task", None),
+    ("finish task 3 by friday", None),
+    ("delete all tasks", None),
+    ("remind me in 5 minutes to call mom", None),
+    ("what should I do today?", None),
+    ("show me", None),
+    ("کل دودھ خریدنے کا ٹاسک شامل کرو", None),
+]
+
+
+async def main() -> None:
+    for message, expected in SAMPLES:
+        command = match_command(message)
+        routed = command.tool if command else None
+        assert routed == expected, f"{message!r}: routed to {routed}, expected {expected}"
+
+    create_db_and_tables()
+    with Session(get_engine()) as session:
+        service = TaskService(session, user_id=USER_ID)
+        for title in ("Buy groceries", "Call John", "Write report"):
+            service.create(TaskCreate(title=title))
+
+    router = FastPathRouter()
+    for message, _ in SAMPLES:
+        result = await router.handle(USER_ID, message)
+        if result is not None:
+            print(f"  {message!r} -> {result['response'].splitlines()[0]}")
+
+    stats = router.stats()
+    print(f"\nHit rate: {stats['hits']}/{stats['hits'] + stats['misses']} ({stats['hit_rate']:.0%})")
+    print(f"Fast-path latency: {stats['avg_fast_path_seconds'] * 1000:.1f} ms per hit (no LLM round trip)")
+    print("[OK] Routing matches expectations")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
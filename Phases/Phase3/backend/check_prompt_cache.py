@@ -0,0 +1,124 @@
+"""Check that the chat system prompt keeps a byte-stable, cacheable prefix.
+
+Renders the prompt for different times, timezones and languages and fails
+(exit code 1) unless every rendering starts with the same STATIC_PROMPT.
+Then replays a simulated conversation (one turn a minute) and reports input
+tokens served from the provider prompt cache versus billed uncached, for the
+current layout (static rules first, date/time last) and for the previous
+layout (date/time first). Cache model: the longest prefix shared with an
+earlier request, in 128-token steps, once it reaches 1024 tokens.
+
+    python check_prompt_cache.py [TURNS]
+
+Counts tokens with tiktoken when installed, otherwise estimates 4 characters
+per token.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-check")
+
+from src.agent.chat import AGENT_TOOLS, STATIC_PROMPT, get_prompt_context, get_system_prompt  # noqa: E402
+
+CACHE_MIN_TOKENS = 1024
+CACHE_STEP_TOKENS = 128
+
+# Tool definitions precede the instructions in the request, so they are part of the cached prefix
+TOOLS_TEXT = json.dumps([
+    {"name": tool.name, "description": tool.description, "parameters": tool.params_json_schema}
+    for tool in AGENT_TOOLS
+])
+
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("o200k_base")
+
+    def tokenize(text: str) -> List:
+        return _encoding.encode(text)
+
+    TOKENIZER = "tiktoken o200k_base"
+except ImportError:
+    def tokenize(text: str) -> List:
+        return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+    TOKENIZER = "estimate (4 chars/token)"
+
+
+def check_prefix_stability() -> bool:
+    start = datetime(2026, 1, 31, 23, 59, 30, tzinfo=timezone.utc)
+    renderings = [
+        get_system_prompt(language, offset, start + timedelta(seconds=seconds))
+        for language in ("en", "ur")
+        for offset in (0, 300, -480)
+        for seconds in (0, 45, 3600, 86400 * 3)
+    ]
+    prefix = STATIC_PROMPT + "\n\n"
+    unstable = [prompt for prompt in renderings if not prompt.startswith(prefix)]
+    distinct_suffixes = len({prompt[len(prefix):] for prompt in renderings})
+    print(f"Prefix stability: {len(renderings) - len(unstable)}/{len(renderings)} renderings share "
+          f"the {len(prefix.encode())}-byte static prefix ({distinct_suffixes} distinct suffixes)")
+    return not unstable
+
+
+def cached_tokens(tokens: List, previous: List[List]) -> int:
+    shared = 0
+    for earlier in previous:
+        length = 0
+        for a, b in zip(tokens, earlier):
+            if a != b:
+                break
+            length += 1
+        shared = max(shared, length)
+    if shared < CACHE_MIN_TOKENS:
+        return 0
+    return shared - shared % CACHE_STEP_TOKENS
+
+
+def replay(system_prompt: Callable[[datetime], str], turns: int) -> tuple:
+    start = datetime(2026, 1, 31, 9, 0, tzinfo=timezone.utc)
+    history: List[str] = []
+    previous: List[List] = []
+    cached = uncached = 0
+    for turn in range(turns):
+        history.append(f"user: add task number {turn} for tomorrow")
+        prompt = TOOLS_TEXT + "\n" + system_prompt(start + timedelta(minutes=turn)) + "\n" + "\n".join(history)
+        tokens = tokenize(prompt)
+        hit = cached_tokens(tokens, previous)
+        cached += hit
+        uncached += len(tokens) - hit
+        previous.append(tokens)
+        history.append(f"assistant: Added task number {turn}, due tomorrow.")
+    return cached, uncached
+
+
+def main() -> None:
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    stable = check_prefix_stability()
+
+    static_tokens = len(tokenize(TOOLS_TEXT + "\n" + STATIC_PROMPT))
+    print(f"Static prefix (tools + instructions): {static_tokens} tokens ({TOKENIZER}); "
+          f"provider caching starts at {CACHE_MIN_TOKENS}")
+
+    layouts = {
+        "static first (current)": lambda now: get_system_prompt("en", 300, now),
+        "time first (previous)": lambda now: get_prompt_context("en", 300, now) + "\n\n" + STATIC_PROMPT,
+    }
+    print(f"\nInput tokens over {turns} turns, one a minute:")
+    for name, layout in layouts.items():
+        cached, uncached = replay(layout, turns)
+        total = cached + uncached
+        print(f"  {name:24s} cached {cached:7d}  uncached {uncached:7d}  ({cached / total:.0%} cached)")
+
+    if not stable:
+        print("\n[FAIL] The system prompt prefix changes between renderings")
+        sys.exit(1)
+    print("\n[OK] System prompt prefix is stable")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Check the number of SQL statements each task endpoint issues.
+
+Drives the app in-process against a temporary SQLite database and fails
+loudly (AssertionError listing the statements) when an endpoint exceeds its
+query budget, e.g. GET /tasks must stay at a single SELECT:
+
+    python check_query_budgets.py
+"""
+
+import os
+import tempfile
+import time
+
+# Configure before the app modules read their settings
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'budgets.db')}"
+os.environ.setdefault("BETTER_AUTH_SECRET", "query-budget-check-secret")
+os.environ["IDEMPOTENCY_BACKEND"] = "memory"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from jose import jwt  # noqa: E402
+
+from src.auth import ALGORITHM, BETTER_AUTH_SECRET  # noqa: E402
+from src.database import create_db_and_tables, get_engine  # noqa: E402
+from src.main import app  # noqa: E402
+from src.metrics import query_budget  # noqa: E402
+from src.services.task_cache import task_cache  # noqa: E402
+
+USER_ID = "query_budget_user"
+
+
+def main() -> None:
+    create_db_and_tables()
+    engine = get_engine()
+    # No lifespan: the reminder scheduler stays off, so only request statements are counted
+    client = TestClient(app)
+    token = jwt.encode(
+        {"sub": USER_ID, "exp": int(time.time()) + 3600},
+        BETTER_AUTH_SECRET,
+        algorithm=ALGORITHM,
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    base = f"/api/{USER_ID}/tasks"
+
+    def check(label: str, budget: int, method: str, url: str, **kwargs):
+        with query_budget(engine, budget, label) as counter:
+            response = client.request(method, url, headers=headers, **kwargs)
+        assert response.status_code < 400, f"{label}: HTTP {response.status_code} {response.text}"
+        print(f"  {label:<32} {counter.count} / {budget} queries")
+        return response
+
+    print("Query budgets:")
+    task = check("POST /tasks", 2, "POST", base, json={
+        "title": "Budget task",
+        "priority": "high",
+        "reminder_time": "2030-01-01T09:00:00Z",
+    }).json()
+    task_url = f"{base}/{task['id']}"
+
+    task_cache.clear()
+    check("GET /tasks (cold cache)", 1, "GET", base)
+    check("GET /tasks (warm cache)", 0, "GET", base)
+    check("GET /tasks?q=...", 1, "GET", base, params={"q": "budget"})
+    check("GET /tasks/stats", 1, "GET", f"{base}/stats")
+    task_cache.clear()
+    check("GET /tasks/{id} (cold cache)", 1, "GET", task_url)
+    check("PUT /tasks/{id}", 3, "PUT", task_url, json={"title": "Renamed"})
+    check("PATCH /tasks/{id}/reminded", 1, "PATCH", f"{task_url}/reminded")
+    check("PATCH /tasks/{id}/complete", 1, "PATCH", f"{task_url}/complete")
+    check("DELETE /tasks/{id}", 2, "DELETE", task_url)
+    print("OK: every endpoint is within its query budget")
+
+
+if __name__ == "__main__":
+    main()
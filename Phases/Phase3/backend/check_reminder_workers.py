@@ -0,0 +1,96 @@
+"""Check that concurrent reminder workers deliver every due reminder exactly once.
+
+Runs several ReminderWorker instances in parallel threads against a database
+seeded with due reminders and verifies no reminder is claimed twice.
+Uses a temporary SQLite database by default; pass a PostgreSQL URL to
+exercise FOR UPDATE SKIP LOCKED:
+
+    python check_reminder_workers.py [DATABASE_URL]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from sqlmodel import Session, SQLModel, create_engine, delete
+
+from src.models.task import Task, TaskStatus
+from src.services.reminder_scheduler import utc_now
+from src.services.reminder_worker import ReminderWorker
+
+WORKERS = 8
+TASKS = 2000
+BATCH_SIZE = 50
+USER_ID = "reminder_worker_check"
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        url = sys.argv[1]
+        engine = create_engine(url)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "reminders.db")
+        url = f"sqlite:///{path}"
+        engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 30})
+
+    SQLModel.metadata.create_all(engine)
+    now = utc_now()
+    with Session(engine) as session:
+        session.execute(delete(Task).where(Task.user_id == USER_ID))
+        for i in range(TASKS):
+            session.add(Task(
+                title=f"Reminder {i}",
+                user_id=USER_ID,
+                status=TaskStatus.PENDING if i % 10 else TaskStatus.COMPLETED,
+                reminder_time=now - timedelta(seconds=i % 60),
+            ))
+        # Future reminders must not be claimed
+        session.add(Task(title="Later", user_id=USER_ID, reminder_time=now + timedelta(hours=1)))
+        session.commit()
+
+    claimed = Counter()
+    errors = []
+    lock = threading.Lock()
+    start = threading.Barrier(WORKERS)
+
+    def run_worker() -> None:
+        worker = ReminderWorker(engine=engine, batch_size=BATCH_SIZE)
+        start.wait()
+        try:
+            while True:
+                events = worker.dispatch_once()
+                with lock:
+                    claimed.update(event["task"]["id"] for event in events)
+                if not events:
+                    return
+        except Exception as e:  # noqa: BLE001 - report any worker failure
+            errors.append(e)
+
+    threads = [threading.Thread(target=run_worker) for _ in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = sum(1 for i in range(TASKS) if i % 10)
+    duplicates = [task_id for task_id, count in claimed.items() if count > 1]
+
+    print(f"Database: {url}")
+    print(f"Workers: {WORKERS}, batch size: {BATCH_SIZE}")
+    print(f"Claimed: {len(claimed)} (expected {expected}), duplicates: {len(duplicates)}")
+
+    with Session(engine) as session:
+        session.execute(delete(Task).where(Task.user_id == USER_ID))
+        session.commit()
+
+    assert not errors, f"Worker errors: {errors}"
+    assert not duplicates, f"Reminders delivered twice: {duplicates[:10]}"
+    assert len(claimed) == expected, "Some due reminders were not claimed"
+    print("[OK] Every due reminder was delivered exactly once")
+
+
+if __name__ == "__main__":
+    main()
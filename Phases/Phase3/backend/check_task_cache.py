@@ -0,0 +1,62 @@
+"""Check the task read-through cache's invalidation rules.
+
+Replays the read-through sequence of TaskService (generation, query, set)
+against InMemoryTaskCache, including a write that invalidates the user
+between the query and set(), and fails (AssertionError) if a result that
+predates a write is stored:
+
+    python check_task_cache.py
+"""
+
+from src.services.task_cache import InMemoryTaskCache, list_key, task_key
+
+USER_ID = "task_cache_user"
+OTHER_USER_ID = "task_cache_other_user"
+LIST = list_key(("id", "title"), ())
+TASK = task_key(1, ("id", "title"))
+
+
+def main() -> None:
+    cache = InMemoryTaskCache(max_size=100, ttl=60)
+
+    # Plain read-through: stored and served
+    generation = cache.generation(USER_ID)
+    cache.set(USER_ID, LIST, [(1, "Old title")], generation)
+    assert cache.get(USER_ID, LIST) == [(1, "Old title")], "read-through result not stored"
+    print("  read-through          -> stored")
+
+    # A write invalidates lists and the touched task
+    cache.set(USER_ID, TASK, (1, "Old title"), cache.generation(USER_ID))
+    cache.invalidate(USER_ID, 1)
+    assert cache.get(USER_ID, LIST) is None and cache.get(USER_ID, TASK) is None, "write not invalidated"
+    print("  write                 -> list and task dropped")
+
+    # Lost invalidation: GET reads, PATCH commits and invalidates, GET stores old rows
+    generation = cache.generation(USER_ID)
+    rows_read_before_write = [(1, "Old title")]
+    cache.invalidate(USER_ID, 1)  # Nothing cached: must still bump the generation
+    cache.set(USER_ID, LIST, rows_read_before_write, generation)
+    assert cache.get(USER_ID, LIST) is None, "rows read before a concurrent write were cached"
+    print("  write during query    -> stale rows not stored")
+
+    # Same for invalidate_user and single-task entries
+    generation = cache.generation(USER_ID)
+    cache.invalidate_user(USER_ID)
+    cache.set(USER_ID, TASK, (1, "Old title"), generation)
+    assert cache.get(USER_ID, TASK) is None, "task row read before invalidate_user was cached"
+    print("  invalidate_user       -> stale row not stored")
+
+    # Other users are not affected by the invalidation
+    generation = cache.generation(OTHER_USER_ID)
+    cache.invalidate(USER_ID)
+    cache.set(OTHER_USER_ID, LIST, [(2, "Theirs")], generation)
+    assert cache.get(OTHER_USER_ID, LIST) == [(2, "Theirs")], "another user's write blocked caching"
+    print("  other user's write    -> stored")
+
+    stats = cache.stats()
+    assert stats["stale_sets"] == 2, stats
+    print(f"[OK] Cache invalidation rules hold ({stats['stale_sets']} stale results skipped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""In-process load test for the backend.
+
+Drives the FastAPI app through httpx's ASGI transport (no server, no network)
+with a mix of CRUD, polling and chat workloads from concurrent virtual users,
+then prints p50/p95/p99 latency and throughput per endpoint as JSON. Tokens
+are signed locally with a test BETTER_AUTH_SECRET, and the LLM is replaced by
+an offline stand-in that answers after a fixed delay, so runs are repeatable
+and cost nothing:
+
+    python loadtest.py [--users 20] [--duration 20] [--mix crud=4,poll=5,chat=1]
+                       [--llm-latency 0.5] [--database-url URL] [--output FILE]
+
+Uses a temporary SQLite database unless --database-url is given.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run")
+    parser.add_argument("--mix", default="crud=4,poll=5,chat=1", help="workload weights")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per stand-in LLM turn")
+    parser.add_argument("--database-url", help="database to use (default: temporary SQLite)")
+    parser.add_argument("--seed-tasks", type=int, default=50, help="tasks created per user up front")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# Configure before the app modules read their settings
+os.environ["DATABASE_URL"] = args.database_url or (
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'loadtest.db')}"
+)
+os.environ.setdefault("BETTER_AUTH_SECRET", "loadtest-secret")
+os.environ.setdefault("OPENAI_API_KEY", "sk-offline-loadtest")
+os.environ.setdefault("IDEMPOTENCY_BACKEND", "memory")
+# The harness measures the service, not the per-user chat limit
+os.environ.setdefault("CHAT_RATE_PER_MINUTE", "1000000")
+os.environ.setdefault("CHAT_BURST", "1000000")
+
+import httpx  # noqa: E402
+from agents import RunContextWrapper, Runner  # noqa: E402
+from jose import jwt  # noqa: E402
+
+from src.auth import ALGORITHM, BETTER_AUTH_SECRET  # noqa: E402
+from src.database import create_db_and_tables  # noqa: E402
+from src.main import app  # noqa: E402
+
+
+class OfflineResult:
+    """The parts of a RunResult the chat endpoints read."""
+
+    def __init__(self, text: str):
+        self.final_output = text
+        self.new_items: list = []
+        self.context_wrapper = RunContextWrapper(context=None)  # Zero token usage
+
+
+class OfflineRunner:
+    """Stand-in for the LLM: answers every turn after a fixed delay."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def run(self, agent, messages, **kwargs) -> OfflineResult:
+        await asyncio.sleep(self.latency)
+        return OfflineResult(self._reply(messages))
+
+    @staticmethod
+    def _reply(messages) -> str:
+        last = messages[-1]["content"] if messages else ""
+        return f"(offline) You said: {last}"
+
+    def install(self) -> None:
+        Runner.run = self.run
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    unknown = set(weights) - {"crud", "poll", "chat"}
+    if unknown:
+        sys.exit(f"Unknown workloads in --mix: {', '.join(sorted(unknown))}")
+    return weights
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    """Latencies and error counts per endpoint label."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[label].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for label in sorted(self.latencies):
+            values = sorted(self.latencies[label])
+            endpoints[label] = {
+                "requests": len(values),
+                "errors": self.errors[label],
+                "throughput_rps": round(len(values) / elapsed, 2),
+                "mean_ms": round(sum(values) / len(values) * 1000, 2),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "total_requests": total,
+            "total_errors": sum(self.errors.values()),
+            "throughput_rps": round(total / elapsed, 2),
+            "endpoints": endpoints,
+        }
+
+
+class VirtualUser:
+    """One signed-in user running workloads until the deadline."""
+
+    def __init__(self, index: int, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random):
+        self.user_id = f"loadtest_user_{index}"
+        token = jwt.encode(
+            {"sub": self.user_id, "exp": int(time.time()) + 24 * 3600},
+            BETTER_AUTH_SECRET,
+            algorithm=ALGORITHM,
+        )
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.base = f"/api/{self.user_id}"
+        self.task_ids: List[int] = []
+        self.conversation_id = None
+
+    async def call(self, label: str, method: str, path: str, **kwargs):
+        return await self.recorder.request(
+            self.client, label, method, f"{self.base}{path}", headers=self.headers, **kwargs
+        )
+
+    async def create_task(self) -> None:
+        response = await self.call("POST /tasks", "POST", "/tasks", json={
+            "title": f"Load test task {self.rng.randrange(1_000_000)}",
+            "description": "Created by loadtest.py",
+            "priority": self.rng.choice(["high", "medium", "low"]),
+        })
+        if response.status_code == 201:
+            self.task_ids.append(response.json()["id"])
+
+    async def crud(self) -> None:
+        action = self.rng.random()
+        if action < 0.4 or not self.task_ids:
+            await self.create_task()
+        elif action < 0.7:
+            task_id = self.rng.choice(self.task_ids)
+            await self.call("PUT /tasks/{id}", "PUT", f"/tasks/{task_id}",
+                            json={"title": f"Updated {self.rng.randrange(1_000_000)}"})
+        elif action < 0.85:
+            task_id = self.rng.choice(self.task_ids)
+            await self.call("PATCH /tasks/{id}/complete", "PATCH", f"/tasks/{task_id}/complete")
+        else:
+            task_id = self.task_ids.pop(self.rng.randrange(len(self.task_ids)))
+            await self.call("DELETE /tasks/{id}", "DELETE", f"/tasks/{task_id}")
+
+    async def poll(self) -> None:
+        action = self.rng.random()
+        if action < 0.6:
+            await self.call("GET /tasks", "GET", "/tasks")
+        elif action < 0.8:
+            await self.call("GET /tasks/stats", "GET", "/tasks/stats")
+        elif action < 0.9:
+            await self.call("GET /tasks?q=", "GET", "/tasks", params={"q": "task"})
+        elif self.task_ids:
+            await self.call("GET /tasks/{id}", "GET", f"/tasks/{self.rng.choice(self.task_ids)}")
+        else:
+            await self.call("GET /tasks", "GET", "/tasks")
+
+    async def chat(self) -> None:
+        body = {"message": "What tasks do I have today?"}
+        if self.conversation_id:
+            body["conversation_id"] = self.conversation_id
+        response = await self.call("POST /chat", "POST", "/chat", json=body)
+        if response.status_code == 200:
+            self.conversation_id = response.json()["conversation_id"]
+
+    async def run(self, deadline: float, workloads: List[str], weights: List[float]) -> None:
+        while time.perf_counter() < deadline:
+            workload = self.rng.choices(workloads, weights)[0]
+            await getattr(self, workload)()
+
+
+async def main() -> None:
+    weights = parse_mix(args.mix)
+    create_db_and_tables()
+    OfflineRunner(args.llm_latency).install()
+
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        users = [VirtualUser(i, client, recorder, random.Random(i)) for i in range(args.users)]
+
+        # Seed each user's list so polling reads realistic payloads (not measured)
+        seeding = Recorder()
+        for user in users:
+            user.recorder = seeding
+            for _ in range(args.seed_tasks):
+                await user.create_task()
+            user.recorder = recorder
+
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            user.run(deadline, list(weights), list(weights.values())) for user in users
+        ))
+        elapsed = time.perf_counter() - start
+
+    report = {
+        "config": {
+            "users": args.users,
+            "duration_s": round(elapsed, 2),
+            "mix": weights,
+            "llm_latency_s": args.llm_latency,
+            "database": os.environ["DATABASE_URL"].split("://")[0],
+            "seed_tasks_per_user": args.seed_tasks,
+        },
+        **recorder.report(elapsed),
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,19 @@
+"""Create the database schema (run once per deploy, before starting the app).
+
+Creates any missing tables and indexes; existing tables are left untouched,
+so column additions still go through the add_*.py migration scripts.
+
+    python migrate.py
+"""
+
+from src.database import create_db_and_tables, engine
+
+
+def migrate():
+    """Create all missing tables and indexes."""
+    create_db_and_tables()
+    print(f"[OK] Schema is up to date ({engine.dialect.name})")
+
+
+if __name__ == "__main__":
+    migrate()
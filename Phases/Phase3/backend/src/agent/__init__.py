@@ -1,11 +1,11 @@
 """AI Agent module for todo chatbot using OpenAI Agents SDK."""
 
-from src.agent.chat import process_chat_message, create_agent
+from src.agent.chat import process_chat_message, get_agent
 from src.agent.tools import add_task, list_tasks, complete_task, delete_task, update_task
 
 __all__ = [
     "process_chat_message",
-    "create_agent",
+    "get_agent",
     "add_task",
     "list_tasks",
     "complete_task",
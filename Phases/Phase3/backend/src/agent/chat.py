@@ -3,10 +3,11 @@
 import json
 import os
 from datetime import date, datetime, timedelta, timezone
-from typing import Optional, List
+from typing import Callable, Optional, List
 
-from agents import Agent, Runner, function_tool
+from agents import Agent, RunContextWrapper, Runner, function_tool
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
 from src.agent.tools import (
     add_task,
@@ -15,37 +16,18 @@ from src.agent.tools import (
     delete_task,
     update_task,
 )
+from src.metrics import LLM_INPUT_TOKENS
 
 # Model to use
 OPENAI_MODEL = "gpt-4o-mini"
 
 
-def get_system_prompt(language: str = "en", user_timezone_offset: int = 0) -> str:
-    """Get system prompt with current date and language support."""
-    # Use UTC time + user's timezone offset so AI calculates times correctly for user's local time
-    utc_now = datetime.now(timezone.utc)
-    user_now = utc_now + timedelta(minutes=user_timezone_offset)
-    today = user_now.date()
-    now = user_now
-    tomorrow = (today + timedelta(days=1)).isoformat()
-    next_week = (today + timedelta(days=7)).isoformat()
-
-    # Calculate example future times for relative reminders (in UTC with Z suffix)
-    in_1_min = (utc_now + timedelta(minutes=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
-    in_2_hours = (utc_now + timedelta(hours=2)).strftime('%Y-%m-%dT%H:%M:%SZ')
-
-    # Language-specific instructions
-    language_instruction = ""
-    if language == "ur":
-        language_instruction = "\n\nIMPORTANT: Respond to the user in Urdu (اردو). Use natural, conversational Urdu language in all your responses."
-
-    return f"""You are a helpful todo assistant. You help users manage their tasks through natural conversation.{language_instruction}
-
-CURRENT DATE & TIME INFO:
-- Today: {today.strftime('%A, %B %d, %Y')} ({today.isoformat()})
-- Current time: {now.strftime('%I:%M %p')} ({now.isoformat()})
-- Tomorrow: {(today + timedelta(days=1)).strftime('%A, %B %d, %Y')} ({tomorrow})
-- Next week: {(today + timedelta(days=7)).strftime('%A, %B %d, %Y')} ({next_week})
+# Static part of the system prompt. It must not change between turns: it is
+# the prefix the provider caches, so dates, times and language go in the
+# suffix built by get_prompt_context() and are referenced here by name.
+STATIC_PROMPT = """You are a helpful todo assistant. You help users manage their tasks through natural conversation.
+
+The CURRENT CONTEXT section at the end of these instructions gives today's date and the user's local time.
 
 You have access to the following tools to manage tasks:
 - add_task: Create new tasks with title, description, priority, due_date, and reminder_time (for alarms)
@@ -54,171 +36,154 @@ You have access to the following tools to manage tasks:
 - delete_task: Delete a task
 - update_task: Update a task's title, description, priority, due_date, reminder_time, or status
 
-⚠️ CRITICAL REMINDER/ALARM RULE:
-Whenever the user says "remind me", "set alarm", "notify me", or "alert me", you MUST:
-1. Calculate the exact time (absolute or relative to current UTC time {utc_now.strftime('%Y-%m-%dT%H:%M:%SZ')})
-2. Pass it to the reminder_time parameter in UTC ISO format (YYYY-MM-DDTHH:MM:SSZ)
-3. WITHOUT the reminder_time parameter, NO alarm will ring!
-4. ALWAYS append Z at the end to indicate UTC timezone!
-
 CRITICAL TASK IDENTIFICATION RULES:
 1. ALWAYS call list_tasks() FIRST before completing, deleting, or updating a task by name
 2. Match task names fuzzy - "call john" matches "Call John" or "call john"
 3. If multiple matches, ask user which one
 4. To reopen a completed task: use update_task with status="pending"
 
-CRITICAL DATE & PRIORITY PARSING RULES:
-1. ALWAYS set due_date when user mentions timing:
-   - "today" → {today.isoformat()}
-   - "tomorrow" → {tomorrow}
-   - "next week" → {next_week}
-   - "in 3 days" → calculate and use YYYY-MM-DD format
-   - If no date mentioned, leave due_date as null
-
-2. ALWAYS set priority based on context:
+DATES, TIMES & PRIORITIES:
+1. Pass dates and times to the tools as the user said them, in English - don't calculate them.
+   The server resolves them in the user's timezone:
+   - due_date: "today", "tomorrow", "next week", "in 3 days", "Friday", "next Monday"
+   - reminder_time: "in 5 minutes", "in 2 hours", "at 5pm", "tomorrow at 5pm", "next Monday 9am"
+   - Translate Urdu phrases first (e.g. "کل شام 5 بجے" → "tomorrow at 5pm")
+2. Whenever the user says "remind me", "set alarm", "notify me" or "alert me", you MUST pass reminder_time - without it NO alarm will ring.
+   If they give no time, ask for one. If a tool returns INVALID_DATE, rephrase or ask the user.
+3. If no date is mentioned, leave due_date empty
+4. ALWAYS set priority based on context:
    - "urgent", "important", "asap", "critical" → priority="high"
    - "low priority", "when you can", "someday" → priority="low"
    - Default → priority="medium"
-
-3. REMINDER/ALARM PARSING - CRITICAL FOR ALARM FUNCTIONALITY:
-   When user says "remind me", "set alarm", "notify me", you MUST set the reminder_time parameter:
-
-   ABSOLUTE TIMES:
-   - "remind me at 5 PM" → reminder_time="{today.isoformat()}T17:00:00"
-   - "remind me at 2:30 PM" → reminder_time="{today.isoformat()}T14:30:00"
-   - "set alarm for 3:30 PM tomorrow" → reminder_time="{tomorrow}T15:30:00"
-   - "remind me at 9 AM on Monday" → calculate next Monday at 9 AM
-
-   RELATIVE TIMES (ADD to current UTC time {utc_now.strftime('%Y-%m-%dT%H:%M:%SZ')}):
-   - "remind me in 1 minute" → reminder_time="{in_1_min}"
-   - "remind me in 5 minutes" → ADD 5 minutes to current UTC time, append Z
-   - "notify me in 2 hours" → reminder_time="{in_2_hours}"
-   - "remind me in 30 seconds" → ADD 30 seconds to current UTC time, append Z
-
-   FORMAT: Always use UTC ISO 8601 with Z suffix: YYYY-MM-DDTHH:MM:SSZ (e.g., "2026-01-31T14:30:00Z")
-
-   IMPORTANT: You MUST calculate the exact time and pass it to reminder_time parameter!
-   If user says "remind me" without specific time, ask for clarification.
-
-4. NEVER ask for clarification on dates or priorities - infer from context
-5. Always call tools immediately - don't ask unnecessary questions
-6. Be concise - confirm actions briefly after completing them
-7. When listing tasks, format them nicely with due dates, priorities, and reminder times
+5. NEVER ask for clarification on dates or priorities otherwise - infer from context
+6. Always call tools immediately - don't ask unnecessary questions
+7. Be concise - confirm actions briefly after completing them
+8. When listing tasks, format them nicely with due dates, priorities, and reminder times
 
 EXAMPLES:
 Creating tasks:
-- "add task to buy groceries tomorrow" → add_task(title="Buy groceries", due_date="{tomorrow}", priority="medium")
-- "create urgent task to finish report today" → add_task(title="Finish report", due_date="{today.isoformat()}", priority="high")
-- "remind me to call mom at 5 PM" → add_task(title="Call mom", reminder_time="{today.isoformat()}T17:00:00", priority="medium")
-- "remind me in 1 minute" → add_task(title="Reminder", reminder_time="{in_1_min}", priority="medium")
-- "notify me in 2 hours to check email" → add_task(title="Check email", reminder_time="{in_2_hours}", priority="medium")
-- "set alarm for gym at 6 AM tomorrow" → add_task(title="Gym", due_date="{tomorrow}", reminder_time="{tomorrow}T06:00:00", priority="medium")
+- "add task to buy groceries tomorrow" → add_task(title="Buy groceries", due_date="tomorrow", priority="medium")
+- "create urgent task to finish report today" → add_task(title="Finish report", due_date="today", priority="high")
+- "remind me to call mom at 5 PM" → add_task(title="Call mom", reminder_time="at 5pm", priority="medium")
+- "notify me in 2 hours to check email" → add_task(title="Check email", reminder_time="in 2 hours", priority="medium")
+- "set alarm for gym at 6 AM tomorrow" → add_task(title="Gym", due_date="tomorrow", reminder_time="tomorrow at 6am", priority="medium")
 
 Acting on existing tasks:
 - "mark call john as complete" → FIRST list_tasks(), THEN complete_task(task_id=<found_id>)
 - "delete buy groceries task" → FIRST list_tasks(), THEN delete_task(task_id=<found_id>)
 - "mark task 57 as incomplete" → update_task(task_id=57, status="pending")
-- "change reminder time to 3 PM for task 42" → update_task(task_id=42, reminder_time="{today.isoformat()}T15:00:00")
+- "change reminder time to 3 PM for task 42" → update_task(task_id=42, reminder_time="at 3pm")
 
-Remember: ALWAYS list tasks first when user refers to task by name. Act immediately, parse dates and priorities intelligently, don't ask questions unless truly necessary."""
+Remember: ALWAYS list tasks first when user refers to task by name. Act immediately, pass dates as phrases, don't ask questions unless truly necessary."""
 
+# Per-language line appended to the dynamic suffix
+LANGUAGE_INSTRUCTIONS = {
+    "ur": "IMPORTANT: Respond to the user in Urdu (اردو). Use natural, conversational Urdu language in all your responses.",
+}
 
-# Create function tools using the @function_tool decorator
-@function_tool
-def mcp_add_task(
-    user_id: str,
-    title: str,
-    description: str = "",
-    priority: str = "medium",
-    due_date: str = "",
-    reminder_time: str = ""
-) -> str:
-    """
-    Create a new task for the user.
 
-    Args:
-        user_id: The user's ID
-        title: The task title
-        description: Optional task description
-        priority: Task priority (low, medium, high)
-        due_date: Due date in YYYY-MM-DD format
-        reminder_time: Reminder time in ISO 8601 format (YYYY-MM-DDTHH:MM:SS)
-    """
-    # Import here to avoid circular imports
-    from src.database import get_engine
-    from sqlmodel import Session
-
-    engine = get_engine()
-    with Session(engine) as session:
-        result = add_task(
-            session,
-            user_id,
-            title,
-            description=description if description else None,
-            priority=priority,
-            due_date=due_date if due_date else None,
-            reminder_time=reminder_time if reminder_time else None
-        )
-        return json.dumps(result)
+def get_prompt_context(
+    language: str = "en",
+    user_timezone_offset: int = 0,
+    utc_now: Optional[datetime] = None,
+) -> str:
+    """The dynamic suffix of the system prompt: current date, local time and language."""
+    # Use UTC time + user's timezone offset so AI calculates times correctly for user's local time
+    utc_now = (utc_now or datetime.now(timezone.utc)).replace(microsecond=0)
+    now = utc_now + timedelta(minutes=user_timezone_offset)
+    today = now.date()
+
+    lines = [
+        "CURRENT CONTEXT:",
+        f"- Today: {today.strftime('%A, %B %d, %Y')} ({today.isoformat()})",
+        f"- Current local time: {now.strftime('%I:%M %p')}",
+    ]
+    if language in LANGUAGE_INSTRUCTIONS:
+        lines += ["", LANGUAGE_INSTRUCTIONS[language]]
+    return "\n".join(lines)
+
+
+def get_system_prompt(
+    language: str = "en",
+    user_timezone_offset: int = 0,
+    utc_now: Optional[datetime] = None,
+) -> str:
+    """System prompt: the cacheable STATIC_PROMPT followed by the current date/time and language."""
+    return STATIC_PROMPT + "\n\n" + get_prompt_context(language, user_timezone_offset, utc_now)
 
 
-@function_tool
-def mcp_list_tasks(user_id: str, status: str = "all") -> str:
+def run_context(ctx: RunContextWrapper) -> dict:
     """
-    List the user's tasks.
+    The per-turn context dict (user_id, language, timezone_offset) of a run.
 
-    Args:
-        user_id: The user's ID
-        status: Filter by status - "all", "pending", or "completed"
+    /chat passes the dict as the run context; ChatKit runs pass an
+    AgentContext whose request_context is the same kind of dict.
     """
-    from src.database import get_engine
-    from sqlmodel import Session
+    return getattr(ctx.context, "request_context", ctx.context)
+
+
+async def run_tool(tool: Callable[..., dict], *args, **kwargs) -> str:
+    """Run a task tool with its own session in the threadpool, keeping the event loop free."""
+    def call() -> str:
+        from src.database import get_engine
+        with Session(get_engine()) as session:
+            return json.dumps(tool(session, *args, **kwargs))
 
-    engine = get_engine()
-    with Session(engine) as session:
-        result = list_tasks(session, user_id, status=status)
-        return json.dumps(result)
+    return await run_in_threadpool(call)
 
 
-@function_tool
-def mcp_complete_task(user_id: str, task_id: int) -> str:
+# Agent tools: the user comes from the run context, so one tool set serves everyone
+async def add_task_tool(
+    ctx: RunContextWrapper,
+    title: str,
+    description: str = "",
+    priority: str = "medium",
+    due_date: str = None,
+    reminder_time: str = None
+) -> str:
     """
-    Mark a task as completed.
+    Create a new task with optional reminder alarm.
 
     Args:
-        user_id: The user's ID
-        task_id: The ID of the task to complete
+        title: The task title (required)
+        description: Optional task description
+        priority: Task priority - "low", "medium", or "high" (default: "medium")
+        due_date: Due date as said by the user (e.g., "tomorrow", "next Friday") or YYYY-MM-DD
+        reminder_time: Reminder alarm time as said by the user (e.g., "in 10 minutes", "tomorrow at 5pm"). Use this when user says "remind me at 5 PM" or "set an alarm for 3 PM"
     """
-    from src.database import get_engine
-    from sqlmodel import Session
+    # Retried tool calls reuse their call id, so they can't create duplicates
+    tool_call_id = getattr(ctx, "tool_call_id", None)
+    context = run_context(ctx)
+    return await run_tool(
+        add_task,
+        context["user_id"],
+        title,
+        description=description,
+        priority=priority,
+        due_date=due_date,
+        reminder_time=reminder_time,
+        idempotency_key=f"tool:{tool_call_id}" if tool_call_id else None,
+        timezone_offset=context.get("timezone_offset", 0),
+    )
 
-    engine = get_engine()
-    with Session(engine) as session:
-        result = complete_task(session, user_id, task_id)
-        return json.dumps(result)
 
+async def list_tasks_tool(ctx: RunContextWrapper, status: str = "all") -> str:
+    """List tasks. Args: status ('all', 'pending', or 'completed')"""
+    return await run_tool(list_tasks, run_context(ctx)["user_id"], status=status)
 
-@function_tool
-def mcp_delete_task(user_id: str, task_id: int) -> str:
-    """
-    Delete a task.
 
-    Args:
-        user_id: The user's ID
-        task_id: The ID of the task to delete
-    """
-    from src.database import get_engine
-    from sqlmodel import Session
+async def complete_task_tool(ctx: RunContextWrapper, task_id: int) -> str:
+    """Mark a task as completed. Args: task_id (required)"""
+    return await run_tool(complete_task, run_context(ctx)["user_id"], task_id)
 
-    engine = get_engine()
-    with Session(engine) as session:
-        result = delete_task(session, user_id, task_id)
-        return json.dumps(result)
 
+async def delete_task_tool(ctx: RunContextWrapper, task_id: int) -> str:
+    """Delete a task. Args: task_id (required)"""
+    return await run_tool(delete_task, run_context(ctx)["user_id"], task_id)
 
-@function_tool
-def mcp_update_task(
-    user_id: str,
+
+async def update_task_tool(
+    ctx: RunContextWrapper,
     task_id: int,
     title: str = "",
     description: str = "",
@@ -228,155 +193,87 @@ def mcp_update_task(
     status: str = ""
 ) -> str:
     """
-    Update a task's properties.
+    Update a task's details including reminder time and status.
 
     Args:
-        user_id: The user's ID
-        task_id: The ID of the task to update
-        title: New title (optional)
-        description: New description (optional)
-        priority: New priority - low, medium, high (optional)
-        due_date: New due date in YYYY-MM-DD format (optional)
-        reminder_time: New reminder time in ISO 8601 format (optional)
-        status: New status - pending or completed (optional)
+        task_id: The ID of the task to update (required)
+        title: New task title (optional)
+        description: New task description (optional)
+        priority: New priority - "low", "medium", or "high" (optional)
+        due_date: New due date as said by the user (e.g., "tomorrow") or YYYY-MM-DD (optional)
+        reminder_time: New reminder time as said by the user (e.g., "at 3pm", "in 2 hours") (optional)
+        status: New status - "pending" or "completed" (optional, use "pending" to reopen completed tasks)
     """
-    from src.database import get_engine
-    from sqlmodel import Session
-
-    engine = get_engine()
-    with Session(engine) as session:
-        result = update_task(
-            session, user_id, task_id,
-            title=title if title else None,
-            description=description if description else None,
-            priority=priority if priority else None,
-            due_date=due_date if due_date else None,
-            reminder_time=reminder_time if reminder_time else None,
-            status=status if status else None
+    context = run_context(ctx)
+    return await run_tool(
+        update_task, context["user_id"], task_id,
+        title=title if title else None,
+        description=description if description else None,
+        priority=priority if priority else None,
+        due_date=due_date if due_date else None,
+        reminder_time=reminder_time if reminder_time else None,
+        status=status if status else None,
+        timezone_offset=context.get("timezone_offset", 0),
+    )
+
+
+def build_tools() -> list:
+    """Wrap the tool functions as function tools (builds their JSON schemas)."""
+    return [
+        function_tool(tool)
+        for tool in (add_task_tool, list_tasks_tool, complete_task_tool, delete_task_tool, update_task_tool)
+    ]
+
+
+# Global tool set, shared by all agents
+AGENT_TOOLS = build_tools()
+
+LANGUAGES = ("en", "ur")
+
+
+def build_agent(language: str = "en", tools: Optional[list] = None) -> Agent:
+    """Build the agent for a language. The system prompt is rendered per run from the run context."""
+
+    def instructions(ctx: RunContextWrapper, agent: Agent) -> str:
+        return get_system_prompt(
+            language=language,
+            user_timezone_offset=run_context(ctx).get("timezone_offset", 0),
         )
-        return json.dumps(result)
-
-
-def create_agent(user_id: str, language: str = "en", timezone_offset: int = 0) -> Agent:
-    """Create an agent with MCP tools bound to a specific user with language support."""
-
-    # Create wrapped tools that inject user_id
-    @function_tool
-    def add_task_tool(
-        title: str,
-        description: str = "",
-        priority: str = "medium",
-        due_date: str = None,
-        reminder_time: str = None
-    ) -> str:
-        """
-        Create a new task with optional reminder alarm.
-
-        Args:
-            title: The task title (required)
-            description: Optional task description
-            priority: Task priority - "low", "medium", or "high" (default: "medium")
-            due_date: Due date in YYYY-MM-DD format (e.g., "2026-01-20")
-            reminder_time: Reminder alarm time in ISO format (e.g., "2026-01-25T17:00:00"). Use this when user says "remind me at 5 PM" or "set an alarm for 3 PM"
-        """
-        from src.database import get_engine
-        from sqlmodel import Session
-        engine = get_engine()
-        with Session(engine) as session:
-            result = add_task(
-                session,
-                user_id,
-                title,
-                description=description,
-                priority=priority,
-                due_date=due_date,
-                reminder_time=reminder_time
-            )
-            return json.dumps(result)
-
-    @function_tool
-    def list_tasks_tool(status: str = "all") -> str:
-        """List tasks. Args: status ('all', 'pending', or 'completed')"""
-        from src.database import get_engine
-        from sqlmodel import Session
-        engine = get_engine()
-        with Session(engine) as session:
-            result = list_tasks(session, user_id, status=status)
-            return json.dumps(result)
-
-    @function_tool
-    def complete_task_tool(task_id: int) -> str:
-        """Mark a task as completed. Args: task_id (required)"""
-        from src.database import get_engine
-        from sqlmodel import Session
-        engine = get_engine()
-        with Session(engine) as session:
-            result = complete_task(session, user_id, task_id)
-            return json.dumps(result)
-
-    @function_tool
-    def delete_task_tool(task_id: int) -> str:
-        """Delete a task. Args: task_id (required)"""
-        from src.database import get_engine
-        from sqlmodel import Session
-        engine = get_engine()
-        with Session(engine) as session:
-            result = delete_task(session, user_id, task_id)
-            return json.dumps(result)
-
-    @function_tool
-    def update_task_tool(
-        task_id: int,
-        title: str = "",
-        description: str = "",
-        priority: str = "",
-        due_date: str = "",
-        reminder_time: str = "",
-        status: str = ""
-    ) -> str:
-        """
-        Update a task's details including reminder time and status.
-
-        Args:
-            task_id: The ID of the task to update (required)
-            title: New task title (optional)
-            description: New task description (optional)
-            priority: New priority - "low", "medium", or "high" (optional)
-            due_date: New due date in YYYY-MM-DD format (optional)
-            reminder_time: New reminder time in ISO format (e.g., "2026-01-25T17:00:00") (optional)
-            status: New status - "pending" or "completed" (optional, use "pending" to reopen completed tasks)
-        """
-        from src.database import get_engine
-        from sqlmodel import Session
-        engine = get_engine()
-        with Session(engine) as session:
-            result = update_task(
-                session, user_id, task_id,
-                title=title if title else None,
-                description=description if description else None,
-                priority=priority if priority else None,
-                due_date=due_date if due_date else None,
-                reminder_time=reminder_time if reminder_time else None,
-                status=status if status else None
-            )
-            return json.dumps(result)
 
     return Agent(
         name="Todo Assistant",
-        instructions=get_system_prompt(language=language, user_timezone_offset=timezone_offset),
+        instructions=instructions,
         model=OPENAI_MODEL,
-        tools=[
-            add_task_tool,
-            list_tasks_tool,
-            complete_task_tool,
-            delete_task_tool,
-            update_task_tool,
-        ]
+        tools=AGENT_TOOLS if tools is None else tools,
     )
 
 
-def process_chat_message(
-    session: Session,
+# Global agent instances, one per language
+AGENTS = {language: build_agent(language) for language in LANGUAGES}
+
+
+def get_agent(language: str = "en") -> Agent:
+    """The shared agent for a language (English for unknown languages)."""
+    return AGENTS.get(language, AGENTS["en"])
+
+
+def record_usage(endpoint: str, result) -> dict:
+    """Count a run's input tokens as cached or uncached (provider prompt cache) and return them."""
+    usage = result.context_wrapper.usage
+    details = getattr(usage, "input_tokens_details", None)
+    cached = getattr(details, "cached_tokens", 0) or 0
+    uncached = max(usage.input_tokens - cached, 0)
+    LLM_INPUT_TOKENS.inc(endpoint, "hit", amount=cached)
+    LLM_INPUT_TOKENS.inc(endpoint, "miss", amount=uncached)
+    return {"cached": cached, "uncached": uncached}
+
+
+def chat_context(user_id: str, language: str = "en", timezone_offset: int = 0) -> dict:
+    """Run context for a chat turn: who the tools act for and how the prompt is rendered."""
+    return {"user_id": user_id, "language": language, "timezone_offset": timezone_offset}
+
+
+async def process_chat_message(
     user_id: str,
     message: str,
     conversation_history: Optional[List[dict]] = None,
@@ -385,8 +282,10 @@ def process_chat_message(
     """
     Process a chat message using the OpenAI Agents SDK.
 
+    The run is awaited on the event loop; tools do their database work in
+    the threadpool with their own sessions.
+
     Args:
-        session: Database session (not used directly, tools manage their own sessions)
         user_id: Authenticated user ID
         message: User's message
         conversation_history: Previous messages in the conversation
@@ -394,8 +293,9 @@ def process_chat_message(
     Returns:
         Dictionary with response and any tool calls made
     """
-    # Create agent for this user
-    agent = create_agent(user_id, timezone_offset=timezone_offset)
+    # Shared agent; the user and timezone travel in the run context
+    agent = get_agent()
+    context = chat_context(user_id, timezone_offset=timezone_offset)
 
     # Build input messages
     messages = []
@@ -404,7 +304,8 @@ def process_chat_message(
     messages.append({"role": "user", "content": message})
 
     # Run the agent
-    result = Runner.run_sync(agent, messages)
+    result = await Runner.run(agent, messages, context=context)
+    record_usage("chat", result)
 
     # Extract the final response
     response_text = ""
@@ -0,0 +1,197 @@
+"""ChatKit server (store + agent responder) behind the /chatkit endpoint."""
+
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+from chatkit.agents import AgentContext, stream_agent_response
+from chatkit.server import ChatKitServer
+from chatkit.store import Store
+from chatkit.types import (
+    ThreadMetadata,
+    UserMessageItem,
+    UserMessageTextContent,
+    ThreadStreamEvent,
+    AssistantMessageItem,
+    AssistantMessageContent,
+    ThreadItemAddedEvent,
+    ThreadItemDoneEvent,
+    ThreadItemUpdated,
+    AssistantMessageContentPartTextDelta,
+    ProgressUpdateEvent,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+from agents import Agent, RunContextWrapper, RunHooks, Runner
+
+from src.agent.chat import get_agent, record_usage
+from src.agent.chatkit_store import DatabaseStore, InMemoryStore
+from src.config import CHATKIT_STORE
+from src.metrics import LLM_FIRST_TOKEN, LLM_TIME
+from src.services.command_router import fast_path
+
+
+def create_store() -> Store[dict]:
+    """Build the store selected by CHATKIT_STORE."""
+    if CHATKIT_STORE == "memory":
+        return InMemoryStore()
+    return DatabaseStore()
+
+
+# Global store instance
+store = create_store()
+
+
+# Progress text shown while a tool runs
+TOOL_PROGRESS = {
+    "en": {
+        "add_task_tool": "Adding task...",
+        "list_tasks_tool": "Looking up your tasks...",
+        "complete_task_tool": "Completing task...",
+        "delete_task_tool": "Deleting task...",
+        "update_task_tool": "Updating task...",
+    },
+    "ur": {
+        "add_task_tool": "ٹاسک شامل کیا جا رہا ہے...",
+        "list_tasks_tool": "آپ کے ٹاسک دیکھے جا رہے ہیں...",
+        "complete_task_tool": "ٹاسک مکمل کیا جا رہا ہے...",
+        "delete_task_tool": "ٹاسک حذف کیا جا رہا ہے...",
+        "update_task_tool": "ٹاسک اپڈیٹ کیا جا رہا ہے...",
+    },
+}
+
+
+class ToolProgressHooks(RunHooks):
+    """Streams a progress event to the ChatKit client whenever a tool starts."""
+
+    def __init__(self, language: str = "en"):
+        self.labels = TOOL_PROGRESS.get(language, TOOL_PROGRESS["en"])
+
+    async def on_tool_start(self, context: RunContextWrapper[AgentContext], agent, tool) -> None:
+        text = self.labels.get(tool.name, f"Running {tool.name}...")
+        await context.context.stream(ProgressUpdateEvent(text=text))
+
+
+def is_text_delta(event: ThreadStreamEvent) -> bool:
+    """Whether the event carries assistant text tokens."""
+    return isinstance(event, ThreadItemUpdated) and isinstance(
+        event.update, AssistantMessageContentPartTextDelta
+    )
+
+
+class TodoChatKitServer(ChatKitServer[dict]):
+    """ChatKit server that uses OpenAI Agents SDK for todo management."""
+
+    async def respond(
+        self,
+        thread: ThreadMetadata,
+        input_user_message: UserMessageItem | None,
+        context: dict,
+    ) -> AsyncIterator[ThreadStreamEvent]:
+        """Process a message and yield streaming events."""
+
+        import sys
+        print("[CHATKIT] === RESPOND METHOD CALLED ===", flush=True)
+        sys.stdout.flush()
+
+        if not input_user_message:
+            print("[CHATKIT] No input message, returning", flush=True)
+            return
+
+        # Extract user message content
+        message_text = ""
+        for part in input_user_message.content:
+            if isinstance(part, UserMessageTextContent):
+                message_text = part.text
+                break
+
+        if not message_text:
+            return
+
+        # Get user_id and language from context
+        user_id = context.get("user_id", "default_user")
+        language = context.get("language", "en")
+
+        # Shared agent for the language; the tools read the user from the request context
+        agent = get_agent(language)
+
+        try:
+            # Simple commands ("complete task 57") are answered without the LLM
+            fast_result = await fast_path.handle(user_id, message_text)
+            if fast_result is not None:
+                reply = AssistantMessageItem(
+                    id=self.store.generate_item_id("message", thread, context),
+                    thread_id=thread.id,
+                    created_at=datetime.now(),
+                    content=[AssistantMessageContent(text=fast_result["response"], annotations=[])]
+                )
+                yield ThreadItemAddedEvent(item=reply)
+                yield ThreadItemDoneEvent(item=reply)
+                return
+
+            # Build input for the agent using standard OpenAI message format
+            messages = []
+
+            # Load existing thread items for context
+            existing_items = await self.store.load_thread_items(
+                thread.id, None, 100, "asc", context
+            )
+
+            # Convert existing items to messages
+            for item in existing_items.data:
+                if hasattr(item, 'role') and hasattr(item, 'content'):
+                    content_text = ""
+                    for part in item.content:
+                        if hasattr(part, 'text'):
+                            content_text = part.text
+                            break
+                    if content_text:
+                        messages.append({"role": item.role, "content": content_text})
+
+            # Add the new user message
+            messages.append({"role": "user", "content": message_text})
+
+            print(f"[CHATKIT] Running agent for user {user_id} with message: {message_text}", flush=True)
+
+            # Stream the run: text deltas and tool progress reach the client as they happen.
+            # Items are persisted by ChatKitServer when their ThreadItemDoneEvent passes through.
+            agent_context = AgentContext(thread=thread, store=self.store, request_context=context)
+            result = Runner.run_streamed(
+                agent,
+                messages,
+                context=agent_context,
+                hooks=ToolProgressHooks(language),
+            )
+            started = time.perf_counter()
+            first_token = True
+            with LLM_TIME.time("chatkit"), fast_path.agent_turn():
+                async for event in stream_agent_response(agent_context, result):
+                    if first_token and is_text_delta(event):
+                        LLM_FIRST_TOKEN.observe(time.perf_counter() - started, "chatkit")
+                        first_token = False
+                    yield event
+
+            tokens = record_usage("chatkit", result)
+            print(f"[CHATKIT] Agent response: {result.final_output} (input tokens: {tokens})", flush=True)
+
+        except Exception as e:
+            # Create error message
+            msg_id = self.store.generate_item_id("message", thread, context)
+            error_msg = AssistantMessageItem(
+                id=msg_id,
+                thread_id=thread.id,
+                created_at=datetime.now(),
+                content=[AssistantMessageContent(
+                    text=f"Sorry, an error occurred: {str(e)}",
+                    annotations=[]
+                )]
+            )
+            yield ThreadItemAddedEvent(item=error_msg)
+            yield ThreadItemDoneEvent(item=error_msg)
+
+
+# Create server instance with store
+chatkit_server = TodoChatKitServer(store=store)
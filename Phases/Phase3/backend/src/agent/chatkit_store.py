@@ -0,0 +1,489 @@
+"""ChatKit stores: SQL-backed (shared by every worker) and bounded in-memory.
+
+DatabaseStore keeps threads, items and attachments in the chatkit_* tables
+(see src/models/chatkit.py), so every worker and replica sees the same
+threads. Pages use keyset pagination on (created_at, id), so a page is one
+indexed query however long the thread is. Sessions come from a pooled async
+engine, so store calls never block the event loop.
+
+InMemoryStore is for single-process runs. Items are indexed by id for O(1)
+lookups and pages, and idle threads are evicted (LRU) above a memory cap.
+
+Both stores scope every lookup to the user in the request context.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
+
+from chatkit.store import NotFoundError, Store
+from chatkit.types import Attachment, Page, ThreadItem, ThreadMetadata
+from pydantic import TypeAdapter
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.config import CHATKIT_DB_POOL_SIZE, CHATKIT_MEMORY_MAX_BYTES
+from src.database import async_database_url
+from src.models.chatkit import ChatKitAttachment, ChatKitItem, ChatKitThread
+
+# Built once: validators for the ChatKit union types
+thread_item_adapter = TypeAdapter(ThreadItem)
+attachment_adapter = TypeAdapter(Attachment)
+
+PageModel = Union[Type[ChatKitThread], Type[ChatKitItem]]
+V = TypeVar("V")
+
+
+def created_at_key(value: datetime) -> datetime:
+    """Naive UTC, so ordering is consistent whatever timezone ChatKit used."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def user_of(context: dict) -> str:
+    return context.get("user_id", "default_user")
+
+
+def after_cursor(model: PageModel, cursor_id: str, descending: bool):
+    """Rows strictly after the cursor row in (created_at, id) order.
+
+    The cursor's created_at is read in a subquery, so a page stays one query.
+    An unknown cursor matches nothing.
+    """
+    cursor_created = select(model.created_at).where(model.id == cursor_id).scalar_subquery()
+    if descending:
+        return or_(
+            model.created_at < cursor_created,
+            and_(model.created_at == cursor_created, model.id < cursor_id),
+        )
+    return or_(
+        model.created_at > cursor_created,
+        and_(model.created_at == cursor_created, model.id > cursor_id),
+    )
+
+
+def page_order(model: PageModel, descending: bool) -> tuple:
+    if descending:
+        return model.created_at.desc(), model.id.desc()
+    return model.created_at.asc(), model.id.asc()
+
+
+class DatabaseStore(Store[dict]):
+    """ChatKit Store on the application database."""
+
+    def __init__(self, engine: Optional[AsyncEngine] = None):
+        self.engine = engine or create_async_engine(
+            async_database_url(),
+            pool_size=CHATKIT_DB_POOL_SIZE,
+            pool_pre_ping=True,
+        )
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def _page(self, statement, model: PageModel, after: Optional[str], limit: int, order: str):
+        descending = order == "desc"
+        if after:
+            statement = statement.where(after_cursor(model, after, descending))
+        statement = statement.order_by(*page_order(model, descending)).limit(limit + 1)
+        async with self.sessions() as session:
+            rows = list((await session.execute(statement)).scalars())
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return rows, has_more, (rows[-1].id if has_more and rows else None)
+
+    # Threads
+
+    async def load_thread(self, thread_id: str, context: dict) -> ThreadMetadata:
+        async with self.sessions() as session:
+            row = await session.get(ChatKitThread, thread_id)
+        if row is None or row.user_id != user_of(context):
+            raise NotFoundError(f"Thread {thread_id} not found")
+        return ThreadMetadata.model_validate_json(row.data)
+
+    async def save_thread(self, thread: ThreadMetadata, context: dict) -> None:
+        user_id = user_of(context)
+        # Store metadata only (a full Thread also carries its items)
+        data = ThreadMetadata.model_validate(thread.model_dump()).model_dump_json()
+        async with self.sessions() as session, session.begin():
+            row = await session.get(ChatKitThread, thread.id)
+            if row is None:
+                session.add(ChatKitThread(
+                    id=thread.id,
+                    user_id=user_id,
+                    created_at=created_at_key(thread.created_at),
+                    data=data,
+                ))
+            elif row.user_id != user_id:
+                raise NotFoundError(f"Thread {thread.id} not found")
+            else:
+                row.data = data
+
+    async def load_threads(
+        self,
+        limit: int,
+        after: str | None,
+        order: str,
+        context: dict,
+    ) -> Page[ThreadMetadata]:
+        statement = select(ChatKitThread).where(ChatKitThread.user_id == user_of(context))
+        rows, has_more, next_after = await self._page(statement, ChatKitThread, after, limit, order)
+        return Page(
+            data=[ThreadMetadata.model_validate_json(row.data) for row in rows],
+            has_more=has_more,
+            after=next_after,
+        )
+
+    async def delete_thread(self, thread_id: str, context: dict) -> None:
+        user_id = user_of(context)
+        async with self.sessions() as session, session.begin():
+            await session.execute(
+                delete(ChatKitItem)
+                .where(ChatKitItem.thread_id == thread_id)
+                .where(ChatKitItem.user_id == user_id)
+            )
+            await session.execute(
+                delete(ChatKitThread)
+                .where(ChatKitThread.id == thread_id)
+                .where(ChatKitThread.user_id == user_id)
+            )
+
+    # Thread items
+
+    async def load_thread_items(
+        self,
+        thread_id: str,
+        after: str | None,
+        limit: int,
+        order: str,
+        context: dict,
+    ) -> Page[ThreadItem]:
+        statement = (
+            select(ChatKitItem)
+            .where(ChatKitItem.thread_id == thread_id)
+            .where(ChatKitItem.user_id == user_of(context))
+        )
+        rows, has_more, next_after = await self._page(statement, ChatKitItem, after, limit, order)
+        return Page(
+            data=[thread_item_adapter.validate_json(row.data) for row in rows],
+            has_more=has_more,
+            after=next_after,
+        )
+
+    async def add_thread_item(self, thread_id: str, item: ThreadItem, context: dict) -> None:
+        # Upsert: an item may be added again when a stream is retried
+        await self.save_item(thread_id, item, context)
+
+    async def save_item(self, thread_id: str, item: ThreadItem, context: dict) -> None:
+        user_id = user_of(context)
+        async with self.sessions() as session, session.begin():
+            row = await session.get(ChatKitItem, item.id)
+            if row is None:
+                session.add(ChatKitItem(
+                    id=item.id,
+                    thread_id=thread_id,
+                    user_id=user_id,
+                    created_at=created_at_key(item.created_at),
+                    data=item.model_dump_json(),
+                ))
+            elif row.user_id != user_id or row.thread_id != thread_id:
+                raise NotFoundError(f"Item {item.id} not found in thread {thread_id}")
+            else:
+                row.data = item.model_dump_json()
+
+    async def load_item(self, thread_id: str, item_id: str, context: dict) -> ThreadItem:
+        async with self.sessions() as session:
+            row = await session.get(ChatKitItem, item_id)
+        if row is None or row.thread_id != thread_id or row.user_id != user_of(context):
+            raise NotFoundError(f"Item {item_id} not found in thread {thread_id}")
+        return thread_item_adapter.validate_json(row.data)
+
+    async def delete_thread_item(self, thread_id: str, item_id: str, context: dict) -> None:
+        async with self.sessions() as session, session.begin():
+            await session.execute(
+                delete(ChatKitItem)
+                .where(ChatKitItem.id == item_id)
+                .where(ChatKitItem.thread_id == thread_id)
+                .where(ChatKitItem.user_id == user_of(context))
+            )
+
+    async def delete_item(self, thread_id: str, item_id: str, context: dict) -> None:
+        await self.delete_thread_item(thread_id, item_id, context)
+
+    # Attachments
+
+    async def save_attachment(self, attachment: Attachment, context: dict) -> None:
+        user_id = user_of(context)
+        async with self.sessions() as session, session.begin():
+            row = await session.get(ChatKitAttachment, attachment.id)
+            if row is None:
+                session.add(ChatKitAttachment(
+                    id=attachment.id, user_id=user_id, data=attachment.model_dump_json()
+                ))
+            elif row.user_id != user_id:
+                raise NotFoundError(f"Attachment {attachment.id} not found")
+            else:
+                row.data = attachment.model_dump_json()
+
+    async def load_attachment(self, attachment_id: str, context: dict) -> Attachment:
+        async with self.sessions() as session:
+            row = await session.get(ChatKitAttachment, attachment_id)
+        if row is None or row.user_id != user_of(context):
+            raise NotFoundError(f"Attachment {attachment_id} not found")
+        return attachment_adapter.validate_json(row.data)
+
+    async def delete_attachment(self, attachment_id: str, context: dict) -> None:
+        async with self.sessions() as session, session.begin():
+            await session.execute(
+                delete(ChatKitAttachment)
+                .where(ChatKitAttachment.id == attachment_id)
+                .where(ChatKitAttachment.user_id == user_of(context))
+            )
+
+
+class OrderedIndex(Generic[V]):
+    """Insertion-ordered values with O(1) lookup by id and cursor paging.
+
+    Deleted slots become tombstones and are compacted once they make up
+    half of the list, so positions stay valid between compactions.
+    """
+
+    def __init__(self):
+        self._entries: List[Optional[Tuple[str, V]]] = []
+        self._positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def get(self, key: str) -> Optional[V]:
+        position = self._positions.get(key)
+        return None if position is None else self._entries[position][1]
+
+    def put(self, key: str, value: V) -> None:
+        """Replace in place, or append a new key at the end."""
+        position = self._positions.get(key)
+        if position is None:
+            self._positions[key] = len(self._entries)
+            self._entries.append((key, value))
+        else:
+            self._entries[position] = (key, value)
+
+    def remove(self, key: str) -> Optional[V]:
+        position = self._positions.pop(key, None)
+        if position is None:
+            return None
+        value = self._entries[position][1]
+        self._entries[position] = None
+        if len(self._entries) > 32 and len(self._positions) * 2 < len(self._entries):
+            self._compact()
+        return value
+
+    def values(self) -> List[V]:
+        return [entry[1] for entry in self._entries if entry is not None]
+
+    def page(self, after: Optional[str], limit: int, descending: bool) -> Tuple[List[V], bool, Optional[str]]:
+        """Up to limit values after the cursor key. Returns (values, has_more, next cursor)."""
+        step = -1 if descending else 1
+        if after is not None:
+            position = self._positions.get(after)
+            if position is None:
+                return [], False, None
+            index = position + step
+        else:
+            index = len(self._entries) - 1 if descending else 0
+
+        found: List[Tuple[str, V]] = []
+        while 0 <= index < len(self._entries) and len(found) <= limit:
+            entry = self._entries[index]
+            if entry is not None:
+                found.append(entry)
+            index += step
+        has_more = len(found) > limit
+        found = found[:limit]
+        return [value for _, value in found], has_more, (found[-1][0] if has_more and found else None)
+
+    def _compact(self) -> None:
+        self._entries = [entry for entry in self._entries if entry is not None]
+        self._positions = {key: position for position, (key, _) in enumerate(self._entries)}
+
+
+class ThreadState:
+    """A thread held by InMemoryStore."""
+
+    __slots__ = ("user_id", "metadata", "metadata_size", "items", "item_sizes")
+
+    def __init__(self, user_id: str, metadata: ThreadMetadata, metadata_size: int):
+        self.user_id = user_id
+        self.metadata = metadata
+        self.metadata_size = metadata_size
+        self.items: OrderedIndex[ThreadItem] = OrderedIndex()
+        self.item_sizes: Dict[str, int] = {}
+
+    @property
+    def size(self) -> int:
+        return self.metadata_size + sum(self.item_sizes.values())
+
+
+class InMemoryStore(Store[dict]):
+    """Per-process ChatKit store with indexed items and LRU eviction (single process only)."""
+
+    def __init__(self, max_bytes: int = CHATKIT_MEMORY_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0  # serialized bytes held
+        self.evicted_threads = 0
+        # Least recently used first
+        self._threads: "OrderedDict[str, ThreadState]" = OrderedDict()
+        # user_id -> thread ids in creation order (for load_threads)
+        self._user_threads: Dict[str, OrderedIndex[str]] = {}
+        # attachment id -> (user_id, attachment, size); least recently used first
+        self._attachments: "OrderedDict[str, Tuple[str, Attachment, int]]" = OrderedDict()
+
+    def stats(self) -> dict:
+        return {
+            "threads": len(self._threads),
+            "attachments": len(self._attachments),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "evicted_threads": self.evicted_threads,
+        }
+
+    def _thread(self, thread_id: str, context: dict) -> ThreadState:
+        """The user's thread, marked as recently used."""
+        state = self._threads.get(thread_id)
+        if state is None or state.user_id != user_of(context):
+            raise NotFoundError(f"Thread {thread_id} not found")
+        self._threads.move_to_end(thread_id)
+        return state
+
+    def _drop_thread(self, thread_id: str) -> None:
+        state = self._threads.pop(thread_id)
+        self.size -= state.size
+        user_threads = self._user_threads.get(state.user_id)
+        if user_threads is not None:
+            user_threads.remove(thread_id)
+            if not len(user_threads):
+                del self._user_threads[state.user_id]
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Drop idle threads, then old attachments, until under the memory cap."""
+        while self.size > self.max_bytes:
+            victim = next((thread_id for thread_id in self._threads if thread_id != keep), None)
+            if victim is not None:
+                self._drop_thread(victim)
+                self.evicted_threads += 1
+            elif self._attachments:
+                _, (_, _, size) = self._attachments.popitem(last=False)
+                self.size -= size
+            else:
+                return
+
+    # Threads
+
+    async def load_thread(self, thread_id: str, context: dict) -> ThreadMetadata:
+        return self._thread(thread_id, context).metadata
+
+    async def save_thread(self, thread: ThreadMetadata, context: dict) -> None:
+        # Store metadata only (a full Thread also carries its items)
+        metadata = ThreadMetadata.model_validate(thread.model_dump())
+        size = len(metadata.model_dump_json())
+        if thread.id in self._threads:
+            state = self._thread(thread.id, context)
+            self.size += size - state.metadata_size
+            state.metadata, state.metadata_size = metadata, size
+        else:
+            user_id = user_of(context)
+            self._threads[thread.id] = ThreadState(user_id, metadata, size)
+            self._user_threads.setdefault(user_id, OrderedIndex()).put(thread.id, thread.id)
+            self.size += size
+        self._evict(keep=thread.id)
+
+    async def load_threads(
+        self,
+        limit: int,
+        after: str | None,
+        order: str,
+        context: dict,
+    ) -> Page[ThreadMetadata]:
+        user_threads = self._user_threads.get(user_of(context))
+        if user_threads is None:
+            return Page(data=[], has_more=False, after=None)
+        thread_ids, has_more, next_after = user_threads.page(after, limit, order == "desc")
+        return Page(
+            data=[self._threads[thread_id].metadata for thread_id in thread_ids],
+            has_more=has_more,
+            after=next_after,
+        )
+
+    async def delete_thread(self, thread_id: str, context: dict) -> None:
+        state = self._threads.get(thread_id)
+        if state is not None and state.user_id == user_of(context):
+            self._drop_thread(thread_id)
+
+    # Thread items
+
+    async def load_thread_items(
+        self,
+        thread_id: str,
+        after: str | None,
+        limit: int,
+        order: str,
+        context: dict,
+    ) -> Page[ThreadItem]:
+        items, has_more, next_after = self._thread(thread_id, context).items.page(
+            after, limit, order == "desc"
+        )
+        return Page(data=items, has_more=has_more, after=next_after)
+
+    async def add_thread_item(self, thread_id: str, item: ThreadItem, context: dict) -> None:
+        await self.save_item(thread_id, item, context)
+
+    async def save_item(self, thread_id: str, item: ThreadItem, context: dict) -> None:
+        state = self._thread(thread_id, context)
+        size = len(item.model_dump_json())
+        self.size += size - state.item_sizes.get(item.id, 0)
+        state.item_sizes[item.id] = size
+        state.items.put(item.id, item)
+        self._evict(keep=thread_id)
+
+    async def load_item(self, thread_id: str, item_id: str, context: dict) -> ThreadItem:
+        item = self._thread(thread_id, context).items.get(item_id)
+        if item is None:
+            raise NotFoundError(f"Item {item_id} not found in thread {thread_id}")
+        return item
+
+    async def delete_thread_item(self, thread_id: str, item_id: str, context: dict) -> None:
+        state = self._threads.get(thread_id)
+        if state is None or state.user_id != user_of(context):
+            return
+        if state.items.remove(item_id) is not None:
+            self.size -= state.item_sizes.pop(item_id)
+
+    async def delete_item(self, thread_id: str, item_id: str, context: dict) -> None:
+        await self.delete_thread_item(thread_id, item_id, context)
+
+    # Attachments
+
+    async def save_attachment(self, attachment: Attachment, context: dict) -> None:
+        user_id = user_of(context)
+        existing = self._attachments.get(attachment.id)
+        if existing is not None:
+            if existing[0] != user_id:
+                raise NotFoundError(f"Attachment {attachment.id} not found")
+            self.size -= existing[2]
+        size = len(attachment.model_dump_json())
+        self._attachments[attachment.id] = (user_id, attachment, size)
+        self._attachments.move_to_end(attachment.id)
+        self.size += size
+        self._evict()
+
+    async def load_attachment(self, attachment_id: str, context: dict) -> Attachment:
+        entry = self._attachments.get(attachment_id)
+        if entry is None or entry[0] != user_of(context):
+            raise NotFoundError(f"Attachment {attachment_id} not found")
+        self._attachments.move_to_end(attachment_id)
+        return entry[1]
+
+    async def delete_attachment(self, attachment_id: str, context: dict) -> None:
+        entry = self._attachments.get(attachment_id)
+        if entry is not None and entry[0] == user_of(context):
+            del self._attachments[attachment_id]
+            self.size -= entry[2]
@@ -1,12 +1,16 @@
 """MCP Tools for the AI Agent to manage tasks."""
 
-from datetime import date, datetime
-from typing import Optional, Literal
+import json
+import re
+from datetime import date, datetime, timedelta
+from typing import Literal, NamedTuple, Optional, Tuple
 
 from sqlmodel import Session
 
 from src.models.task import TaskCreate, TaskUpdate, TaskStatus, TaskPriority
 from src.services.task_service import TaskService
+from src.services.idempotency import idempotency_store, request_hash
+from src.services.reminder_scheduler import utc_naive, utc_now
 
 
 def parse_date(date_str: Optional[str]) -> Optional[date]:
@@ -44,6 +48,196 @@ def parse_datetime(datetime_str: Optional[str]) -> Optional[datetime]:
         return None
 
 
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+UNIT_SECONDS = {
+    "second": 1, "sec": 1, "s": 1,
+    "minute": 60, "min": 60, "m": 60,
+    "hour": 3600, "hr": 3600, "h": 3600,
+    "day": 86400, "week": 604800,
+    # Urdu
+    "سیکنڈ": 1, "منٹ": 60, "گھنٹے": 3600, "گھنٹہ": 3600, "دن": 86400, "ہفتے": 604800,
+}
+# Units that name an exact instant; day/week offsets only pick a date
+INSTANT_UNITS = {1, 60, 3600}
+
+_AMOUNT = r"(\d+|an?|one|ایک)"
+_RELATIVE = re.compile(
+    rf"(?:(?:in|after)\s+{_AMOUNT}\s*(seconds?|secs?|s|minutes?|mins?|m|hours?|hrs?|h|days?|weeks?)"
+    rf"|{_AMOUNT}\s*(سیکنڈ|منٹ|گھنٹے|گھنٹہ|دن|ہفتے)\s*(?:بعد|میں))(?=\s|$)"
+)
+_CLOCK = re.compile(r"(?:at\s+)?(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)?(?=\s|$)")
+_DAY_WORDS = {
+    "today": 0, "tonight": 0, "tomorrow": 1, "day after tomorrow": 2, "next week": 7,
+    "this morning": 0, "this afternoon": 0, "this evening": 0,
+    "آج": 0, "کل": 1, "پرسوں": 2, "اگلے ہفتے": 7,
+}
+_NAMED_TIMES = {
+    "noon": (12, 0), "midnight": (0, 0), "tonight": (20, 0),
+    "morning": (9, 0), "afternoon": (15, 0), "evening": (18, 0),
+}
+
+
+class ResolvedTime(NamedTuple):
+    """A resolved phrase: the user's local date, and the UTC instant if a time was given."""
+
+    due_date: date
+    reminder_time: Optional[datetime]  # Naive UTC, like stored reminder times
+
+
+def resolve_when(
+    phrase: Optional[str],
+    timezone_offset: int = 0,
+    now: Optional[datetime] = None,
+) -> Optional[ResolvedTime]:
+    """
+    Resolve a date/time phrase in the user's timezone.
+
+    Understands ISO dates and datetimes (as before), relative offsets ("in 5
+    minutes", "in 2 hours", "in 3 days", "5 منٹ بعد"), day words ("today",
+    "tomorrow", "this evening", "next week", "آج", "کل"), weekdays ("Friday",
+    "by Friday", "next Monday") and clock or named times ("5pm", "17:30",
+    "at 9:15 am", "noon", "evening"). A day word or weekday combines with a
+    time in either order ("tomorrow at 5pm", "at 5 pm tomorrow"); a day or
+    week offset takes a time after it ("in 2 days at 5pm"). A time alone
+    that has already passed today means tomorrow; with an explicit day it is
+    kept as said, so it may be in the past.
+
+    Args:
+        phrase: The phrase as the user said it
+        timezone_offset: User's UTC offset in minutes (e.g., 300 for UTC+5)
+        now: Current time (UTC), for tests
+
+    Returns:
+        ResolvedTime, or None if the phrase isn't understood
+    """
+    if not phrase or not phrase.strip():
+        return None
+    offset = timedelta(minutes=timezone_offset)
+    now = now or utc_now()
+    local_now = now + offset
+
+    # ISO formats keep their previous meaning (naive datetimes are UTC)
+    iso_date = parse_date(phrase.strip())
+    if iso_date is not None:
+        return ResolvedTime(iso_date, None)
+    iso_datetime = parse_datetime(phrase.strip()) if re.match(r"\d{4}-\d{2}-\d{2}[T ]", phrase.strip()) else None
+    if iso_datetime is not None:
+        instant = utc_naive(iso_datetime)
+        return ResolvedTime((instant + offset).date(), instant)
+
+    text = re.sub(r"\s+", " ", phrase.strip().lower()).rstrip(".!۔")
+
+    # Split off the day part; what remains must be a clock time (or nothing)
+    day = None
+    default_clock = None
+    rest = text
+    relative = _RELATIVE.match(text)
+    if relative:
+        amount, unit = (relative[1], relative[2]) if relative[1] else (relative[3], relative[4])
+        count = int(amount) if amount.isdigit() else 1
+        seconds = UNIT_SECONDS.get(unit) or UNIT_SECONDS[unit.rstrip("s")]
+        target = now + timedelta(seconds=count * seconds)
+        rest = text[relative.end():].strip()
+        if seconds in INSTANT_UNITS:
+            if rest:
+                return None
+            return ResolvedTime((target + offset).date(), target.replace(microsecond=0))
+        if not rest:
+            return ResolvedTime((target + offset).date(), None)
+        day = (target + offset).date()  # "in 2 days at 5pm"
+    if day is None:
+        for word in sorted(_DAY_WORDS, key=len, reverse=True):
+            found = re.search(rf"(?:^|\s){word}(?:\s|$)", rest)
+            if found:
+                day = local_now.date() + timedelta(days=_DAY_WORDS[word])
+                # "tonight" and "this evening" imply a time of day
+                default_clock = _NAMED_TIMES.get(word.split()[-1])
+                rest = (rest[:found.start()] + " " + rest[found.end():]).strip()
+                break
+    if day is None:
+        found = re.search(rf"(?:(?:on|next|this|coming)\s+)?({'|'.join(WEEKDAYS)})", rest)
+        if found:
+            days_ahead = (WEEKDAYS.index(found[1]) - local_now.weekday()) % 7 or 7
+            day = local_now.date() + timedelta(days=days_ahead)
+            rest = (rest[:found.start()] + " " + rest[found.end():]).strip()
+    # Connectors left around the removed day part ("by friday", "at 5pm", "on")
+    rest = re.sub(r"^(?:on|at|by)(?:\s+|$)|\s+(?:on|at|by)$", "", rest).strip()
+
+    clock = None
+    if rest in _NAMED_TIMES:
+        clock = _NAMED_TIMES[rest]
+    elif rest:
+        match = _CLOCK.fullmatch(rest)
+        if not match:
+            return None
+        hour, minute = int(match[1]), int(match[2] or 0)
+        meridiem = (match[3] or "").replace(".", "")
+        if meridiem and not 1 <= hour <= 12:
+            return None  # "13pm", "0am"
+        if meridiem == "pm" and hour < 12:
+            hour += 12
+        elif meridiem == "am" and hour == 12:
+            hour = 0
+        if hour > 23 or minute > 59 or (not meridiem and not match[2]):
+            return None  # A bare number ("at 5") is ambiguous
+        clock = (hour, minute)
+
+    clock = clock or default_clock
+    if clock is None:
+        return ResolvedTime(day, None) if day else None
+
+    local_target = datetime.combine(day or local_now.date(), datetime.min.time()).replace(
+        hour=clock[0], minute=clock[1]
+    )
+    if day is None and local_target <= local_now:
+        local_target += timedelta(days=1)
+    return ResolvedTime(local_target.date(), local_target - offset)
+
+
+def resolve_task_times(
+    due_date: Optional[str],
+    reminder_time: Optional[str],
+    timezone_offset: int = 0,
+    now: Optional[datetime] = None,
+) -> Tuple[Optional[date], Optional[datetime], Optional[dict]]:
+    """Resolve due_date/reminder_time phrases, or return an error result for the agent.
+
+    A reminder that resolves to the past ("today at 2pm" at 15:30) is an
+    error too: the scheduler would fire it immediately.
+    """
+    now = now or utc_now()
+    due = reminder = None
+    if due_date:
+        resolved = resolve_when(due_date, timezone_offset, now=now)
+        if resolved is None:
+            return None, None, invalid_time_error("due_date", due_date, "a date like 'tomorrow' or 'next Friday'")
+        due = resolved.due_date
+    if reminder_time:
+        resolved = resolve_when(reminder_time, timezone_offset, now=now)
+        if resolved is None or resolved.reminder_time is None:
+            return None, None, invalid_time_error(
+                "reminder_time", reminder_time, "a time like 'in 10 minutes' or 'tomorrow at 5pm'"
+            )
+        if resolved.reminder_time < now:
+            return None, None, invalid_time_error(
+                "reminder_time", reminder_time, "a time in the future", problem="is in the past"
+            )
+        reminder = resolved.reminder_time
+    return due, reminder, None
+
+
+def invalid_time_error(field: str, value: str, example: str, problem: Optional[str] = None) -> dict:
+    reason = f"{field} '{value}' {problem}" if problem else f"Could not understand {field} '{value}'"
+    return {
+        "success": False,
+        "error": {
+            "code": "INVALID_DATE",
+            "message": f"{reason} - use {example}, or ask the user"
+        }
+    }
+
+
 def add_task(
     session: Session,
     user_id: str,
@@ -52,6 +246,8 @@ def add_task(
     priority: Literal["low", "medium", "high"] = "medium",
     due_date: Optional[str] = None,
     reminder_time: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+    timezone_offset: int = 0,
 ) -> dict:
     """
     Create a new task for the user.
@@ -60,20 +256,66 @@ def add_task(
         title: The task title (required)
         description: Optional task description
         priority: Task priority - "low", "medium", or "high" (default: "medium")
-        due_date: Due date in YYYY-MM-DD format (optional)
-        reminder_time: Reminder time in ISO format (e.g., "2026-01-25T17:00:00") (optional)
+        due_date: Due date as YYYY-MM-DD or a phrase ("tomorrow", "next Friday") (optional)
+        reminder_time: Reminder as ISO UTC or a phrase ("in 10 minutes", "tomorrow at 5pm") (optional)
+        idempotency_key: Dedupe key, e.g. the tool call id (optional). A repeated
+            call with the same key returns the first result without creating a task.
+        timezone_offset: User's UTC offset in minutes, for resolving phrases
 
     Returns:
         Dictionary with success status and created task details
     """
+    if idempotency_key:
+        arguments = {
+            "title": title, "description": description, "priority": priority,
+            "due_date": due_date, "reminder_time": reminder_time,
+        }
+        claim = idempotency_store.claim(user_id, idempotency_key, request_hash(arguments))
+        if claim.mismatch:
+            return {
+                "success": False,
+                "error": {
+                    "code": "IDEMPOTENCY_MISMATCH",
+                    "message": "This idempotency key was already used for a different task"
+                }
+            }
+        if claim.response is not None:
+            return json.loads(claim.response)
+        if claim.in_progress:
+            return {
+                "success": False,
+                "error": {
+                    "code": "IN_PROGRESS",
+                    "message": "This task is already being created"
+                }
+            }
+        try:
+            result = add_task(
+                session, user_id, title,
+                description=description,
+                priority=priority,
+                due_date=due_date,
+                reminder_time=reminder_time,
+                timezone_offset=timezone_offset,
+            )
+        except Exception:
+            idempotency_store.release(user_id, idempotency_key)
+            raise
+        idempotency_store.complete(user_id, idempotency_key, json.dumps(result))
+        return result
+
+    due, reminder, error = resolve_task_times(due_date, reminder_time, timezone_offset)
+    if error:
+        return error
+
     service = TaskService(session, user_id=user_id)
 
     task_data = TaskCreate(
         title=title,
         description=description,
         priority=TaskPriority(priority),
-        due_date=parse_date(due_date),
-        reminder_time=parse_datetime(reminder_time),
+        due_date=due,
+        reminder_time=reminder,
     )
 
     task = service.create(task_data)
@@ -81,7 +323,7 @@ def add_task(
     return {
         "success": True,
         "task": task_to_dict(task),
-        "message": f"Created task '{task.title}'" + (f" with reminder at {reminder_time}" if reminder_time else "")
+        "message": f"Created task '{task.title}'" + (f" with reminder at {reminder.isoformat()}Z" if reminder else "")
     }
 
 
@@ -191,7 +433,7 @@ def delete_task(
             }
         }
 
-    title = task.title
+    deleted_task = task_to_dict(task)
     deleted = service.delete(task_id)
 
     if not deleted:
@@ -205,7 +447,8 @@ def delete_task(
 
     return {
         "success": True,
-        "message": f"Deleted task '{title}'"
+        "task": deleted_task,
+        "message": f"Deleted task '{deleted_task['title']}'"
     }
 
 
@@ -219,6 +462,7 @@ def update_task(
     due_date: Optional[str] = None,
     reminder_time: Optional[str] = None,
     status: Optional[Literal["pending", "completed"]] = None,
+    timezone_offset: int = 0,
 ) -> dict:
     """
     Update task details. Only provided fields are updated.
@@ -228,13 +472,18 @@ def update_task(
         title: New task title (optional)
         description: New task description (optional)
         priority: New priority - "low", "medium", or "high" (optional)
-        due_date: New due date in YYYY-MM-DD format (optional)
-        reminder_time: New reminder time in ISO format (optional)
+        due_date: New due date as YYYY-MM-DD or a phrase ("tomorrow") (optional)
+        reminder_time: New reminder as ISO UTC or a phrase ("in 2 hours") (optional)
         status: New status - "pending" or "completed" (optional)
+        timezone_offset: User's UTC offset in minutes, for resolving phrases
 
     Returns:
         Dictionary with success status and updated task details
     """
+    due, reminder, error = resolve_task_times(due_date, reminder_time, timezone_offset)
+    if error:
+        return error
+
     service = TaskService(session, user_id=user_id)
 
     # Build update data only with provided fields
@@ -251,10 +500,10 @@ def update_task(
         update_data["priority"] = TaskPriority(priority)
         changes.append("priority")
     if due_date is not None:
-        update_data["due_date"] = parse_date(due_date)
+        update_data["due_date"] = due
         changes.append("due_date")
     if reminder_time is not None:
-        update_data["reminder_time"] = parse_datetime(reminder_time)
+        update_data["reminder_time"] = reminder
         changes.append("reminder_time")
     if status is not None:
         update_data["status"] = TaskStatus(status)
@@ -314,11 +563,11 @@ TOOL_DEFINITIONS = [
                     },
                     "due_date": {
                         "type": "string",
-                        "description": "Due date in YYYY-MM-DD format"
+                        "description": "Due date as YYYY-MM-DD or a phrase like 'tomorrow' or 'next Friday'"
                     },
                     "reminder_time": {
                         "type": "string",
-                        "description": "When to trigger reminder alarm in ISO datetime format (e.g., '2026-01-25T17:00:00'). Use this when user says 'remind me at 5 PM' or 'set an alarm for 3 PM'"
+                        "description": "When to trigger reminder alarm: ISO UTC datetime or a phrase like 'in 10 minutes' or 'tomorrow at 5pm'. Use this when user says 'remind me at 5 PM' or 'set an alarm for 3 PM'"
                     }
                 },
                 "required": ["title"]
@@ -416,11 +665,11 @@ TOOL_DEFINITIONS = [
                     },
                     "due_date": {
                         "type": "string",
-                        "description": "New due date in YYYY-MM-DD format"
+                        "description": "New due date as YYYY-MM-DD or a phrase like 'tomorrow'"
                     },
                     "reminder_time": {
                         "type": "string",
-                        "description": "New reminder time in ISO format (e.g., '2026-01-25T17:00:00')"
+                        "description": "New reminder time: ISO UTC datetime or a phrase like 'in 2 hours'"
                     }
                 },
                 "required": ["task_id"]
@@ -1,77 +1,129 @@
 """Chat API endpoint for AI assistant."""
 
-import json
-from typing import List
+import uuid
+from datetime import datetime
+from typing import List, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response
 from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import insert, update
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 
 from src.database import get_session
 from src.auth import verify_user_token, security
+from src.api.responses import fast_response
+from src.config import CHAT_HISTORY_LIMIT
 from src.models.conversation import (
     Conversation,
     Message,
     ChatRequest,
     ChatResponse,
 )
-from src.agent.chat import process_chat_message
+from src.metrics import LLM_TIME
+from src.services.command_router import fast_path
+from src.services.history_cache import history_cache
+from src.services.rate_limit import (
+    ChatOverloaded,
+    chat_gate,
+    chat_rate_limiter,
+    retry_after_header,
+)
 
 router = APIRouter(prefix="/api/{user_id}", tags=["chat"])
 
 
 def get_conversation_history(
     session: Session,
-    conversation_id: str,
-    limit: int = 20
+    conversation: Conversation,
+    limit: int = CHAT_HISTORY_LIMIT
 ) -> List[dict]:
     """Get recent messages from a conversation formatted for OpenAI."""
-    statement = (
-        select(Message)
-        .where(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at.desc())
-        .limit(limit)
-    )
-    messages = list(session.exec(statement).all())
-    messages.reverse()  # Oldest first
+    conversation_id = conversation.id
+    messages = history_cache.get(conversation_id, conversation.updated_at)
+    if messages is None:
+        statement = (
+            select(Message.role, Message.content)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at.desc())
+            .limit(history_cache.limit)
+        )
+        messages = [tuple(row) for row in session.exec(statement).all()]
+        messages.reverse()  # Oldest first
+        history_cache.set(conversation_id, messages, conversation.updated_at)
 
     history = []
-    for msg in messages:
-        if msg.role == "user":
-            history.append({"role": "user", "content": msg.content})
-        elif msg.role == "assistant":
+    for role, content in messages[-limit:]:
+        if role == "user":
+            history.append({"role": "user", "content": content})
+        elif role == "assistant":
             # Only include content, not tool_calls (avoids format issues)
-            if msg.content:
-                history.append({"role": "assistant", "content": msg.content})
+            if content:
+                history.append({"role": "assistant", "content": content})
         # Skip tool messages - they cause format issues when replayed
 
     return history
 
 
-def save_message(
+def save_turn(
     session: Session,
+    user_id: str,
     conversation_id: str,
-    role: str,
-    content: str,
-    tool_calls: dict = None,
-    tool_call_id: str = None,
-) -> Message:
-    """Save a message to the database."""
-    message = Message(
-        conversation_id=conversation_id,
-        role=role,
-        content=content,
-        tool_calls=json.dumps(tool_calls) if tool_calls else None,
-        tool_call_id=tool_call_id,
-    )
-    session.add(message)
+    new_conversation: bool,
+    messages: List[Tuple[str, str, datetime]],
+) -> None:
+    """
+    Save a chat turn in one transaction.
+
+    Creates or touches the conversation and inserts the turn's (role, content,
+    created_at) messages with a single multi-row INSERT. The conversation's
+    timestamps are taken from the messages, so the whole turn is on the app's
+    clock like every other row and nothing is read back.
+    """
+    started_at, finished_at = messages[0][2], messages[-1][2]
+    if new_conversation:
+        session.execute(
+            insert(Conversation.__table__)
+            .values(id=conversation_id, user_id=user_id, created_at=started_at, updated_at=finished_at)
+        )
+    else:
+        session.execute(
+            update(Conversation.__table__)
+            .where(Conversation.id == conversation_id)
+            .values(updated_at=finished_at)
+        )
+    session.execute(insert(Message.__table__).values([
+        {
+            "id": str(uuid.uuid4()),
+            "conversation_id": conversation_id,
+            "role": role,
+            "content": content,
+            "created_at": created_at,
+        }
+        for role, content, created_at in messages
+    ]))
     session.commit()
-    session.refresh(message)
-    return message
+
+    if new_conversation:
+        history_cache.set(conversation_id, [], finished_at)  # Nothing to read back on the next turn
+    for role, content, _ in messages:
+        history_cache.append(conversation_id, role, content, finished_at)
+
+
+def load_conversation(session: Session, user_id: str, conversation_id: str) -> List[dict]:
+    """Check the conversation belongs to the user and return its recent history."""
+    conversation = session.get(Conversation, conversation_id)
+    if not conversation or conversation.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found"
+        )
+    return get_conversation_history(session, conversation)
 
 
 @router.post("/chat", response_model=ChatResponse)
-def chat(
+async def chat(
     user_id: str,
     request: ChatRequest,
     session: Session = Depends(get_session),
@@ -80,57 +132,57 @@ def chat(
     """
     Send a message to the AI assistant and get a response.
 
-    The assistant can manage tasks through natural language.
+    The assistant can manage tasks through natural language. The agent run
+    is awaited on the event loop; database work runs in the threadpool, so
+    a turn only holds a worker thread while it talks to the database.
     """
     verify_user_token(user_id, credentials)
 
-    # Get or create conversation
+    # Per-user token bucket - reject before doing any work
+    allowed, retry_after = await run_in_threadpool(chat_rate_limiter.acquire, user_id)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many chat messages - please slow down",
+            headers=retry_after_header(retry_after),
+        )
+
+    # Existing conversation, or a new one created together with the turn's messages
     conversation_id = request.conversation_id
+    new_conversation = not conversation_id
 
     if conversation_id:
-        # Verify conversation exists and belongs to user
-        conversation = session.get(Conversation, conversation_id)
-        if not conversation or conversation.user_id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Conversation not found"
-            )
+        history = await run_in_threadpool(load_conversation, session, user_id, conversation_id)
     else:
-        # Create new conversation
-        conversation = Conversation(user_id=user_id)
-        session.add(conversation)
-        session.commit()
-        session.refresh(conversation)
-        conversation_id = conversation.id
-
-    # Get conversation history
-    history = get_conversation_history(session, conversation_id)
+        conversation_id = str(uuid.uuid4())
+        history = []
 
-    # Save user message
-    save_message(session, conversation_id, "user", request.message)
+    received_at = datetime.now()
 
     try:
-        # Process message with AI agent
-        result = process_chat_message(
-            session=session,
-            user_id=user_id,
-            message=request.message,
-            conversation_history=history,
-            timezone_offset=request.timezone_offset,
-        )
-
-        # Save assistant response (don't save tool_calls - causes issues on replay)
-        save_message(
-            session,
-            conversation_id,
-            "assistant",
-            result["response"],
-        )
-
-        # Update conversation timestamp
-        conversation.updated_at = conversation.created_at.__class__.now()
-        session.add(conversation)
-        session.commit()
+        # Simple commands ("complete task 57") are answered without the LLM
+        result = await fast_path.handle(user_id, request.message)
+
+        if result is None:
+            # Imported on first use so startup doesn't load the agents/openai stack
+            from src.agent.chat import process_chat_message
+
+            # Process message with AI agent (bounded number of concurrent runs)
+            async with chat_gate.slot():
+                with LLM_TIME.time("chat"), fast_path.agent_turn():
+                    result = await process_chat_message(
+                        user_id=user_id,
+                        message=request.message,
+                        conversation_history=history,
+                        timezone_offset=request.timezone_offset,
+                    )
+
+        # Save both messages and touch the conversation in one transaction
+        # (don't save tool_calls - causes issues on replay)
+        await run_in_threadpool(save_turn, session, user_id, conversation_id, new_conversation, [
+            ("user", request.message, received_at),
+            ("assistant", result["response"], datetime.now()),
+        ])
 
         return ChatResponse(
             response=result["response"],
@@ -138,6 +190,12 @@ def chat(
             tool_calls=result.get("tool_calls", []),
         )
 
+    except ChatOverloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers=retry_after_header(e.retry_after),
+        )
     except ValueError as e:
         # Handle missing API key or other config errors
         raise HTTPException(
@@ -184,9 +242,10 @@ def list_conversations(
 def get_messages(
     user_id: str,
     conversation_id: str,
+    request: Request,
     session: Session = Depends(get_session),
     credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> List[dict]:
+) -> Response:
     """Get messages from a conversation."""
     verify_user_token(user_id, credentials)
 
@@ -199,23 +258,23 @@ def get_messages(
         )
 
     statement = (
-        select(Message)
+        select(Message.id, Message.role, Message.content, Message.created_at)
         .where(Message.conversation_id == conversation_id)
+        .where(Message.role.in_(("user", "assistant")))  # Don't expose tool messages
         .order_by(Message.created_at)
         .limit(100)
     )
-    messages = list(session.exec(statement).all())
+    rows = session.exec(statement).all()
 
-    return [
+    return fast_response(request, [
         {
-            "id": m.id,
-            "role": m.role,
-            "content": m.content,
-            "created_at": m.created_at.isoformat(),
+            "id": message_id,
+            "role": role,
+            "content": content,
+            "created_at": created_at.isoformat(),
         }
-        for m in messages
-        if m.role in ("user", "assistant")  # Don't expose tool messages
-    ]
+        for message_id, role, content, created_at in rows
+    ])
 
 
 @router.delete("/conversations/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -244,3 +303,4 @@ def delete_conversation(
     # Delete conversation
     session.delete(conversation)
     session.commit()
+    history_cache.invalidate(conversation_id)
@@ -0,0 +1,54 @@
+"""Reminder push endpoint (Server-Sent Events)."""
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.auth import verify_user_token, security
+from src.services.reminder_scheduler import reminder_scheduler, unacknowledged_reminders
+
+router = APIRouter(prefix="/api/{user_id}", tags=["reminders"])
+
+# Seconds between keep-alive comments so proxies don't close idle streams
+HEARTBEAT_SECONDS = 25
+
+
+@router.get("/reminders/stream")
+async def stream_reminders(
+    user_id: str,
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> StreamingResponse:
+    """
+    Stream reminder events for the user as they fire.
+
+    Each event is sent as `event: reminder` with the task JSON as data.
+    Due reminders the client has not acknowledged yet (PATCH .../reminded)
+    are replayed first, so alarms that fired while it was offline still arrive.
+    """
+    verify_user_token(user_id, credentials)
+    queue = reminder_scheduler.subscribe(user_id)
+
+    async def event_stream():
+        try:
+            yield ": connected\n\n"
+            for event in await asyncio.to_thread(unacknowledged_reminders, user_id):
+                yield f"event: reminder\ndata: {json.dumps(event)}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"event: reminder\ndata: {json.dumps(event)}\n\n"
+        finally:
+            reminder_scheduler.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,158 @@
+"""Fast response serialization for list endpoints.
+
+Routes that opt in return these responses directly, so FastAPI skips
+response_model re-validation and the stdlib json encoder. JSON is rendered by
+orjson when installed, otherwise by pydantic-core. Clients that send
+`Accept: application/msgpack` get MessagePack when msgpack is installed.
+"""
+
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json, to_jsonable_python
+from typing_extensions import TypedDict
+
+from src.models.task import Task, TaskPriority, TaskStatus
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (or pydantic-core) instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            return orjson.dumps(content)
+        return to_json(content)
+
+
+class MsgPackResponse(Response):
+    """MessagePack response for clients that ask for it."""
+
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, default=to_jsonable_python)
+
+
+def wants_msgpack(request: Request) -> bool:
+    """Whether the client accepts MessagePack and it is available."""
+    if msgpack is None:
+        return False
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def fast_response(request: Request, content: Any, status_code: int = 200) -> Response:
+    """Serialize already-plain content (dicts/lists) with the fastest available encoder."""
+    if wants_msgpack(request):
+        return MsgPackResponse(content, status_code=status_code)
+    return FastJSONResponse(content, status_code=status_code)
+
+
+class TaskRow(TypedDict):
+    """Serialized task, same shape as the Task response model."""
+    title: str
+    description: Optional[str]
+    priority: TaskPriority
+    due_date: Optional[date]
+    reminder_time: Optional[datetime]
+    id: int
+    user_id: Optional[str]
+    status: TaskStatus
+    is_reminded: bool
+    reminder_sent_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+
+
+# Columns selected for task list responses, in response field order
+TASK_COLUMNS = (
+    Task.title,
+    Task.description,
+    Task.priority,
+    Task.due_date,
+    Task.reminder_time,
+    Task.id,
+    Task.user_id,
+    Task.status,
+    Task.is_reminded,
+    Task.reminder_sent_at,
+    Task.created_at,
+    Task.updated_at,
+)
+TASK_FIELDS = tuple(column.key for column in TASK_COLUMNS)
+
+# Built once: pydantic-core serializers for tasks (no validation on dump)
+task_rows_adapter = TypeAdapter(List[TaskRow])
+task_row_adapter = TypeAdapter(TaskRow)
+
+
+def task_rows_to_dicts(rows: Sequence[Sequence[Any]]) -> List[dict]:
+    """Zip row tuples selected with TASK_COLUMNS into task dicts."""
+    fields = TASK_FIELDS
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def task_list_response(request: Request, rows: Sequence[Sequence[Any]]) -> Response:
+    """Serialize task row tuples straight to the response body."""
+    tasks = task_rows_to_dicts(rows)
+    if wants_msgpack(request):
+        return MsgPackResponse(task_rows_adapter.dump_python(tasks, mode="json"))
+    return Response(task_rows_adapter.dump_json(tasks), media_type="application/json")
+
+
+def task_response(request: Request, row: Sequence[Any]) -> Response:
+    """Serialize a single task row tuple straight to the response body."""
+    task = dict(zip(TASK_FIELDS, row))
+    if wants_msgpack(request):
+        return MsgPackResponse(task_row_adapter.dump_python(task, mode="json"))
+    return Response(task_row_adapter.dump_json(task), media_type="application/json")
+
+
+def task_json(task: Task) -> bytes:
+    """Serialize a Task object to the same JSON body as the task responses."""
+    return task_row_adapter.dump_json({field: getattr(task, field) for field in TASK_FIELDS})
+
+
+# Media types of the task export formats
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def task_export_stream(batches: Iterable[Sequence[Sequence[Any]]], export_format: str) -> Iterator[bytes]:
+    """Encode batches of task row tuples as NDJSON lines or CSV rows, one chunk per batch."""
+    if export_format == "csv":
+        # Header first, so the first byte goes out before the query runs
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(TASK_FIELDS)
+        yield buffer.getvalue().encode()
+        for rows in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            tasks = task_rows_adapter.dump_python(task_rows_to_dicts(rows), mode="json")
+            writer.writerows([task[field] for field in TASK_FIELDS] for task in tasks)
+            yield buffer.getvalue().encode()
+        return
+
+    for rows in batches:
+        yield b"".join(
+            task_row_adapter.dump_json(task) + b"\n" for task in task_rows_to_dicts(rows)
+        )
@@ -1,15 +1,31 @@
 """Task API endpoints with user_id in URL."""
 
+from datetime import date, timedelta
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlmodel import Session
 
-from src.database import get_session
+from src.database import get_engine, get_session
 from src.auth import verify_user_token, security
-from src.models.task import Task, TaskStatus, TaskCreate, TaskUpdate
+from src.api.responses import (
+    EXPORT_MEDIA_TYPES,
+    TASK_COLUMNS,
+    task_export_stream,
+    task_json,
+    task_list_response,
+    task_response,
+)
+from src.models.task import (
+    Task, TaskStatus, TaskPriority, TaskCreate, TaskUpdate, TaskStats, TaskFilter,
+    TaskImportSummary,
+)
 from src.services.task_service import TaskService
+from src.services.reminder_scheduler import utc_now
+from src.services.idempotency import idempotency_store, request_hash
+from src.services.task_import import import_tasks as import_task_stream
 
 router = APIRouter(prefix="/api/{user_id}", tags=["tasks"])
 
@@ -29,45 +45,166 @@ def get_task_service(
 def create_task(
     user_id: str,
     task_data: TaskCreate,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
     session: Session = Depends(get_session),
     credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> Task:
-    """Create a new task."""
+) -> Response:
+    """Create a new task.
+
+    With an Idempotency-Key header, a retried request returns the original
+    response instead of creating a duplicate task. Reusing a key with a
+    different body is rejected with 422.
+    """
     verify_user_token(user_id, credentials)
     service = TaskService(session, user_id=user_id)
-    return service.create(task_data)
+
+    if idempotency_key:
+        claim = idempotency_store.claim(
+            user_id, idempotency_key, request_hash(task_data.model_dump(mode="json"))
+        )
+        if claim.mismatch:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="This Idempotency-Key was already used with a different request body"
+            )
+        if claim.response is not None:
+            return Response(
+                claim.response,
+                status_code=status.HTTP_201_CREATED,
+                media_type="application/json",
+                headers={"Idempotent-Replayed": "true"},
+            )
+        if claim.in_progress:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress"
+            )
+
+    try:
+        body = task_json(service.create(task_data))
+    except Exception:
+        if idempotency_key:
+            idempotency_store.release(user_id, idempotency_key)
+        raise
+    if idempotency_key:
+        idempotency_store.complete(user_id, idempotency_key, body.decode())
+    return Response(body, status_code=status.HTTP_201_CREATED, media_type="application/json")
 
 
 @router.get("/tasks", response_model=List[Task])
 def list_tasks(
     user_id: str,
+    request: Request,
+    status_filter: Optional[TaskStatus] = None,
+    q: Optional[str] = Query(default=None, max_length=200),
+    priority: Optional[TaskPriority] = None,
+    due_before: Optional[date] = None,
+    due_after: Optional[date] = None,
+    has_reminder: Optional[bool] = None,
+    session: Session = Depends(get_session),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> Response:
+    """List tasks with optional status, priority, due date, reminder and text search filters."""
+    verify_user_token(user_id, credentials)
+    service = TaskService(session, user_id=user_id)
+    filters = TaskFilter(
+        status=status_filter,
+        priority=priority,
+        q=q,
+        due_before=due_before,
+        due_after=due_after,
+        has_reminder=has_reminder,
+    )
+    # Serialized straight from row tuples; the response model is documentation only
+    rows = service.get_all_rows(TASK_COLUMNS, filters)
+    return task_list_response(request, rows)
+
+
+@router.get("/tasks/stats", response_model=TaskStats)
+def get_task_stats(
+    user_id: str,
+    timezone_offset: int = 0,
+    session: Session = Depends(get_session),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> TaskStats:
+    """Get task counts for the dashboard (computed in SQL, no task rows are sent).
+
+    timezone_offset is the user's UTC offset in minutes and decides what "today" is.
+    """
+    verify_user_token(user_id, credentials)
+    service = TaskService(session, user_id=user_id)
+    now = utc_now()
+    today = (now + timedelta(minutes=timezone_offset)).date()
+    return service.get_stats(today=today, now=now)
+
+
+@router.get("/tasks/export")
+def export_tasks(
+    user_id: str,
+    export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
     status_filter: Optional[TaskStatus] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> StreamingResponse:
+    """Stream all of the user's tasks as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and sent batch by batch, so
+    memory stays flat however many tasks the account has.
+    """
+    verify_user_token(user_id, credentials)
+    filters = TaskFilter(status=status_filter)
+
+    def batches():
+        # Own session: the request-scoped one is closed before the body is streamed
+        with Session(get_engine()) as session:
+            yield from TaskService(session, user_id=user_id).iter_row_batches(TASK_COLUMNS, filters)
+
+    return StreamingResponse(
+        task_export_stream(batches(), export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format}"'},
+    )
+
+
+@router.post("/tasks/import", response_model=TaskImportSummary)
+async def import_tasks(
+    user_id: str,
+    request: Request,
+    import_format: Optional[str] = Query(default=None, alias="format", pattern="^(ndjson|csv)$"),
     session: Session = Depends(get_session),
     credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> List[Task]:
-    """List all tasks with optional status filter."""
+) -> TaskImportSummary:
+    """Bulk-create tasks from an NDJSON or CSV body.
+
+    The format comes from ?format= or the Content-Type (text/csv means CSV).
+    Valid lines are imported even when others fail; the summary lists the
+    rejected line numbers and why.
+    """
     verify_user_token(user_id, credentials)
+    if import_format is None:
+        content_type = request.headers.get("content-type", "")
+        import_format = "csv" if "csv" in content_type else "ndjson"
     service = TaskService(session, user_id=user_id)
-    return service.get_all(status=status_filter)
+    return await import_task_stream(service, request.stream(), import_format)
 
 
 @router.get("/tasks/{task_id}", response_model=Task)
 def get_task(
     user_id: str,
     task_id: int,
+    request: Request,
     session: Session = Depends(get_session),
     credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> Task:
+) -> Response:
     """Get a task by ID."""
     verify_user_token(user_id, credentials)
     service = TaskService(session, user_id=user_id)
-    task = service.get_by_id(task_id)
-    if not task:
+    row = service.get_row_by_id(TASK_COLUMNS, task_id)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with ID {task_id} not found"
         )
-    return task
+    return task_response(request, row)
 
 
 @router.put("/tasks/{task_id}", response_model=Task)
@@ -136,16 +273,10 @@ def mark_task_reminded(
     """Mark a task as reminded (alarm has been triggered)."""
     verify_user_token(user_id, credentials)
     service = TaskService(session, user_id=user_id)
-    task = service.get_by_id(task_id)
+    task = service.mark_reminded(task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with ID {task_id} not found"
         )
-
-    # Mark as reminded
-    task.is_reminded = True
-    session.add(task)
-    session.commit()
-    session.refresh(task)
     return task
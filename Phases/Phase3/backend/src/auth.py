@@ -1,7 +1,11 @@
 """Authentication utilities - JWT verification for Better Auth tokens."""
 
+import hashlib
 import os
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -13,16 +17,100 @@ if not BETTER_AUTH_SECRET:
     raise ValueError("BETTER_AUTH_SECRET environment variable is required")
 ALGORITHM = "HS256"
 
+# Verified token cache settings
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+# Upper bound on how long a verified token is trusted without re-verification
+JWT_CACHE_MAX_TTL = int(os.getenv("JWT_CACHE_MAX_TTL", "300"))
+
 # Bearer token security
 security = HTTPBearer()
 
 
+class TokenCache:
+    """
+    Bounded LRU cache of verified tokens.
+
+    Keys are SHA-256 digests of the raw token (the token itself is never stored).
+    Values are (user_id, expires_at); an entry never outlives the token's exp
+    claim, nor JWT_CACHE_MAX_TTL seconds after it was verified.
+    """
+
+    def __init__(self, max_size: int = JWT_CACHE_SIZE, max_ttl: int = JWT_CACHE_MAX_TTL):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[Optional[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Tuple[bool, Optional[str]]:
+        """Return (found, user_id) for a cached, unexpired token."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user_id, expires_at = entry
+                if time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, user_id
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, token: str, user_id: Optional[str], exp: Optional[float]) -> None:
+        """Cache a verified token until min(exp, now + max_ttl)."""
+        if self.max_size <= 0:
+            return
+        expires_at = time.time() + self.max_ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (user_id, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Cache size and hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# Global verified token cache
+token_cache = TokenCache()
+
+
 def decode_better_auth_token(token: str) -> Optional[str]:
     """Decode a Better Auth JWT token and return user_id (string UUID)."""
+    found, user_id = token_cache.get(token)
+    if found:
+        return user_id
+
     try:
         payload = jwt.decode(token, BETTER_AUTH_SECRET, algorithms=[ALGORITHM])
         # Better Auth uses 'sub' for user ID
         user_id = payload.get("sub")
+        token_cache.put(token, user_id, payload.get("exp"))
         return user_id
     except JWTError as e:
         print(f"JWT decode error: {e}")
@@ -10,6 +10,9 @@ DATABASE_URL = os.getenv(
     "postgresql://localhost/todo_app"
 )
 
+# Create missing tables at startup (local development); deployments run `python migrate.py`
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "false").lower() in ("1", "true", "yes")
+
 # OpenAI API Key (for gpt-4o-mini)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -21,3 +24,59 @@ CORS_ORIGINS = [
     "https://todo-phase3.vercel.app",
     "https://todo-app-evolution-phase3.vercel.app",  # Current production URL
 ]
+
+# Reminder scheduler settings
+# How far ahead (seconds) the scheduler loads upcoming reminders into memory
+REMINDER_LOOKAHEAD_SECONDS = int(os.getenv("REMINDER_LOOKAHEAD_SECONDS", "600"))
+# How often (seconds) the in-memory heap is refreshed from the database
+REMINDER_REFRESH_SECONDS = int(os.getenv("REMINDER_REFRESH_SECONDS", "60"))
+# Max due, unacknowledged reminders replayed when a client opens the reminder stream
+REMINDER_REPLAY_LIMIT = int(os.getenv("REMINDER_REPLAY_LIMIT", "50"))
+# "scheduler" runs the in-process timer heap (single process);
+# "worker" claims due reminders from the database so several processes can share the load
+REMINDER_MODE = os.getenv("REMINDER_MODE", "scheduler")
+# Worker mode: seconds between claim rounds and max reminders claimed per statement
+REMINDER_POLL_SECONDS = float(os.getenv("REMINDER_POLL_SECONDS", "1"))
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "100"))
+
+# Task query cache: max entries and TTL (seconds) of the in-process LRU
+TASK_CACHE_SIZE = int(os.getenv("TASK_CACHE_SIZE", "5000"))
+TASK_CACHE_TTL = float(os.getenv("TASK_CACHE_TTL", "30"))
+
+# Bulk import: rows validated and inserted per batch, and max per-line errors reported
+TASK_IMPORT_BATCH_SIZE = int(os.getenv("TASK_IMPORT_BATCH_SIZE", "5000"))
+TASK_IMPORT_MAX_ERRORS = int(os.getenv("TASK_IMPORT_MAX_ERRORS", "100"))
+
+# Idempotency keys: "database" (shared dedupe table) or "memory" (in-process, local runs)
+IDEMPOTENCY_BACKEND = os.getenv("IDEMPOTENCY_BACKEND", "database")
+# How long (seconds) a completed request can be replayed
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+# After this many seconds an unfinished request no longer blocks retries
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+
+# /chat rate limiting: per-user token bucket ("memory" or shared "database" backend)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+CHAT_RATE_PER_MINUTE = float(os.getenv("CHAT_RATE_PER_MINUTE", "10"))
+CHAT_BURST = int(os.getenv("CHAT_BURST", "5"))
+# /chat backpressure: concurrent agent runs, how many may wait, and for how long (seconds).
+# Runs are awaited, not run on worker threads, so this isn't tied to the threadpool size
+CHAT_MAX_CONCURRENT = int(os.getenv("CHAT_MAX_CONCURRENT", "64"))
+CHAT_MAX_QUEUE = int(os.getenv("CHAT_MAX_QUEUE", "32"))
+CHAT_QUEUE_TIMEOUT = float(os.getenv("CHAT_QUEUE_TIMEOUT", "30"))
+# /chat history: messages replayed to the agent per turn, and the per-conversation
+# LRU (conversations kept, TTL in seconds) that saves re-reading them every turn
+CHAT_HISTORY_LIMIT = int(os.getenv("CHAT_HISTORY_LIMIT", "20"))
+CHAT_HISTORY_CACHE_SIZE = int(os.getenv("CHAT_HISTORY_CACHE_SIZE", "1000"))
+CHAT_HISTORY_CACHE_TTL = float(os.getenv("CHAT_HISTORY_CACHE_TTL", "300"))
+
+# ChatKit thread store: "database" (shared by all workers) or "memory" (single process)
+CHATKIT_STORE = os.getenv("CHATKIT_STORE", "database")
+# Memory store: evict least recently used threads above this many bytes (serialized size)
+CHATKIT_MEMORY_MAX_BYTES = int(os.getenv("CHATKIT_MEMORY_MAX_BYTES", str(64 * 1024 * 1024)))
+# Connection pool size of the async engine used by the database store
+CHATKIT_DB_POOL_SIZE = int(os.getenv("CHATKIT_DB_POOL_SIZE", "5"))
+
+# SQL diagnostics: log statements slower than this (ms), and statements repeated
+# this many times within one request (likely N+1)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
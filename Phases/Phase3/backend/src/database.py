@@ -3,6 +3,7 @@
 from typing import Generator
 from sqlmodel import Session, SQLModel, create_engine
 from src.config import DATABASE_URL
+from src.metrics import instrument_engine
 
 engine = create_engine(
     DATABASE_URL,
@@ -10,9 +11,20 @@ engine = create_engine(
     pool_pre_ping=True,
 )
 
+# Per-request DB time for /metrics
+instrument_engine(engine)
+
 
 def create_db_and_tables() -> None:
-    """Create all database tables if they don't exist."""
+    """Create all database tables (and indexes) if they don't exist."""
+    # Register every table, index and DDL hook on the metadata
+    import src.models.task  # noqa: F401
+    import src.models.conversation  # noqa: F401
+    import src.models.idempotency  # noqa: F401
+    import src.models.chatkit  # noqa: F401
+    import src.services.task_search  # noqa: F401
+    import src.services.rate_limit  # noqa: F401
+
     SQLModel.metadata.create_all(engine)
 
 
@@ -22,6 +34,16 @@ def get_session() -> Generator[Session, None, None]:
         yield session
 
 
+def async_database_url(url: str = DATABASE_URL) -> str:
+    """The same database with an async driver (psycopg 3 / aiosqlite)."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
 def get_engine():
     """Get the database engine."""
     return engine
@@ -4,21 +4,46 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 
-from src.config import CORS_ORIGINS
+from src.auth import token_cache
+from src.config import AUTO_MIGRATE, CORS_ORIGINS, REMINDER_MODE
 from src.database import create_db_and_tables
-from src.models.task import Task  # noqa: F401 - needed for table creation
-from src.models.conversation import Conversation, Message  # noqa: F401 - needed for table creation
+from src.metrics import CONTENT_TYPE, MetricsMiddleware, registry, stats_metrics
+from src.services.reminder_scheduler import reminder_scheduler
+from src.services.reminder_worker import ReminderListener, ReminderWorker
+from src.services.command_router import fast_path
+from src.services.history_cache import history_cache
+from src.services.task_cache import task_cache
+from src.services.rate_limit import chat_gate, chat_rate_limiter
 from src.api.tasks import router as tasks_router
+from src.api.reminders import router as reminders_router
 from src.api.chat import router as chat_router
 from src.api.chatkit_endpoint import router as chatkit_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan - create tables on startup."""
-    create_db_and_tables()
-    yield
+    """Application lifespan - start reminder dispatch.
+
+    The schema is created by `python migrate.py`, not on every cold start
+    (set AUTO_MIGRATE=true to create it at startup for local development).
+    """
+    if AUTO_MIGRATE:
+        create_db_and_tables()
+    if REMINDER_MODE == "worker":
+        # Multi-process: every replica claims due reminders and relays NOTIFY events
+        listener = ReminderListener()
+        worker = ReminderWorker()
+        listener.start()
+        await worker.start()
+        yield
+        await worker.stop()
+        listener.stop()
+    else:
+        await reminder_scheduler.start()
+        yield
+        await reminder_scheduler.stop()
 
 
 app = FastAPI(
@@ -37,8 +62,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request count, latency, in-flight and DB time per route template
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(tasks_router)
+app.include_router(reminders_router)
 app.include_router(chat_router)
 app.include_router(chatkit_router)
 
@@ -50,7 +79,7 @@ def root():
         "message": "Todo API - Phase 3 (AI-Powered)",
         "docs": "/docs",
         "version": "3.0.0",
-        "features": ["tasks", "chat"]
+        "features": ["tasks", "chat", "reminders"]
     }
 
 
@@ -58,3 +87,40 @@ def root():
 def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/health/cache")
+def cache_stats():
+    """Hit-rate and staleness metrics of the in-process caches."""
+    return {
+        "tasks": task_cache.stats(),
+        "tokens": token_cache.stats(),
+        "chat_history": history_cache.stats(),
+    }
+
+
+@app.get("/health/chat")
+def chat_limits_stats():
+    """Rate-limit and backpressure counters for /chat."""
+    return {
+        "rate_limit": chat_rate_limiter.stats(),
+        "queue": chat_gate.stats(),
+        "fast_path": fast_path.stats(),
+    }
+
+
+# Existing cache/limiter counters, read at scrape time
+registry.register_collector(lambda: (
+    stats_metrics("task_cache", "Task cache", task_cache.stats())
+    + stats_metrics("token_cache", "JWT cache", token_cache.stats())
+    + stats_metrics("chat_history_cache", "Chat history cache", history_cache.stats())
+    + stats_metrics("chat_rate_limit", "Chat rate limiter", chat_rate_limiter.stats())
+    + stats_metrics("chat_queue", "Chat run queue", chat_gate.stats())
+    + stats_metrics("chat_fast_path", "Chat fast-path router", fast_path.stats())
+))
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text-format metrics."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
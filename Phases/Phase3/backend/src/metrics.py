@@ -0,0 +1,395 @@
+"""Prometheus-style metrics: request counts, latency histograms, DB and LLM time.
+
+A small in-process registry rendered in the Prometheus text format on
+/metrics. Requests are measured by a pure ASGI middleware labelled with the
+route template (e.g. /api/{user_id}/tasks) so label cardinality stays bounded.
+SQLAlchemy engine events count statements per request, log slow statements
+and flag statements repeated within one request (N+1 patterns).
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import N_PLUS_ONE_THRESHOLD, SLOW_QUERY_MS
+
+# Prometheus text exposition content type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class: a named metric with fixed label names."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in items
+        ]
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in items
+        ]
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram of observed values."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(labels, (list(e[0]), e[1], e[2])) for labels, e in self._values.items()]
+        lines = self.header()
+        bounds = self.buckets + (float("inf"),)
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics plus callbacks that report externally-kept counters."""
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], List[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], List[Metric]]) -> None:
+        """Add a callback that builds metrics at scrape time (e.g. from cache stats)."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def stats_metrics(prefix: str, source: str, stats: dict) -> List[Metric]:
+    """Expose the numeric fields of a stats() dict as gauges named prefix_field."""
+    metrics: List[Metric] = []
+    for field, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        gauge = Gauge(f"{prefix}_{field}", f"{source} {field.replace('_', ' ')}.")
+        gauge.set(value)
+        metrics.append(gauge)
+    return metrics
+
+
+# Global metrics registry
+registry = Registry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status.",
+    ("method", "route", "status"),
+))
+HTTP_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route"),
+))
+HTTP_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.",
+))
+DB_TIME = registry.register(Histogram(
+    "http_request_db_seconds", "Time spent in database statements per request.",
+    ("method", "route"),
+))
+DB_QUERIES = registry.register(Histogram(
+    "http_request_db_queries", "Database statements issued per request.",
+    ("method", "route"), buckets=QUERY_BUCKETS,
+))
+SLOW_QUERIES = registry.register(Counter(
+    "db_slow_queries_total", f"Statements slower than {SLOW_QUERY_MS:g} ms.",
+))
+LLM_TIME = registry.register(Histogram(
+    "llm_turn_duration_seconds", "Agent/LLM time per chat turn.",
+    ("endpoint",), buckets=LLM_BUCKETS,
+))
+LLM_FIRST_TOKEN = registry.register(Histogram(
+    "llm_first_token_seconds", "Time from agent start to the first streamed text token.",
+    ("endpoint",), buckets=LLM_BUCKETS,
+))
+LLM_INPUT_TOKENS = registry.register(Counter(
+    "llm_input_tokens_total", "Prompt tokens sent to the model, split by provider prompt-cache hits.",
+    ("endpoint", "cache"),
+))
+
+
+class RequestStats:
+    """Per-request accumulator shared with threadpool workers through a ContextVar."""
+
+    __slots__ = ("label", "db_seconds", "queries", "statements")
+
+    def __init__(self, label: str = ""):
+        self.label = label  # "METHOD path", for log lines
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.statements: Dict[str, int] = {}
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def parameters_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters by name and type only (values are never logged)."""
+    if executemany:
+        if not parameters:
+            return "[]"
+        return f"{len(parameters)} x {parameters_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _one_line(statement: str, limit: int = 500) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements and accumulate their time into the current request's stats."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = current_request.get()
+        where = stats.label if stats is not None else "background"
+
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            SLOW_QUERIES.inc()
+            print(
+                f"[SQL] Slow query {elapsed * 1000:.1f} ms ({where}): {_one_line(statement)} "
+                f"params={parameters_shape(parameters, executemany)}",
+                flush=True,
+            )
+
+        if stats is None:
+            return
+        stats.db_seconds += elapsed
+        stats.queries += 1
+        repeats = stats.statements.get(statement, 0) + 1
+        stats.statements[statement] = repeats
+        if repeats == N_PLUS_ONE_THRESHOLD:
+            print(
+                f"[SQL] Possible N+1 ({where}): statement repeated {repeats}x: {_one_line(statement)}",
+                flush=True,
+            )
+
+
+class QueryCounter:
+    """Statements seen by count_queries()."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[QueryCounter]:
+    """Record every statement the engine executes inside the block (any thread)."""
+    counter = QueryCounter()
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+@contextmanager
+def query_budget(engine: Engine, max_queries: int, label: str = "block") -> Iterator[QueryCounter]:
+    """Raise AssertionError if the block issues more than max_queries statements.
+
+    Example:
+        with query_budget(engine, 1, "GET /tasks"):
+            client.get(f"/api/{user_id}/tasks", headers=headers)
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > max_queries:
+        statements = "\n".join(
+            f"  {i}. {_one_line(statement, 200)}" for i, statement in enumerate(counter.statements, 1)
+        )
+        raise AssertionError(
+            f"{label} issued {counter.count} queries (budget {max_queries}):\n{statements}"
+        )
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request count, latency, in-flight and DB time."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = RequestStats(f"{scope['method']} {scope['path']}")
+        token = current_request.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            current_request.reset(token)
+
+            # Route template (set by the router once matched) keeps cardinality bounded
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, route, str(status_code))
+            HTTP_LATENCY.observe(elapsed, method, route)
+            DB_TIME.observe(stats.db_seconds, method, route)
+            DB_QUERIES.observe(stats.queries, method, route)
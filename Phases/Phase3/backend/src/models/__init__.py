@@ -1,6 +1,10 @@
 """Data models."""
-from src.models.task import Task, TaskStatus, TaskPriority, TaskCreate, TaskUpdate
+from src.models.task import (
+    Task, TaskStatus, TaskPriority, TaskCreate, TaskUpdate, TaskStats, TaskFilter,
+    TaskImportError, TaskImportSummary,
+)
 
 __all__ = [
-    "Task", "TaskStatus", "TaskPriority", "TaskCreate", "TaskUpdate",
+    "Task", "TaskStatus", "TaskPriority", "TaskCreate", "TaskUpdate", "TaskStats", "TaskFilter",
+    "TaskImportError", "TaskImportSummary",
 ]
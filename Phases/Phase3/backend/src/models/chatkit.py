@@ -0,0 +1,51 @@
+"""ChatKit persistence models (threads, thread items, attachments).
+
+ChatKit objects are stored as their JSON payload; only the columns needed
+for ownership checks and keyset pagination are broken out.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, Index, Text
+from sqlmodel import Field, SQLModel
+
+
+class ChatKitThread(SQLModel, table=True):
+    """A ChatKit thread (ThreadMetadata JSON)."""
+
+    __tablename__ = "chatkit_thread"
+    __table_args__ = (
+        # load_threads: a user's threads in creation order
+        Index("ix_chatkit_thread_user_created", "user_id", "created_at", "id"),
+    )
+
+    id: str = Field(primary_key=True, max_length=255)
+    user_id: str = Field(max_length=255)
+    created_at: datetime
+    data: str = Field(sa_column=Column(Text, nullable=False))
+
+
+class ChatKitItem(SQLModel, table=True):
+    """An item of a ChatKit thread (ThreadItem JSON)."""
+
+    __tablename__ = "chatkit_item"
+    __table_args__ = (
+        # load_thread_items: a thread's items in creation order
+        Index("ix_chatkit_item_thread_created", "thread_id", "created_at", "id"),
+    )
+
+    id: str = Field(primary_key=True, max_length=255)
+    thread_id: str = Field(max_length=255)
+    user_id: str = Field(max_length=255)
+    created_at: datetime
+    data: str = Field(sa_column=Column(Text, nullable=False))
+
+
+class ChatKitAttachment(SQLModel, table=True):
+    """A ChatKit attachment (Attachment JSON)."""
+
+    __tablename__ = "chatkit_attachment"
+
+    id: str = Field(primary_key=True, max_length=255)
+    user_id: str = Field(max_length=255, index=True)
+    data: str = Field(sa_column=Column(Text, nullable=False))
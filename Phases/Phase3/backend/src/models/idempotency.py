@@ -0,0 +1,18 @@
+"""Idempotency key model for deduplicating retried create requests."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class IdempotencyRecord(SQLModel, table=True):
+    """Stored outcome of a request made with an Idempotency-Key."""
+
+    __tablename__ = "idempotency_key"
+
+    user_id: str = Field(primary_key=True, max_length=255)
+    key: str = Field(primary_key=True, max_length=255)
+    response: Optional[str] = Field(default=None)  # JSON body; None while in progress
+    request_hash: Optional[str] = Field(default=None, max_length=64)  # SHA-256 of the request body
+    created_at: datetime = Field(index=True)  # Naive UTC, set by the store (expiry sweep)
@@ -2,9 +2,10 @@
 
 from datetime import datetime, date
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import field_validator
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 
@@ -27,16 +28,28 @@ class TaskBase(SQLModel):
     description: Optional[str] = Field(default=None, max_length=1000)
     priority: TaskPriority = Field(default=TaskPriority.MEDIUM)
     due_date: Optional[date] = Field(default=None)
-    reminder_time: Optional[datetime] = Field(default=None)  # When to trigger alarm
+    reminder_time: Optional[datetime] = Field(default=None)  # When to trigger alarm (UTC)
 
 
 class Task(TaskBase, table=True):
     """Task database model."""
 
+    __table_args__ = (
+        # Partial index over reminders that are neither sent nor acknowledged yet
+        # (reminder scheduler refresh and worker claims)
+        Index(
+            "ix_task_reminder_due",
+            "reminder_time",
+            postgresql_where=text("NOT is_reminded AND reminder_sent_at IS NULL"),
+            sqlite_where=text("NOT is_reminded AND reminder_sent_at IS NULL"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[str] = Field(default=None, index=True)  # Better Auth uses string UUIDs
     status: TaskStatus = Field(default=TaskStatus.PENDING)
-    is_reminded: bool = Field(default=False)  # Flag to prevent duplicate alarms
+    is_reminded: bool = Field(default=False)  # Set when the client acknowledges the alarm
+    reminder_sent_at: Optional[datetime] = Field(default=None)  # When the server pushed the reminder (UTC)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
@@ -74,9 +87,51 @@ class TaskUpdate(SQLModel):
     reminder_time: Optional[datetime] = None
 
 
+class TaskFilter(SQLModel):
+    """Query filters for listing tasks."""
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    q: Optional[str] = Field(default=None, max_length=200)  # Text search on title/description
+    due_before: Optional[date] = None  # Inclusive
+    due_after: Optional[date] = None  # Inclusive
+    has_reminder: Optional[bool] = None
+
+    def cache_key(self) -> tuple:
+        """Hashable representation for query caches."""
+        return tuple(self.model_dump().items())
+
+
 class TaskResponse(TaskBase):
     """Schema for task response."""
     id: int
     status: TaskStatus
     created_at: datetime
     updated_at: datetime
+
+
+class TaskStats(SQLModel):
+    """Schema for task statistics (dashboard counters)."""
+    total: int = 0
+    pending: int = 0
+    completed: int = 0
+    due_today: int = 0  # pending tasks due today
+    overdue: int = 0  # pending tasks past their due date
+    upcoming: int = 0  # pending tasks due after today
+    high_priority: int = 0  # pending tasks by priority
+    medium_priority: int = 0
+    low_priority: int = 0
+    upcoming_reminders: int = 0  # pending reminders that have not fired yet
+
+
+class TaskImportError(SQLModel):
+    """A line of an import that was rejected."""
+    line: int
+    error: str
+
+
+class TaskImportSummary(SQLModel):
+    """Result of a bulk task import."""
+    imported: int = 0
+    failed: int = 0
+    errors: List[TaskImportError] = []  # first TASK_IMPORT_MAX_ERRORS rejected lines
+    errors_truncated: bool = False
@@ -0,0 +1,227 @@
+"""Deterministic fast path for simple chat commands.
+
+Unambiguous commands ("complete task 57", "delete task 12", "list pending",
+"mark task 3 as incomplete", and their Urdu forms) are parsed locally,
+executed through the agent's task tools and answered from a template, in the
+command's language, without an LLM round trip. Anything the patterns don't
+match exactly goes to the agent as before.
+"""
+
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from src.database import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Tasks shown in a fast-path list reply before it is cut off
+LIST_REPLY_LIMIT = 50
+
+
+class Command(NamedTuple):
+    """A parsed command: the tools.py function to call and its arguments."""
+
+    tool: str
+    arguments: dict
+    language: str
+
+
+_TASK_EN = r"task\s*(?:number\s*|no\.?\s*)?#?(\d+)"
+_TASK_UR = r"(?:ٹاسک|کام)\s*(?:نمبر\s*)?#?(\d+)"
+_DO_UR = r"(?:کرو|کریں|کر\s*دو|کر\s*دیں)"
+
+STATUS_WORDS = {
+    "all": "all", "pending": "pending", "open": "pending",
+    "completed": "completed", "done": "completed", "finished": "completed",
+    "تمام": "all", "سب": "all", "زیر التوا": "pending", "باقی": "pending", "مکمل شدہ": "completed",
+}
+
+# (pattern, language, builder) - the first full match wins
+PATTERNS: List[Tuple["re.Pattern", str, Callable[["re.Match"], Tuple[str, dict]]]] = [
+    # English
+    (re.compile(rf"(?:complete|finish)\s+{_TASK_EN}"), "en",
+     lambda m: ("complete_task", {"task_id": int(m[1])})),
+    (re.compile(rf"mark\s+{_TASK_EN}\s+as\s+(?:done|complete|completed|finished)"), "en",
+     lambda m: ("complete_task", {"task_id": int(m[1])})),
+    (re.compile(rf"{_TASK_EN}\s+(?:is\s+)?(?:done|complete|completed|finished)"), "en",
+     lambda m: ("complete_task", {"task_id": int(m[1])})),
+    (re.compile(rf"mark\s+{_TASK_EN}\s+as\s+(?:incomplete|pending|not\s+done|undone)"), "en",
+     lambda m: ("update_task", {"task_id": int(m[1]), "status": "pending"})),
+    (re.compile(rf"(?:reopen|uncomplete)\s+{_TASK_EN}"), "en",
+     lambda m: ("update_task", {"task_id": int(m[1]), "status": "pending"})),
+    (re.compile(rf"(?:delete|remove)\s+{_TASK_EN}"), "en",
+     lambda m: ("delete_task", {"task_id": int(m[1])})),
+    (re.compile(r"(?:list|show)(?:\s+me)?(?:\s+my)?\s+(all|pending|open|completed|done|finished)(?:\s+tasks?)?"), "en",
+     lambda m: ("list_tasks", {"status": STATUS_WORDS[m[1]]})),
+    (re.compile(r"(?:list|show)(?:\s+me)?(?:\s+(?:my|all|all\s+my))?\s+tasks?"), "en",
+     lambda m: ("list_tasks", {"status": "all"})),
+    (re.compile(r"list"), "en",
+     lambda m: ("list_tasks", {"status": "all"})),
+    # Urdu
+    (re.compile(rf"{_TASK_UR}\s*(?:کو\s*)?مکمل\s*{_DO_UR}"), "ur",
+     lambda m: ("complete_task", {"task_id": int(m[1])})),
+    (re.compile(rf"{_TASK_UR}\s*(?:کو\s*)?(?:نامکمل\s*{_DO_UR}|دوبارہ\s*(?:کھولو|کھولیں))"), "ur",
+     lambda m: ("update_task", {"task_id": int(m[1]), "status": "pending"})),
+    (re.compile(rf"{_TASK_UR}\s*(?:کو\s*)?(?:حذف|ڈیلیٹ)\s*{_DO_UR}"), "ur",
+     lambda m: ("delete_task", {"task_id": int(m[1])})),
+    (re.compile(r"(?:میرے\s*)?(?:(تمام|سب|زیر\s*التوا|باقی|مکمل\s*شدہ)\s*)?(?:ٹاسک|ٹاسکس)\s*(?:دکھاؤ|دکھائیں|بتاؤ|بتائیں)"), "ur",
+     lambda m: ("list_tasks", {"status": STATUS_WORDS[re.sub(r"\s+", " ", m[1] or "تمام")]})),
+]
+
+REPLIES = {
+    "en": {
+        "complete_task": "Marked '{title}' as complete.",
+        "update_task": "Reopened '{title}'.",
+        "delete_task": "Deleted task '{title}'.",
+        "not_found": "I couldn't find task {task_id}.",
+        "list": "You have {count} {status}tasks:",
+        "list_empty": "You have no {status}tasks.",
+        "list_more": "...and {count} more.",
+        "status": {"all": "", "pending": "pending ", "completed": "completed "},
+    },
+    "ur": {
+        "complete_task": "'{title}' مکمل کر دیا گیا۔",
+        "update_task": "'{title}' دوبارہ کھول دیا گیا۔",
+        "delete_task": "ٹاسک '{title}' حذف کر دیا گیا۔",
+        "not_found": "ٹاسک {task_id} نہیں ملا۔",
+        "list": "آپ کے {count} {status}ٹاسک ہیں:",
+        "list_empty": "آپ کا کوئی {status}ٹاسک نہیں ہے۔",
+        "list_more": "...اور {count} مزید۔",
+        "status": {"all": "", "pending": "زیر التوا ", "completed": "مکمل شدہ "},
+    },
+}
+
+
+def normalize(message: str) -> str:
+    """Lowercase, collapse whitespace and drop polite filler and trailing punctuation."""
+    text = re.sub(r"\s+", " ", message.strip().lower())
+    text = re.sub(r"^(?:please|pls|plz)\s+|\s+(?:please|pls|plz)$", "", text)
+    text = re.sub(r"^براہ\s*کرم\s+|^(?:پلیز)\s+", "", text)
+    return text.rstrip(" .!?۔؟")
+
+
+def match_command(message: str) -> Optional[Command]:
+    """Parse an unambiguous command, or None to let the agent handle the message."""
+    text = normalize(message)
+    if len(text) > 80:
+        return None
+    for pattern, language, build in PATTERNS:
+        match = pattern.fullmatch(text)
+        if match:
+            tool, arguments = build(match)
+            return Command(tool, arguments, language)
+    return None
+
+
+def format_task_line(task: dict) -> str:
+    details = [task["priority"]]
+    if task["due_date"]:
+        details.append(f"due {task['due_date']}")
+    if task["status"] == "completed":
+        details.append("done")
+    return f"- #{task['id']} {task['title']} ({', '.join(details)})"
+
+
+def render_reply(command: Command, result: dict) -> str:
+    """Template reply for a command's tool result."""
+    replies = REPLIES[command.language]
+    if command.tool == "list_tasks":
+        status = replies["status"][command.arguments.get("status", "all")]
+        tasks = result["tasks"]
+        if not tasks:
+            return replies["list_empty"].format(status=status)
+        lines = [replies["list"].format(count=len(tasks), status=status)]
+        lines += [format_task_line(task) for task in tasks[:LIST_REPLY_LIMIT]]
+        if len(tasks) > LIST_REPLY_LIMIT:
+            lines.append(replies["list_more"].format(count=len(tasks) - LIST_REPLY_LIMIT))
+        return "\n".join(lines)
+    if not result.get("success"):
+        return replies["not_found"].format(task_id=command.arguments["task_id"])
+    return replies[command.tool].format(title=result["task"]["title"])
+
+
+def execute_command(user_id: str, command: Command) -> dict:
+    """Run the command's tool and build a /chat-style result (response + tool_calls)."""
+    # Imported here: importing the src.agent package loads the agents stack
+    from src.agent import tools
+
+    arguments = dict(command.arguments)
+    if command.tool == "list_tasks" and arguments.get("status") == "all":
+        arguments.pop("status")
+    with Session(get_engine()) as session:
+        result = getattr(tools, command.tool)(session, user_id, **arguments)
+
+    return {
+        "response": render_reply(command, result),
+        "tool_calls": [{"tool": command.tool, "arguments": command.arguments, "result": result}],
+        "language": command.language,
+    }
+
+
+class FastPathRouter:
+    """Routes matching messages around the agent and tracks hit rate and time saved."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._fast_path_seconds = 0.0
+        self._agent_turns = 0
+        self._agent_seconds = 0.0
+        self.by_tool: Dict[str, int] = {}
+
+    async def handle(self, user_id: str, message: str) -> Optional[dict]:
+        """Answer the message directly, or return None if the agent must handle it."""
+        command = match_command(message)
+        if command is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        start = time.perf_counter()
+        result = await run_in_threadpool(execute_command, user_id, command)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.hits += 1
+            self._fast_path_seconds += elapsed
+            self.by_tool[command.tool] = self.by_tool.get(command.tool, 0) + 1
+        logger.debug("Fast path %s %s in %.1f ms", command.tool, command.arguments, elapsed * 1000)
+        return result
+
+    @contextmanager
+    def agent_turn(self) -> Iterator[None]:
+        """Time an agent turn (the cost a fast-path hit avoids)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._agent_turns += 1
+                self._agent_seconds += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            avg_fast = self._fast_path_seconds / self.hits if self.hits else 0.0
+            avg_agent = self._agent_seconds / self._agent_turns if self._agent_turns else 0.0
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "avg_fast_path_seconds": avg_fast,
+                "avg_agent_turn_seconds": avg_agent,
+                # Estimate: each hit would otherwise have taken an average agent turn
+                "latency_saved_seconds": self.hits * max(avg_agent - avg_fast, 0.0),
+                "by_tool": dict(self.by_tool),
+            }
+
+
+# Global fast-path router for /chat and ChatKit
+fast_path = FastPathRouter()
@@ -0,0 +1,124 @@
+"""Per-conversation cache of recent chat messages for /chat."""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Deque, Iterable, List, Optional, Tuple
+
+from src.config import CHAT_HISTORY_CACHE_SIZE, CHAT_HISTORY_CACHE_TTL, CHAT_HISTORY_LIMIT
+
+# A stored message: (role, content)
+Entry = Tuple[str, str]
+
+
+class ConversationHistoryCache:
+    """
+    Bounded in-process LRU of the last messages of each conversation.
+
+    Filled from the database on the first turn of a conversation, then kept
+    current by appending every saved message, so later turns don't read the
+    history back. Each entry records the conversation's updated_at as of its
+    last load or append; the caller passes the current value (read anyway for
+    the ownership check), so a turn saved by another process is a miss and
+    the history is reloaded. The TTL only bounds how long idle entries stay.
+    """
+
+    def __init__(
+        self,
+        max_size: int = CHAT_HISTORY_CACHE_SIZE,
+        ttl: float = CHAT_HISTORY_CACHE_TTL,
+        limit: int = CHAT_HISTORY_LIMIT,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.limit = limit
+        # conversation_id -> (messages, conversation updated_at, loaded_at)
+        self._entries: "OrderedDict[str, Tuple[Deque[Entry], datetime, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.appends = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, conversation_id: str, updated_at: datetime) -> Optional[List[Entry]]:
+        """Return the cached messages (oldest first), or None if missing or out of date.
+
+        Args:
+            updated_at: The conversation's current updated_at from the database
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            if entry is not None:
+                messages, version, loaded_at = entry
+                if version == updated_at and now - loaded_at < self.ttl:
+                    self._entries.move_to_end(conversation_id)
+                    self.hits += 1
+                    return list(messages)
+                if version != updated_at:
+                    self.stale += 1  # Written by another process
+                del self._entries[conversation_id]
+            self.misses += 1
+            return None
+
+    def set(self, conversation_id: str, messages: Iterable[Entry], updated_at: datetime) -> None:
+        """Store the conversation's recent messages (oldest first) as of updated_at."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[conversation_id] = (
+                deque(messages, maxlen=self.limit), updated_at, time.monotonic()
+            )
+            self._entries.move_to_end(conversation_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def append(self, conversation_id: str, role: str, content: str, updated_at: datetime) -> None:
+        """Add a newly saved message and the conversation's new updated_at.
+
+        Conversations that aren't cached are left alone.
+        """
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            if entry is not None:
+                entry[0].append((role, content))
+                self._entries[conversation_id] = (entry[0], updated_at, entry[2])
+                self.appends += 1
+
+    def invalidate(self, conversation_id: str) -> None:
+        """Drop a conversation (deleted, or written outside save_turn)."""
+        with self._lock:
+            if self._entries.pop(conversation_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset metrics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.stale = 0
+            self.appends = self.invalidations = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "messages_per_conversation": self.limit,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "stale": self.stale,
+                "appends": self.appends,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+# Global conversation history cache instance
+history_cache = ConversationHistoryCache()
@@ -0,0 +1,211 @@
+"""Idempotency keys for task-creating requests.
+
+A request carrying a key first claims (user_id, key). The first claim runs
+the request and stores its response; a replay returns the stored response
+without touching the task table; a concurrent duplicate is told the
+original is still in progress. A key reused with a different request body
+is rejected instead of replaying the other request's response.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from src.config import IDEMPOTENCY_BACKEND, IDEMPOTENCY_LOCK_SECONDS, IDEMPOTENCY_TTL
+from src.database import get_engine
+from src.models.idempotency import IdempotencyRecord
+from src.services.reminder_scheduler import utc_now
+
+# Seconds between sweeps of expired keys from the database table
+SWEEP_INTERVAL_SECONDS = 300
+
+
+def request_hash(payload: Any) -> str:
+    """SHA-256 of a request body's canonical JSON (key order and whitespace ignored)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass
+class IdempotencyClaim:
+    """Outcome of claiming a key."""
+    claimed: bool = False  # Caller owns the key and must complete() or release() it
+    response: Optional[str] = None  # Stored response to replay
+    in_progress: bool = False  # Another request with the same key is still running
+    mismatch: bool = False  # The key was used with a different request body
+
+
+class IdempotencyStore(ABC):
+    """Dedupe store keyed by (user_id, key)."""
+
+    def __init__(self, ttl: int = IDEMPOTENCY_TTL, lock_seconds: int = IDEMPOTENCY_LOCK_SECONDS):
+        self.ttl = ttl
+        self.lock_seconds = lock_seconds
+
+    @abstractmethod
+    def claim(self, user_id: str, key: str, body_hash: Optional[str] = None) -> IdempotencyClaim:
+        """Claim a key, or return the stored response / in-progress / mismatch state."""
+
+    @abstractmethod
+    def complete(self, user_id: str, key: str, response: str) -> None:
+        """Store the response of a claimed key."""
+
+    @abstractmethod
+    def release(self, user_id: str, key: str) -> None:
+        """Give up a claimed key (the request failed) so it can be retried."""
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """In-process TTL store for local runs and single-process deployments."""
+
+    def __init__(self, ttl: int = IDEMPOTENCY_TTL, lock_seconds: int = IDEMPOTENCY_LOCK_SECONDS):
+        super().__init__(ttl, lock_seconds)
+        # (user_id, key) -> (response or None while in progress, claimed_at, request hash)
+        self._entries: Dict[Tuple[str, str], Tuple[Optional[str], float, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, user_id: str, key: str, body_hash: Optional[str] = None) -> IdempotencyClaim:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get((user_id, key))
+            if entry is not None:
+                response, claimed_at, stored_hash = entry
+                if stored_hash and body_hash and stored_hash != body_hash:
+                    return IdempotencyClaim(mismatch=True)
+                if response is not None:
+                    return IdempotencyClaim(response=response)
+                if now - claimed_at < self.lock_seconds:
+                    return IdempotencyClaim(in_progress=True)
+            self._entries[(user_id, key)] = (None, now, body_hash)
+            return IdempotencyClaim(claimed=True)
+
+    def complete(self, user_id: str, key: str, response: str) -> None:
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            body_hash = entry[2] if entry is not None else None
+            self._entries[(user_id, key)] = (response, time.monotonic(), body_hash)
+
+    def release(self, user_id: str, key: str) -> None:
+        with self._lock:
+            self._entries.pop((user_id, key), None)
+
+    def _expire(self, now: float) -> None:
+        """Drop expired entries. Caller must hold the lock."""
+        expired = [
+            entry_key for entry_key, (_, stored_at, _) in self._entries.items()
+            if now - stored_at >= self.ttl
+        ]
+        for entry_key in expired:
+            del self._entries[entry_key]
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """
+    Shared dedupe table; the primary key makes concurrent claims race-free.
+
+    Expired and stale keys are taken over with a conditional UPDATE on the
+    created_at that was read, so only one of several concurrent retries
+    wins. Expired rows are swept out every SWEEP_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, ttl: int = IDEMPOTENCY_TTL, lock_seconds: int = IDEMPOTENCY_LOCK_SECONDS):
+        super().__init__(ttl, lock_seconds)
+        self._next_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+
+    def claim(self, user_id: str, key: str, body_hash: Optional[str] = None) -> IdempotencyClaim:
+        self._sweep_if_due()
+        now = utc_now()
+        with Session(get_engine()) as session:
+            session.add(IdempotencyRecord(user_id=user_id, key=key, request_hash=body_hash, created_at=now))
+            try:
+                session.commit()
+                return IdempotencyClaim(claimed=True)
+            except IntegrityError:
+                session.rollback()
+
+            record = session.get(IdempotencyRecord, (user_id, key))
+            if record is None:
+                # Released between our insert and read; let the caller retry
+                return IdempotencyClaim(in_progress=True)
+
+            age = now - record.created_at
+            expired = age >= timedelta(seconds=self.ttl)
+            if not expired and record.request_hash and body_hash and record.request_hash != body_hash:
+                return IdempotencyClaim(mismatch=True)
+            stale = record.response is None and age >= timedelta(seconds=self.lock_seconds)
+            if expired or stale:
+                # Take over the key, unless a concurrent retry already did
+                result = session.execute(
+                    update(IdempotencyRecord)
+                    .where(IdempotencyRecord.user_id == user_id)
+                    .where(IdempotencyRecord.key == key)
+                    .where(IdempotencyRecord.created_at == record.created_at)
+                    .values(created_at=now, response=None, request_hash=body_hash)
+                )
+                session.commit()
+                if result.rowcount == 1:
+                    return IdempotencyClaim(claimed=True)
+                return IdempotencyClaim(in_progress=True)
+            if record.response is None:
+                return IdempotencyClaim(in_progress=True)
+            return IdempotencyClaim(response=record.response)
+
+    def complete(self, user_id: str, key: str, response: str) -> None:
+        with Session(get_engine()) as session:
+            record = session.get(IdempotencyRecord, (user_id, key))
+            if record is None:
+                record = IdempotencyRecord(user_id=user_id, key=key, created_at=utc_now())
+            record.response = response
+            session.add(record)
+            session.commit()
+
+    def release(self, user_id: str, key: str) -> None:
+        with Session(get_engine()) as session:
+            record = session.get(IdempotencyRecord, (user_id, key))
+            if record is not None and record.response is None:
+                session.delete(record)
+                session.commit()
+
+    def purge_expired(self) -> int:
+        """Delete keys older than the TTL. Returns the number of rows removed."""
+        cutoff = utc_now() - timedelta(seconds=self.ttl)
+        with Session(get_engine()) as session:
+            result = session.execute(
+                delete(IdempotencyRecord).where(IdempotencyRecord.created_at < cutoff)
+            )
+            session.commit()
+            return result.rowcount
+
+    def _sweep_if_due(self) -> None:
+        """Purge expired keys at most once per SWEEP_INTERVAL_SECONDS (per process)."""
+        now = time.monotonic()
+        with self._sweep_lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + SWEEP_INTERVAL_SECONDS
+        try:
+            self.purge_expired()
+        except Exception as e:
+            print(f"[IDEMPOTENCY] Expired key sweep failed: {e}", flush=True)
+
+
+def create_idempotency_store() -> IdempotencyStore:
+    """Build the store selected by IDEMPOTENCY_BACKEND."""
+    if IDEMPOTENCY_BACKEND == "memory":
+        return InMemoryIdempotencyStore()
+    return DatabaseIdempotencyStore()
+
+
+# Global idempotency store
+idempotency_store = create_idempotency_store()
@@ -0,0 +1,230 @@
+"""Per-user rate limiting and backpressure for agent runs.
+
+Each user has a token bucket (CHAT_RATE_PER_MINUTE refill, CHAT_BURST
+capacity); an empty bucket means 429 with Retry-After. Admitted requests then
+pass a global gate that bounds concurrent agent runs (CHAT_MAX_CONCURRENT)
+and how many may wait for a slot (CHAT_MAX_QUEUE), so one noisy user can't
+starve everyone else of agent runs.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Tuple
+
+from sqlalchemy import Column, Float, String, Table, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import SQLModel
+
+from src.config import (
+    CHAT_BURST,
+    CHAT_MAX_CONCURRENT,
+    CHAT_MAX_QUEUE,
+    CHAT_QUEUE_TIMEOUT,
+    CHAT_RATE_PER_MINUTE,
+    RATE_LIMIT_BACKEND,
+)
+from src.database import get_engine
+
+
+class RateLimiter(ABC):
+    """Token bucket limiter keyed by an arbitrary string (e.g. user id)."""
+
+    def __init__(self, rate_per_minute: float = CHAT_RATE_PER_MINUTE, burst: int = CHAT_BURST):
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.capacity = float(burst)
+        self.allowed = 0
+        self.rejected = 0
+        self._stats_lock = threading.Lock()
+
+    def acquire(self, key: str) -> Tuple[bool, float]:
+        """Take one token. Returns (allowed, seconds until a token is available)."""
+        allowed, retry_after = self._take(key)
+        with self._stats_lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.rejected += 1
+        return allowed, retry_after
+
+    @abstractmethod
+    def _take(self, key: str) -> Tuple[bool, float]:
+        """Backend-specific atomic token take."""
+
+    def _retry_after(self, tokens: float) -> float:
+        """Seconds until the bucket holds one full token again."""
+        return max(0.0, (1.0 - tokens) / self.rate) if self.rate > 0 else 60.0
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {"allowed": self.allowed, "rejected": self.rejected}
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """Per-process buckets (bounded; idle buckets are evicted first)."""
+
+    def __init__(
+        self,
+        rate_per_minute: float = CHAT_RATE_PER_MINUTE,
+        burst: int = CHAT_BURST,
+        max_keys: int = 100_000,
+    ):
+        super().__init__(rate_per_minute, burst)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _take(self, key: str) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else self._retry_after(tokens)
+
+
+# Shared buckets for the database backend (created with the other tables)
+rate_limit_buckets = Table(
+    "rate_limit_bucket",
+    SQLModel.metadata,
+    Column("key", String(255), primary_key=True),
+    Column("tokens", Float, nullable=False),
+    Column("updated_at", Float, nullable=False),  # epoch seconds
+)
+
+
+class DatabaseRateLimiter(RateLimiter):
+    """Buckets shared by every process, updated with one atomic upsert per request."""
+
+    def _take(self, key: str) -> Tuple[bool, float]:
+        engine = get_engine()
+        insert = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+        least = func.least if engine.dialect.name == "postgresql" else func.min
+        now = time.time()
+        table = rate_limit_buckets
+
+        refilled = least(
+            self.capacity,
+            table.c.tokens + (now - table.c.updated_at) * self.rate,
+        )
+        statement = insert(table).values(key=key, tokens=self.capacity - 1.0, updated_at=now)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"tokens": refilled - 1.0, "updated_at": now},
+            where=refilled >= 1.0,
+        ).returning(table.c.tokens)
+
+        with engine.begin() as conn:
+            if conn.execute(statement).first() is not None:
+                return True, 0.0
+            row = conn.execute(
+                table.select().where(table.c.key == key)
+            ).first()
+        tokens = min(self.capacity, row.tokens + (now - row.updated_at) * self.rate) if row else 0.0
+        return False, self._retry_after(tokens)
+
+
+class ChatOverloaded(Exception):
+    """Raised when the agent-run queue is full or the wait for a slot timed out."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Too many chat requests in progress")
+        self.retry_after = retry_after
+
+
+class ConcurrencyGate:
+    """
+    Bounded pool of in-flight agent runs with a bounded wait queue.
+
+    Runs are awaited on the event loop rather than holding a worker thread,
+    so the bound comes from CHAT_MAX_CONCURRENT, not the threadpool size.
+    Must only be entered from the event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = CHAT_MAX_CONCURRENT,
+        max_queue: int = CHAT_MAX_QUEUE,
+        queue_timeout: float = CHAT_QUEUE_TIMEOUT,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()  # stats() may be read from a worker thread
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a run slot for the duration of the block (raises ChatOverloaded)."""
+        with self._lock:
+            if self.queued >= self.max_queue and self.in_flight >= self.max_concurrent:
+                self.rejected_queue_full += 1
+                raise ChatOverloaded(retry_after=self.queue_timeout)
+            self.queued += 1
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            acquired = True
+        except asyncio.TimeoutError:
+            acquired = False
+        with self._lock:
+            self.queued -= 1
+            if not acquired:
+                self.rejected_timeout += 1
+            else:
+                self.in_flight += 1
+                self.admitted += 1
+        if not acquired:
+            raise ChatOverloaded(retry_after=self.queue_timeout)
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+            }
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the limiter selected by RATE_LIMIT_BACKEND."""
+    if RATE_LIMIT_BACKEND == "database":
+        return DatabaseRateLimiter()
+    return InMemoryRateLimiter()
+
+
+def retry_after_header(seconds: float) -> Dict[str, str]:
+    """Retry-After header value (whole seconds, at least 1)."""
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+
+# Global limiter and gate for /chat
+chat_rate_limiter = create_rate_limiter()
+chat_gate = ConcurrencyGate()
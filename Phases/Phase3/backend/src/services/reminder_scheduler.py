@@ -0,0 +1,311 @@
+"""Server-side reminder scheduler with push delivery to connected clients."""
+
+import asyncio
+import heapq
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from src.config import REMINDER_LOOKAHEAD_SECONDS, REMINDER_REFRESH_SECONDS, REMINDER_REPLAY_LIMIT
+from src.database import get_engine
+from src.models.task import Task, TaskStatus
+from src.services.task_cache import task_cache
+
+
+def utc_naive(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC (the format reminder_time is stored in)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def utc_now() -> datetime:
+    """Current time as naive UTC."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def reminder_event(task: Task) -> dict:
+    """Build the payload pushed to clients when a reminder fires."""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "priority": task.priority.value if task.priority else "medium",
+        "status": task.status.value if task.status else "pending",
+        "reminder_time": task.reminder_time.isoformat() if task.reminder_time else None,
+        # The client sets is_reminded (PATCH /reminded) once it has shown the alarm
+        "is_reminded": False,
+    }
+
+
+def unacknowledged_reminders(user_id: str, limit: int = REMINDER_REPLAY_LIMIT) -> List[dict]:
+    """
+    Due reminders the user's client has not acknowledged yet, oldest first.
+
+    Replayed to every new reminder stream, so a reminder that fired while no
+    client was connected (tab closed, stream on another process, restart) is
+    delivered on the next connection.
+    """
+    statement = (
+        select(Task)
+        .where(Task.user_id == user_id)
+        .where(Task.reminder_time <= utc_now())
+        .where(Task.is_reminded == False)  # noqa: E712
+        .where(Task.status == TaskStatus.PENDING)
+        .order_by(Task.reminder_time)
+        .limit(limit)
+    )
+    with Session(get_engine()) as session:
+        return [reminder_event(task) for task in session.exec(statement).all()]
+
+
+class ReminderScheduler:
+    """
+    In-process timer heap for task reminders.
+
+    Upcoming reminders (within the lookahead window) are loaded from the
+    indexed reminder_time column and kept in a min-heap. A single asyncio
+    task sleeps until the earliest entry is due, atomically records
+    reminder_sent_at in the database and pushes the event to every
+    subscriber of the task's owner. is_reminded is left to the client's
+    acknowledgement; unacknowledged reminders are replayed on reconnect.
+    """
+
+    def __init__(
+        self,
+        lookahead_seconds: int = REMINDER_LOOKAHEAD_SECONDS,
+        refresh_seconds: int = REMINDER_REFRESH_SECONDS,
+    ):
+        self.lookahead = timedelta(seconds=lookahead_seconds)
+        self.refresh_seconds = refresh_seconds
+        self._heap: List[Tuple[datetime, int, str]] = []
+        # task_id -> (reminder_time, user_id); heap entries not matching are stale
+        self._scheduled: Dict[int, Tuple[datetime, str]] = {}
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._subscriber_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._last_refresh: Optional[datetime] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Load upcoming reminders and start the dispatch loop."""
+        if self._runner is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        try:
+            await asyncio.to_thread(self.refresh)
+        except Exception as e:
+            print(f"[REMINDER] Initial refresh failed: {e}", flush=True)
+            self._last_refresh = utc_now()
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the dispatch loop."""
+        if self._runner is None:
+            return
+        self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+        self._runner = None
+        self._loop = None
+
+    # ------------------------------------------------------------------
+    # Scheduling (thread-safe; called from sync request handlers)
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> None:
+        """Reload reminders due within the lookahead window from the database."""
+        now = utc_now()
+        horizon = now + self.lookahead
+        statement = (
+            select(Task.id, Task.user_id, Task.reminder_time)
+            .where(Task.reminder_time.is_not(None))
+            .where(Task.reminder_time <= horizon)
+            .where(Task.is_reminded == False)  # noqa: E712
+            .where(Task.reminder_sent_at.is_(None))
+            .where(Task.status == TaskStatus.PENDING)
+        )
+        with Session(get_engine()) as session:
+            rows = session.exec(statement).all()
+
+        with self._lock:
+            for task_id, user_id, reminder_time in rows:
+                self._push(task_id, user_id, utc_naive(reminder_time))
+            self._last_refresh = now
+        self._notify()
+
+    def refresh_if_running(self) -> None:
+        """Reload from the database now (after bulk writes), if the scheduler is running."""
+        if self._loop is not None:
+            self.refresh()
+
+    def schedule(self, task: Task) -> None:
+        """Schedule (or reschedule) a task's reminder after it was written."""
+        if self._loop is None or task.id is None:
+            return
+        if (
+            task.reminder_time is None
+            or task.is_reminded
+            or task.reminder_sent_at is not None
+            or task.status != TaskStatus.PENDING
+        ):
+            self.unschedule(task.id)
+            return
+
+        reminder_time = utc_naive(task.reminder_time)
+        with self._lock:
+            if reminder_time > utc_now() + self.lookahead:
+                # Picked up by a later refresh; drop any earlier entry
+                self._scheduled.pop(task.id, None)
+                return
+            self._push(task.id, task.user_id, reminder_time)
+        self._notify()
+
+    def unschedule(self, task_id: int) -> None:
+        """Cancel a pending reminder (heap entry is discarded lazily)."""
+        if self._loop is None:
+            return
+        with self._lock:
+            self._scheduled.pop(task_id, None)
+
+    def _push(self, task_id: int, user_id: str, reminder_time: datetime) -> None:
+        """Add a heap entry. Caller must hold the lock."""
+        if self._scheduled.get(task_id) == (reminder_time, user_id):
+            return
+        self._scheduled[task_id] = (reminder_time, user_id)
+        heapq.heappush(self._heap, (reminder_time, task_id, user_id))
+
+    def _notify(self) -> None:
+        """Wake the dispatch loop so it re-evaluates the earliest deadline."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _pop_due(self, now: datetime) -> Tuple[List[Tuple[int, str]], Optional[float]]:
+        """Pop all due, non-stale entries and return seconds until the next one."""
+        due = []
+        with self._lock:
+            while self._heap:
+                reminder_time, task_id, user_id = self._heap[0]
+                if self._scheduled.get(task_id) != (reminder_time, user_id):
+                    heapq.heappop(self._heap)  # stale entry
+                    continue
+                if reminder_time > now:
+                    return due, (reminder_time - now).total_seconds()
+                heapq.heappop(self._heap)
+                del self._scheduled[task_id]
+                due.append((task_id, user_id))
+        return due, None
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        """Sleep until the next reminder is due, fire it, repeat."""
+        while True:
+            now = utc_now()
+            if (now - self._last_refresh).total_seconds() >= self.refresh_seconds:
+                try:
+                    await asyncio.to_thread(self.refresh)
+                except Exception as e:
+                    print(f"[REMINDER] Refresh failed: {e}", flush=True)
+                    self._last_refresh = now
+
+            due, wait = self._pop_due(utc_now())
+            if due:
+                try:
+                    fired = await asyncio.to_thread(self.fire, [task_id for task_id, _ in due])
+                except Exception as e:
+                    print(f"[REMINDER] Dispatch failed: {e}", flush=True)
+                    fired = []
+                for event in fired:
+                    self.publish(event["user_id"], event["task"])
+                continue
+
+            timeout = self.refresh_seconds if wait is None else min(wait, self.refresh_seconds)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def fire(self, task_ids: List[int]) -> List[dict]:
+        """
+        Atomically record reminder_sent_at for due tasks and return the fired events.
+
+        The conditional UPDATE only matches rows that are still pending, not yet
+        sent or acknowledged and actually due, so a reminder fires once even if
+        the task changed after it was scheduled. Delivery is confirmed by the
+        client (is_reminded); subscribers that missed it get it on reconnect.
+        """
+        now = utc_now()
+        fired = []
+        with Session(get_engine()) as session:
+            for task_id in task_ids:
+                result = session.execute(
+                    update(Task)
+                    .where(Task.id == task_id)
+                    .where(Task.is_reminded == False)  # noqa: E712
+                    .where(Task.reminder_sent_at.is_(None))
+                    .where(Task.status == TaskStatus.PENDING)
+                    .where(Task.reminder_time <= now)
+                    .values(reminder_sent_at=now)
+                )
+                if result.rowcount != 1:
+                    continue
+                task = session.get(Task, task_id)
+                if task is not None:
+                    fired.append({"user_id": task.user_id, "task": reminder_event(task)})
+            session.commit()
+        for event in fired:
+            task_cache.invalidate(event["user_id"], event["task"]["id"])
+        return fired
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        """Register a client connection for a user's reminder events."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        self._subscriber_loop = asyncio.get_running_loop()
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        """Remove a client connection."""
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def publish(self, user_id: str, event: dict) -> None:
+        """Push an event to every connection of a user (drops if a client lags)."""
+        for queue in list(self._subscribers.get(user_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                pass
+
+    def publish_threadsafe(self, user_id: str, event: dict) -> None:
+        """Publish from a worker/listener thread onto the subscribers' event loop."""
+        if self._subscriber_loop is not None and user_id in self._subscribers:
+            self._subscriber_loop.call_soon_threadsafe(self.publish, user_id, event)
+
+
+# Global scheduler instance
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,239 @@
+"""Horizontally scalable reminder dispatch (worker mode).
+
+Every process runs a ReminderWorker that claims due reminders straight from
+the database. Claims use `FOR UPDATE SKIP LOCKED` on PostgreSQL, so N
+workers split the due rows between them and a reminder is never sent
+twice. Fired reminders are fanned out with `pg_notify` (sent on commit) and
+every process relays them to its own SSE subscribers through a
+ReminderListener (psycopg2 or psycopg 3 driver). On SQLite (local runs) the write lock serializes claims
+and events are published in-process.
+
+Run standalone with: python -m src.services.reminder_worker
+"""
+
+import asyncio
+import json
+import select as select_module
+import threading
+from typing import List, Optional
+
+from sqlalchemy import select, text, update
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from src.config import REMINDER_BATCH_SIZE, REMINDER_POLL_SECONDS
+from src.database import get_engine
+from src.models.task import Task, TaskStatus
+from src.services.reminder_scheduler import reminder_event, reminder_scheduler, utc_now
+from src.services.task_cache import task_cache
+
+# PostgreSQL NOTIFY channel used to fan reminders out to every process
+NOTIFY_CHANNEL = "task_reminders"
+
+
+def is_postgres(engine: Engine) -> bool:
+    """Whether the engine talks to PostgreSQL (LISTEN/NOTIFY, SKIP LOCKED)."""
+    return engine.dialect.name == "postgresql"
+
+
+# PostgreSQL drivers ReminderListener can read notifications from
+LISTEN_DRIVERS = ("psycopg2", "psycopg")
+
+
+def claim_due_reminders(
+    session: Session,
+    batch_size: int = REMINDER_BATCH_SIZE,
+) -> List[dict]:
+    """
+    Claim up to batch_size due reminders and mark them sent in one statement.
+
+    UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED LIMIT n) RETURNING
+    skips rows another worker is claiming; the reminder_sent_at guard on the
+    outer UPDATE keeps the claim exactly-once where SKIP LOCKED is unavailable.
+    is_reminded stays unset until the client acknowledges the alarm.
+    The caller commits.
+    """
+    now = utc_now()
+    due_ids = (
+        select(Task.id)
+        .where(Task.reminder_time <= now)
+        .where(Task.is_reminded == False)  # noqa: E712
+        .where(Task.reminder_sent_at.is_(None))
+        .where(Task.status == TaskStatus.PENDING)
+        .order_by(Task.reminder_time)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    statement = (
+        update(Task)
+        .where(Task.id.in_(due_ids))
+        .where(Task.reminder_sent_at.is_(None))
+        .values(reminder_sent_at=now)
+        .returning(
+            Task.id,
+            Task.user_id,
+            Task.title,
+            Task.description,
+            Task.priority,
+            Task.status,
+            Task.reminder_time,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = session.execute(statement).all()
+    return [{"user_id": row.user_id, "task": reminder_event(row)} for row in rows]
+
+
+class ReminderWorker:
+    """Claims due reminders in batches and fans them out."""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        batch_size: int = REMINDER_BATCH_SIZE,
+        poll_seconds: float = REMINDER_POLL_SECONDS,
+    ):
+        self.engine = engine or get_engine()
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._runner: Optional[asyncio.Task] = None
+
+    def dispatch_once(self) -> List[dict]:
+        """Claim one batch, queue the fan-out and commit. Returns the claimed events."""
+        with Session(self.engine) as session:
+            events = claim_due_reminders(session, self.batch_size)
+            if events and is_postgres(self.engine):
+                # NOTIFY is transactional: delivered only if the claim commits
+                for event in events:
+                    session.execute(
+                        text("SELECT pg_notify(:channel, :payload)"),
+                        {"channel": NOTIFY_CHANNEL, "payload": json.dumps(event)},
+                    )
+            session.commit()
+
+        for event in events:
+            task_cache.invalidate(event["user_id"], event["task"]["id"])
+            if not is_postgres(self.engine):
+                reminder_scheduler.publish_threadsafe(event["user_id"], event["task"])
+        return events
+
+    def dispatch_due(self) -> int:
+        """Drain every due reminder, one batch at a time. Returns the number fired."""
+        fired = 0
+        while True:
+            events = self.dispatch_once()
+            fired += len(events)
+            if len(events) < self.batch_size:
+                return fired
+
+    async def start(self) -> None:
+        """Start the claim loop on the running event loop."""
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the claim loop."""
+        if self._runner is None:
+            return
+        self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+        self._runner = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.dispatch_due)
+            except Exception as e:
+                print(f"[REMINDER] Worker dispatch failed: {e}", flush=True)
+            await asyncio.sleep(self.poll_seconds)
+
+
+class ReminderListener:
+    """Relays pg_notify reminder events to this process's SSE subscribers."""
+
+    def __init__(self, engine: Optional[Engine] = None):
+        self.engine = engine or get_engine()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start listening in a background thread (PostgreSQL only)."""
+        if self._thread is not None or not is_postgres(self.engine):
+            return
+        if self.engine.dialect.driver not in LISTEN_DRIVERS:
+            print(
+                f"[REMINDER] Listener needs psycopg2 or psycopg, not {self.engine.dialect.driver}; "
+                "reminders from other processes won't reach this one's streams",
+                flush=True,
+            )
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen, name="reminder-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the listener thread."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._listen_once()
+            except Exception as e:
+                print(f"[REMINDER] Listener error, reconnecting: {e}", flush=True)
+                self._stopped.wait(5)
+
+    def _listen_once(self) -> None:
+        # Dedicated connection, detached from the pool since it stays in autocommit
+        raw = self.engine.raw_connection()
+        raw.detach()
+        conn = raw.driver_connection
+        try:
+            conn.rollback()  # End any transaction left by the pool's pre-ping
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            if self.engine.dialect.driver == "psycopg2":
+                self._relay_psycopg2(conn)
+            else:
+                self._relay_psycopg(conn)
+        finally:
+            raw.close()
+
+    def _relay_psycopg2(self, conn) -> None:
+        """psycopg2: wait on the socket, then drain conn.notifies."""
+        while not self._stopped.is_set():
+            if select_module.select([conn], [], [], 5) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                self._relay(conn.notifies.pop(0).payload)
+
+    def _relay_psycopg(self, conn) -> None:
+        """psycopg 3: conn.notifies() yields until its timeout (psycopg >= 3.2)."""
+        while not self._stopped.is_set():
+            for notify in conn.notifies(timeout=5):
+                self._relay(notify.payload)
+
+    def _relay(self, payload: str) -> None:
+        event = json.loads(payload)
+        task_cache.invalidate(event["user_id"], event["task"]["id"])
+        reminder_scheduler.publish_threadsafe(event["user_id"], event["task"])
+
+
+if __name__ == "__main__":
+    worker = ReminderWorker()
+    print(f"[REMINDER] Worker started (batch={worker.batch_size}, poll={worker.poll_seconds}s)", flush=True)
+
+    async def main() -> None:
+        await worker.start()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
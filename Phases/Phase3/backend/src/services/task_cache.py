@@ -0,0 +1,192 @@
+"""Per-user read-through cache for task queries."""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from src.config import TASK_CACHE_SIZE, TASK_CACHE_TTL
+
+# Key namespaces: lists are invalidated by any write of the user,
+# single-task entries only by writes to that task
+LIST = "list"
+TASK = "task"
+
+
+def list_key(*parts: Hashable) -> Tuple:
+    """Cache key for a task list query (columns, filters, ...)."""
+    return (LIST,) + parts
+
+
+def task_key(task_id: int, *parts: Hashable) -> Tuple:
+    """Cache key for a single-task query."""
+    return (TASK, task_id) + parts
+
+
+class TaskCache(ABC):
+    """
+    Cache interface for task query results, keyed by (user_id, key).
+
+    Implementations must only store immutable values (row tuples) and must
+    support invalidating one user's entries. An in-process LRU is the default;
+    a shared store (e.g. Redis with one hash per user) can implement the same
+    interface for multi-process deployments.
+
+    Read-through callers take generation() before querying and pass it to
+    set(): an invalidation that lands between the query and set() bumps the
+    generation, so the rows read before the write are not stored.
+    """
+
+    @abstractmethod
+    def get(self, user_id: str, key: Tuple) -> Optional[Any]:
+        """Return the cached value or None."""
+
+    @abstractmethod
+    def generation(self, user_id: str) -> int:
+        """The user's invalidation counter (bumped by every invalidation)."""
+
+    @abstractmethod
+    def set(self, user_id: str, key: Tuple, value: Any, generation: Optional[int] = None) -> None:
+        """Store a value, unless the user was invalidated since generation was read."""
+
+    @abstractmethod
+    def invalidate(self, user_id: str, task_id: Optional[int] = None) -> None:
+        """Drop the user's list entries, plus the entries of task_id if given."""
+
+    @abstractmethod
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every entry of the user."""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Hit-rate and staleness metrics."""
+
+
+class InMemoryTaskCache(TaskCache):
+    """
+    Bounded in-process LRU with a TTL.
+
+    The TTL bounds staleness when other processes write to the same database
+    (their invalidations don't reach this process).
+    """
+
+    def __init__(self, max_size: int = TASK_CACHE_SIZE, ttl: float = TASK_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, Tuple], Tuple[Any, float]]" = OrderedDict()
+        self._user_keys: Dict[str, Set[Tuple]] = {}
+        # user_id -> invalidation counter, read before a query and checked in set()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.stale_sets = 0
+        self._served_age_total = 0.0
+        self._served_age_max = 0.0
+
+    def get(self, user_id: str, key: Tuple) -> Optional[Any]:
+        entry_key = (user_id, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                if age < self.ttl:
+                    self._entries.move_to_end(entry_key)
+                    self.hits += 1
+                    self._served_age_total += age
+                    self._served_age_max = max(self._served_age_max, age)
+                    return value
+                self._remove(entry_key)
+            self.misses += 1
+            return None
+
+    def generation(self, user_id: str) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def set(self, user_id: str, key: Tuple, value: Any, generation: Optional[int] = None) -> None:
+        if self.max_size <= 0:
+            return
+        entry_key = (user_id, key)
+        with self._lock:
+            if generation is not None and generation != self._generations.get(user_id, 0):
+                # Invalidated while the caller was querying: the value may predate the write
+                self.stale_sets += 1
+                return
+            self._entries[entry_key] = (value, time.monotonic())
+            self._entries.move_to_end(entry_key)
+            self._user_keys.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, user_id: str, task_id: Optional[int] = None) -> None:
+        with self._lock:
+            self._bump(user_id)
+            keys = self._user_keys.get(user_id)
+            if not keys:
+                return
+            for key in list(keys):
+                if key[0] == LIST or (task_id is not None and key[:2] == (TASK, task_id)):
+                    self._remove((user_id, key))
+                    self.invalidations += 1
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            self._bump(user_id)
+            for key in list(self._user_keys.get(user_id, ())):
+                self._remove((user_id, key))
+                self.invalidations += 1
+
+    def _bump(self, user_id: str) -> None:
+        """Advance the user's generation. Caller must hold the lock."""
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def _remove(self, entry_key: Tuple[str, Tuple]) -> None:
+        """Remove an entry. Caller must hold the lock."""
+        self._entries.pop(entry_key, None)
+        user_id, key = entry_key
+        keys = self._user_keys.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[user_id]
+
+    def clear(self) -> None:
+        """Drop all entries and reset metrics."""
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+            self._generations.clear()
+            self.hits = self.misses = self.invalidations = self.evictions = self.stale_sets = 0
+            self._served_age_total = self._served_age_max = 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                # Query results not stored because a write invalidated the user mid-query
+                "stale_sets": self.stale_sets,
+                # Age of entries when served: how stale a cache hit can be
+                "avg_served_age_seconds": self._served_age_total / self.hits if self.hits else 0.0,
+                "max_served_age_seconds": self._served_age_max,
+            }
+
+
+# Global task cache instance (swap for a shared-store implementation if needed)
+task_cache: TaskCache = InMemoryTaskCache()
@@ -0,0 +1,153 @@
+"""Bulk task import from NDJSON or CSV request bodies.
+
+The body is read as a stream and decoded line by line. Each record is
+validated with TaskCreate, and valid tasks are inserted in batches of
+TASK_IMPORT_BATCH_SIZE through TaskService.bulk_create. Invalid lines are
+reported back with their line number; they do not stop the import.
+
+NDJSON: one task object per line. CSV: a header row naming the columns.
+In both formats only TaskCreate fields are read (title, description,
+priority, due_date, reminder_time), so files from GET /tasks/export
+can be imported as they are.
+"""
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+
+from src.config import TASK_IMPORT_BATCH_SIZE, TASK_IMPORT_MAX_ERRORS
+from src.models.task import TaskCreate, TaskImportError, TaskImportSummary
+from src.services.task_service import TaskService
+
+IMPORT_FIELDS = frozenset(TaskCreate.model_fields)
+
+# A parsed record, or the reason the line could not be parsed
+Record = Union[dict, str]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Split a UTF-8 byte stream into (line number, line) pairs."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    line_number = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield line_number + 1, pending.rstrip("\r")
+
+
+async def ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Record]]:
+    """One JSON object per non-blank line."""
+    async for line_number, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Expected a JSON object"
+            continue
+        yield line_number, record
+
+
+async def csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Record]]:
+    """CSV with a header row; quoted fields may span lines."""
+    header = None
+    buffered = ""
+    start_line = 0
+    async for line_number, line in iter_lines(chunks):
+        if buffered:
+            buffered += "\n" + line
+        else:
+            buffered, start_line = line, line_number
+        if buffered.count('"') % 2:
+            continue  # Inside a quoted field: keep reading
+        text, buffered = buffered, ""
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            if "title" not in header:
+                yield start_line, "CSV header must include a 'title' column"
+                return
+            continue
+        if len(values) > len(header):
+            yield start_line, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells fall back to the field defaults
+        yield start_line, {name: value for name, value in zip(header, values) if value != ""}
+
+    if buffered:
+        yield start_line, "Unterminated quoted field"
+
+
+def validate_record(record: dict) -> Union[TaskCreate, str]:
+    """Validate a record with TaskCreate, or return a readable error."""
+    try:
+        return TaskCreate.model_validate(
+            {key: value for key, value in record.items() if key in IMPORT_FIELDS}
+        )
+    except ValidationError as e:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'task'}: {error['msg']}"
+            for error in e.errors()
+        )
+
+
+async def import_tasks(
+    service: TaskService,
+    chunks: AsyncIterator[bytes],
+    import_format: str,
+    batch_size: int = TASK_IMPORT_BATCH_SIZE,
+    max_errors: int = TASK_IMPORT_MAX_ERRORS,
+) -> TaskImportSummary:
+    """Validate and insert every task in the stream. Inserts run in the threadpool."""
+    summary = TaskImportSummary()
+
+    def reject(line_number: int, error: str) -> None:
+        summary.failed += 1
+        if len(summary.errors) < max_errors:
+            summary.errors.append(TaskImportError(line=line_number, error=error))
+        else:
+            summary.errors_truncated = True
+
+    batch: List[TaskCreate] = []
+    batch_lines: List[int] = []
+
+    async def flush() -> None:
+        try:
+            summary.imported += await run_in_threadpool(service.bulk_create, batch)
+        except SQLAlchemyError as e:
+            service.session.rollback()
+            for line_number in batch_lines:
+                reject(line_number, f"Not imported: database error ({e.__class__.__name__})")
+        batch.clear()
+        batch_lines.clear()
+
+    records = csv_records(chunks) if import_format == "csv" else ndjson_records(chunks)
+    async for line_number, record in records:
+        task = record if isinstance(record, str) else validate_record(record)
+        if isinstance(task, str):
+            reject(line_number, task)
+            continue
+        batch.append(task)
+        batch_lines.append(line_number)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return summary
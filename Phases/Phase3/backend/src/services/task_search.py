@@ -0,0 +1,119 @@
+"""Indexed full-text search over task titles and descriptions.
+
+PostgreSQL: a GIN index on to_tsvector('simple', title || ' ' || description)
+answers word/prefix queries, and a pg_trgm GIN index on title answers
+substring (ILIKE) queries. SQLite (local runs): an external-content FTS5
+table kept in sync with triggers.
+"""
+
+import re
+
+from sqlalchemy import DDL, Index, event, func, literal_column, or_, select, text
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.models.task import Task
+
+# Dictionary used for tsvector/tsquery ('simple' avoids language-specific stemming,
+# so Urdu and English titles are indexed the same way)
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def search_document():
+    """The indexed tsvector expression (must match the index definition exactly)."""
+    return func.to_tsvector(
+        SEARCH_CONFIG,
+        func.coalesce(Task.title, "") + " " + func.coalesce(Task.description, ""),
+    )
+
+
+def search_words(query: str) -> list:
+    """Split a user query into search words."""
+    return WORD_PATTERN.findall(query.lower())
+
+
+def postgres_condition(query: str) -> ColumnElement:
+    """Prefix match on the tsvector index, or substring match on the trigram index."""
+    words = search_words(query)
+    conditions = [Task.title.ilike(f"%{escape_like(query)}%", escape="\\")]
+    if words:
+        tsquery = " & ".join(f"{word}:*" for word in words)
+        conditions.append(
+            search_document().op("@@")(
+                func.to_tsquery(SEARCH_CONFIG, tsquery)
+            )
+        )
+    return or_(*conditions)
+
+
+def sqlite_condition(query: str) -> ColumnElement:
+    """Prefix match of every word through the FTS5 table."""
+    words = search_words(query)
+    if not words:
+        return Task.title.like(f"%{escape_like(query)}%", escape="\\")
+    match = " ".join(f'"{word}"*' for word in words)
+    matching_ids = select(text("rowid")).select_from(text("task_fts")).where(
+        text("task_fts MATCH :match").bindparams(match=match)
+    )
+    return Task.id.in_(matching_ids)
+
+
+def search_condition(dialect_name: str, query: str) -> ColumnElement:
+    """Text search condition for the given database dialect."""
+    if dialect_name == "postgresql":
+        return postgres_condition(query)
+    if dialect_name == "sqlite":
+        return sqlite_condition(query)
+    return or_(
+        Task.title.ilike(f"%{escape_like(query)}%", escape="\\"),
+        Task.description.ilike(f"%{escape_like(query)}%", escape="\\"),
+    )
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# PostgreSQL: GIN index over the search document (created by create_all)
+Index(
+    "ix_task_search",
+    search_document(),
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+# PostgreSQL: trigram GIN index on titles for substring (ILIKE) search. The
+# extension is created before the task table, so create_all can build the index.
+PG_TRGM_DDL = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+event.listen(Task.__table__, "before_create", DDL(PG_TRGM_DDL).execute_if(dialect="postgresql"))
+Index(
+    "ix_task_title_trgm",
+    Task.title,
+    postgresql_using="gin",
+    postgresql_ops={"title": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+# SQLite: FTS5 table and sync triggers, created right after the task table
+SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5(
+        title, description, content='task', content_rowid='id'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_insert AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description)
+        VALUES (new.id, new.title, coalesce(new.description, ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_delete AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, coalesce(old.description, ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_update AFTER UPDATE OF title, description ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, coalesce(old.description, ''));
+        INSERT INTO task_fts(rowid, title, description)
+        VALUES (new.id, new.title, coalesce(new.description, ''));
+    END""",
+]
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
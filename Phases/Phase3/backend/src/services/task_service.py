@@ -1,19 +1,39 @@
 """Task service for business logic."""
 
-from datetime import datetime
-from typing import Optional, List
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, Iterator, List, Optional, Sequence
 
+from sqlalchemy import func, insert, update
 from sqlmodel import Session, select
 
-from src.models.task import Task, TaskStatus, TaskCreate, TaskUpdate
+from src.models.task import (
+    Task, TaskStatus, TaskPriority, TaskCreate, TaskUpdate, TaskStats, TaskFilter,
+)
+from src.services.reminder_scheduler import reminder_scheduler, utc_naive
+from src.services.task_cache import TaskCache, list_key, task_cache, task_key
+from src.services.task_search import search_condition
 
 
 class TaskService:
     """Service layer for task operations."""
 
-    def __init__(self, session: Session, user_id: Optional[str] = None):
+    def __init__(
+        self,
+        session: Session,
+        user_id: Optional[str] = None,
+        cache: Optional[TaskCache] = None,
+    ):
         self.session = session
         self.user_id = user_id
+        # Read-through cache for row queries; only used for user-scoped services
+        self.cache = (cache or task_cache) if user_id is not None else None
+
+    def _invalidate(self, task_id: Optional[int] = None) -> None:
+        """Drop cached lists (and the task's own entries) after a write."""
+        if self.cache is not None:
+            self.cache.invalidate(self.user_id, task_id)
 
     def create(self, task_data: TaskCreate) -> Task:
         """Create a new task."""
@@ -22,24 +42,191 @@ class TaskService:
             description=task_data.description,
             priority=task_data.priority,
             due_date=task_data.due_date,
-            reminder_time=task_data.reminder_time,  # Added for alarm functionality
+            # Stored as naive UTC, the format the scheduler and workers compare against
+            reminder_time=utc_naive(task_data.reminder_time) if task_data.reminder_time else None,
             status=TaskStatus.PENDING,
             user_id=self.user_id,
         )
         self.session.add(task)
         self.session.commit()
         self.session.refresh(task)
+        self._invalidate()
+        reminder_scheduler.schedule(task)
         return task
 
+    def bulk_create(self, tasks: Sequence[TaskCreate]) -> int:
+        """Insert many tasks in one round trip (COPY on PostgreSQL, executemany elsewhere).
+
+        Unlike create(), no ORM objects are built and ids are not read back.
+        Returns the number of tasks inserted.
+        """
+        if not tasks:
+            return 0
+        now = datetime.now()
+        rows = [
+            {
+                "title": task.title,
+                "description": task.description,
+                "priority": task.priority,
+                "due_date": task.due_date,
+                "reminder_time": utc_naive(task.reminder_time) if task.reminder_time else None,
+                "status": TaskStatus.PENDING,
+                "user_id": self.user_id,
+                "is_reminded": False,
+                "reminder_sent_at": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for task in tasks
+        ]
+        if self.session.get_bind().dialect.name == "postgresql":
+            self._copy_rows(rows)
+        else:
+            self.session.execute(insert(Task.__table__), rows)
+        self.session.commit()
+
+        self._invalidate()
+        if any(row["reminder_time"] is not None for row in rows):
+            reminder_scheduler.refresh_if_running()
+        return len(rows)
+
+    def _copy_rows(self, rows: List[dict]) -> None:
+        """Stream rows into the task table with COPY ... FROM STDIN (CSV)."""
+        table = Task.__table__
+        columns = list(rows[0])
+        dialect = self.session.get_bind().dialect
+        # Column bind processors turn enums into their stored labels
+        processors = [table.c[name].type.bind_processor(dialect) for name in columns]
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)  # None -> unquoted empty field -> NULL
+        for row in rows:
+            writer.writerow(
+                process(row[name]) if process and row[name] is not None else row[name]
+                for name, process in zip(columns, processors)
+            )
+        buffer.seek(0)
+
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+    def _filter(self, statement, filters: TaskFilter):
+        """Apply the user and query filters to a task query."""
+        if self.user_id is not None:
+            statement = statement.where(Task.user_id == self.user_id)
+        if filters.status:
+            statement = statement.where(Task.status == filters.status)
+        if filters.priority:
+            statement = statement.where(Task.priority == filters.priority)
+        if filters.due_before:
+            statement = statement.where(Task.due_date <= filters.due_before)
+        if filters.due_after:
+            statement = statement.where(Task.due_date >= filters.due_after)
+        if filters.has_reminder is not None:
+            if filters.has_reminder:
+                statement = statement.where(Task.reminder_time.is_not(None))
+            else:
+                statement = statement.where(Task.reminder_time.is_(None))
+        if filters.q and filters.q.strip():
+            dialect_name = self.session.get_bind().dialect.name
+            statement = statement.where(search_condition(dialect_name, filters.q.strip()))
+        return statement.order_by(Task.id)
+
     def get_all(self, status: Optional[TaskStatus] = None) -> List[Task]:
         """Get all tasks for current user, optionally filtered by status."""
-        statement = select(Task)
+        statement = self._filter(select(Task), TaskFilter(status=status))
+        return list(self.session.exec(statement).all())
+
+    def get_all_rows(
+        self, columns: Sequence[Any], filters: Optional[TaskFilter] = None
+    ) -> List[tuple]:
+        """Get the selected columns of the user's tasks as plain row tuples (no ORM objects)."""
+        filters = filters or TaskFilter()
+        key = list_key(tuple(column.key for column in columns), filters.cache_key())
+        generation = None
+        if self.cache is not None:
+            rows = self.cache.get(self.user_id, key)
+            if rows is not None:
+                return rows
+            generation = self.cache.generation(self.user_id)
+
+        statement = self._filter(select(*columns), filters)
+        rows = [tuple(row) for row in self.session.exec(statement).all()]
+        if self.cache is not None:
+            self.cache.set(self.user_id, key, rows, generation)
+        return rows
+
+    def iter_row_batches(
+        self,
+        columns: Sequence[Any],
+        filters: Optional[TaskFilter] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        """Stream the user's tasks in batches through a server-side cursor (uncached).
+
+        Only one batch is held in memory at a time, whatever the account size.
+        """
+        statement = self._filter(select(*columns), filters or TaskFilter())
+        result = self.session.execute(statement.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+    def get_row_by_id(self, columns: Sequence[Any], task_id: int) -> Optional[tuple]:
+        """Get the selected columns of one of the user's tasks as a row tuple."""
+        key = task_key(task_id, tuple(column.key for column in columns))
+        generation = None
+        if self.cache is not None:
+            row = self.cache.get(self.user_id, key)
+            if row is not None:
+                return row
+            generation = self.cache.generation(self.user_id)
+
+        statement = select(*columns).where(Task.id == task_id)
         if self.user_id is not None:
             statement = statement.where(Task.user_id == self.user_id)
-        if status:
-            statement = statement.where(Task.status == status)
-        statement = statement.order_by(Task.id)
-        return list(self.session.exec(statement).all())
+        row = self.session.exec(statement).first()
+        if row is None:
+            return None
+        row = tuple(row)
+        if self.cache is not None:
+            self.cache.set(self.user_id, key, row, generation)
+        return row
+
+    def get_stats(self, today: date, now: datetime) -> TaskStats:
+        """
+        Count tasks by status, priority and due date in a single aggregate query.
+
+        Args:
+            today: The user's local date (for due today / overdue / upcoming)
+            now: Current time as naive UTC (for upcoming reminders)
+        """
+        pending = Task.status == TaskStatus.PENDING
+        statement = select(
+            func.count(),
+            func.count().filter(pending),
+            func.count().filter(Task.status == TaskStatus.COMPLETED),
+            func.count().filter(pending, Task.due_date == today),
+            func.count().filter(pending, Task.due_date < today),
+            func.count().filter(pending, Task.due_date > today),
+            func.count().filter(pending, Task.priority == TaskPriority.HIGH),
+            func.count().filter(pending, Task.priority == TaskPriority.MEDIUM),
+            func.count().filter(pending, Task.priority == TaskPriority.LOW),
+            func.count().filter(
+                pending,
+                Task.is_reminded == False,  # noqa: E712
+                Task.reminder_time >= now,
+            ),
+        ).select_from(Task)
+        if self.user_id is not None:
+            statement = statement.where(Task.user_id == self.user_id)
+        counts = self.session.exec(statement).one()
+        return TaskStats(**dict(zip(TaskStats.model_fields, counts)))
 
     def get_by_id(self, task_id: int) -> Optional[Task]:
         """Get a task by ID (only if owned by current user)."""
@@ -55,13 +242,21 @@ class TaskService:
             return None
 
         update_data = task_data.model_dump(exclude_unset=True)
+        if update_data.get("reminder_time") is not None:
+            update_data["reminder_time"] = utc_naive(update_data["reminder_time"])
         for key, value in update_data.items():
             setattr(task, key, value)
+        if "reminder_time" in update_data:
+            # A new reminder time re-arms the alarm
+            task.is_reminded = False
+            task.reminder_sent_at = None
 
         task.updated_at = datetime.now()
         self.session.add(task)
         self.session.commit()
         self.session.refresh(task)
+        self._invalidate(task_id)
+        reminder_scheduler.schedule(task)
         return task
 
     def delete(self, task_id: int) -> bool:
@@ -72,17 +267,42 @@ class TaskService:
 
         self.session.delete(task)
         self.session.commit()
+        self._invalidate(task_id)
+        reminder_scheduler.unschedule(task_id)
         return True
 
+    def _update_returning(self, task_id: int, **values: Any) -> Optional[Task]:
+        """Update one of the user's tasks in a single UPDATE ... RETURNING statement."""
+        statement = update(Task).where(Task.id == task_id).values(**values).returning(Task)
+        if self.user_id is not None:
+            statement = statement.where(Task.user_id == self.user_id)
+        task = self.session.scalars(statement).first()
+        if task is None:
+            self.session.rollback()
+            return None
+        # Detach so the commit doesn't expire it (which would cost a reload SELECT)
+        self.session.expunge(task)
+        self.session.commit()
+        return task
+
     def mark_complete(self, task_id: int) -> Optional[Task]:
         """Mark a task as complete."""
-        task = self.get_by_id(task_id)
+        task = self._update_returning(
+            task_id, status=TaskStatus.COMPLETED, updated_at=datetime.now()
+        )
         if not task:
             return None
 
-        task.status = TaskStatus.COMPLETED
-        task.updated_at = datetime.now()
-        self.session.add(task)
-        self.session.commit()
-        self.session.refresh(task)
+        self._invalidate(task_id)
+        reminder_scheduler.unschedule(task_id)
+        return task
+
+    def mark_reminded(self, task_id: int) -> Optional[Task]:
+        """Mark a task as reminded (the client acknowledged the alarm)."""
+        task = self._update_returning(task_id, is_reminded=True)
+        if not task:
+            return None
+
+        self._invalidate(task_id)
+        reminder_scheduler.unschedule(task_id)
         return task
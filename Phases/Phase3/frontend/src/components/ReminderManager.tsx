@@ -2,7 +2,7 @@
 
 import { useEffect, useRef, useState } from 'react';
 import { Task } from '@/lib/types';
-import { taskApi } from '@/lib/api';
+import { reminderApi, taskApi } from '@/lib/api';
 import toast from 'react-hot-toast';
 
 interface ReminderManagerProps {
@@ -13,7 +13,6 @@ interface ReminderManagerProps {
 export default function ReminderManager({ tasks, onTasksUpdated }: ReminderManagerProps) {
   const [notificationPermission, setNotificationPermission] = useState<NotificationPermission>('default');
   const audioRef = useRef<HTMLAudioElement | null>(null);
-  const reminderCheckRef = useRef<NodeJS.Timeout | null>(null);
   const stopBeepRef = useRef<boolean>(false);
   const triggeredRemindersRef = useRef<Set<number>>(new Set()); // Track triggered reminders
   const hasRequestedPermissionRef = useRef<boolean>(false); // Track permission request
@@ -167,7 +166,7 @@ export default function ReminderManager({ tasks, onTasksUpdated }: ReminderManag
       }
     );
 
-    // 4. Mark task as reminded in backend
+    // 4. Acknowledge the alarm so the backend stops replaying it
     try {
       await taskApi.markReminded(task.id);
       console.log(`[Reminder] Marked task ${task.id} as reminded`);
@@ -191,44 +190,67 @@ export default function ReminderManager({ tasks, onTasksUpdated }: ReminderManag
     console.log('[Reminder] Alarm stopped');
   };
 
-  // Watchman - Check reminders every 15 seconds
+  // Keep the latest alarm handler for the long-lived stream
+  const triggerAlarmRef = useRef(triggerAlarm);
+  triggerAlarmRef.current = triggerAlarm;
+
+  // Catch up on overdue reminders in the loaded task list (page load, list refresh)
+  useEffect(() => {
+    const now = new Date();
+
+    tasks.forEach((task) => {
+      // Only trigger if:
+      // 1. Task has a reminder_time set
+      // 2. Reminder time has passed
+      // 3. Task hasn't been reminded yet (in DB or locally)
+      // 4. Task is still pending (not completed)
+      // 5. Not already triggered in this session
+      if (
+        task.reminder_time &&
+        new Date(task.reminder_time.endsWith('Z') ? task.reminder_time : task.reminder_time + 'Z') <= now &&
+        !task.is_reminded &&
+        task.status === 'pending' &&
+        !triggeredRemindersRef.current.has(task.id)
+      ) {
+        console.log(`[Reminder] ⏰ Overdue alarm triggered for: "${task.title}"`);
+        triggeredRemindersRef.current.add(task.id); // Prevent duplicate triggers
+        triggerAlarmRef.current(task);
+      }
+    });
+  }, [tasks]);
+
+  // Listen for reminders pushed by the backend (reconnects on drop)
   useEffect(() => {
-    const checkReminders = () => {
-      const now = new Date();
-
-      tasks.forEach((task) => {
-        // Only trigger if:
-        // 1. Task has a reminder_time set
-        // 2. Reminder time has passed
-        // 3. Task hasn't been reminded yet (in DB or locally)
-        // 4. Task is still pending (not completed)
-        // 5. Not already triggered in this session
-        if (
-          task.reminder_time &&
-          new Date(task.reminder_time.endsWith('Z') ? task.reminder_time : task.reminder_time + 'Z') <= now &&
-          !task.is_reminded &&
-          task.status === 'pending' &&
-          !triggeredRemindersRef.current.has(task.id)
-        ) {
+    const controller = new AbortController();
+    let retryTimeout: NodeJS.Timeout | null = null;
+
+    const connect = async () => {
+      try {
+        await reminderApi.subscribe((task) => {
+          // Not already triggered in this session
+          if (triggeredRemindersRef.current.has(task.id)) return;
           console.log(`[Reminder] ⏰ Alarm triggered for: "${task.title}"`);
           triggeredRemindersRef.current.add(task.id); // Prevent duplicate triggers
-          triggerAlarm(task);
-        }
-      });
+          triggerAlarmRef.current(task);
+        }, controller.signal);
+      } catch (error) {
+        if (controller.signal.aborted) return;
+        console.warn('[Reminder] Reminder stream error:', error);
+      }
+      if (!controller.signal.aborted) {
+        retryTimeout = setTimeout(connect, 5000);
+      }
     };
 
-    // Check immediately on mount
-    checkReminders();
-
-    // Then check every 15 seconds
-    reminderCheckRef.current = setInterval(checkReminders, 15000);
+    connect();
 
     return () => {
-      if (reminderCheckRef.current) {
-        clearInterval(reminderCheckRef.current);
+      controller.abort();
+      if (retryTimeout) {
+        clearTimeout(retryTimeout);
       }
     };
-  }, [tasks, notificationPermission]);
+  }, []);
 
   // Cleanup on unmount
   useEffect(() => {
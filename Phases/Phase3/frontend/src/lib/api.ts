@@ -140,6 +140,50 @@ export const taskApi = {
   },
 };
 
+// Reminder push stream (Server-Sent Events).
+// EventSource can't send an Authorization header, so the stream is read with fetch.
+export const reminderApi = {
+  async subscribe(onReminder: (task: Task) => void, signal: AbortSignal): Promise<void> {
+    const userId = await getUserId();
+    if (!userId) throw new Error('Not authenticated');
+
+    const response = await fetch(`${API_BASE}/api/${userId}/reminders/stream`, {
+      headers: await getAuthHeaders(),
+      signal,
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`HTTP ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+
+        const data = rawEvent
+          .split('\n')
+          .filter((line) => line.startsWith('data: '))
+          .map((line) => line.slice(6))
+          .join('\n');
+        if (data) {
+          onReminder(JSON.parse(data) as Task);
+        }
+      }
+    }
+  },
+};
+
 // Chat API types
 export interface ChatMessage {
   id: string;
@@ -15,6 +15,7 @@ export interface Task {
   due_date: string | null;
   reminder_time: string | null;
   is_reminded: boolean;
+  reminder_sent_at: string | null;
   created_at: string;
   updated_at: string;
 }